@@ -1,16 +1,32 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from starlette import status
-from src.models.conversation import Conversation, ConversationWithMessages
-from typing import List
+from src.models.conversation import (
+    BulkDeleteConversations,
+    BulkDeleteConversationsResult,
+    Conversation,
+    ConversationPage,
+    ConversationWithMessages,
+)
+from typing import List, Optional, Union
 from src.services.conversation_service import (
     create_conversation,
     delete_conversation,
+    delete_conversations,
+    export_conversation,
+    get_conversation,
     get_all_conversations,
+    get_conversations_page,
     get_conversation_with_messages,
 )
 
 conversation_router = APIRouter()
 
+MAX_PAGE_SIZE = 100
+
+limit_description = "Page size. Without it every item is returned at once"
+cursor_description = "nextCursor of the previous page"
+
 
 @conversation_router.post(
     "/", status_code=status.HTTP_201_CREATED, response_model=Conversation
@@ -39,21 +55,34 @@ async def start_conversation_endpoint():
     status_code=status.HTTP_200_OK,
     response_model=ConversationWithMessages,
 )
-async def get_conversation_endpoint(conversation_id: str):
+async def get_conversation_endpoint(
+    conversation_id: str,
+    limit: Optional[int] = Query(
+        None, ge=1, le=MAX_PAGE_SIZE, description=limit_description
+    ),
+    cursor: Optional[str] = Query(None, description=cursor_description),
+):
     """
-    Retrieve a conversation and its messages by ID.
+    Retrieve a conversation and its messages by ID. With a limit, only the
+    newest page of messages is returned along with the cursor of the older
+    page.
 
     Args:
         conversation_id (str): Conversation identifier.
+        limit (Optional[int]): Number of messages per page.
+        cursor (Optional[str]): Cursor of the page to return.
 
     Returns:
         ConversationWithMessages: Conversation data including messages.
 
     Raises:
-        HTTPException: 404 Not Found if conversation is missing or error occurs.
+        HTTPException: 400 Bad Request if the cursor is malformed, 404 Not Found
+        if conversation is missing or error occurs.
     """
     try:
-        return await get_conversation_with_messages(conversation_id)
+        return await get_conversation_with_messages(conversation_id, limit, cursor)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -62,20 +91,82 @@ async def get_conversation_endpoint(conversation_id: str):
 
 
 @conversation_router.get(
-    "/", status_code=status.HTTP_200_OK, response_model=List[Conversation]
+    "/{conversation_id}/export",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+)
+async def export_conversation_endpoint(
+    conversation_id: str,
+    compress: bool = Query(False, description="Gzip the NDJSON output"),
+):
+    """
+    Export a conversation and all its messages as NDJSON, streamed while the
+    messages are read.
+
+    Args:
+        conversation_id (str): Conversation identifier.
+        compress (bool): Whether to gzip the output.
+
+    Returns:
+        StreamingResponse: NDJSON, or gzip-compressed NDJSON, download.
+
+    Raises:
+        HTTPException: 404 Not Found if conversation is missing or error occurs.
+    """
+    try:
+        conversation = await get_conversation(conversation_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Failed to export conversation: {str(e)}",
+        )
+
+    filename = f"conversation-{conversation_id}.ndjson"
+    media_type = "application/x-ndjson"
+
+    if compress:
+        filename = f"{filename}.gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        export_conversation(conversation, compress=compress),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@conversation_router.get(
+    "/",
+    status_code=status.HTTP_200_OK,
+    response_model=Union[List[Conversation], ConversationPage],
 )
-async def get_all_conversations_endpoint():
+async def get_all_conversations_endpoint(
+    limit: Optional[int] = Query(
+        None, ge=1, le=MAX_PAGE_SIZE, description=limit_description
+    ),
+    cursor: Optional[str] = Query(None, description=cursor_description),
+):
     """
-    Retrieve all conversations.
+    Retrieve all conversations, or one page of them when a limit is given.
+
+    Args:
+        limit (Optional[int]): Number of conversations per page.
+        cursor (Optional[str]): Cursor of the page to return.
 
     Returns:
-        List[Conversation]: List of all conversations.
+        Union[List[Conversation], ConversationPage]: All conversations, or the requested page.
 
     Raises:
-        HTTPException: 404 Not Found if retrieval fails.
+        HTTPException: 400 Bad Request if the cursor is malformed, 404 Not Found
+        if retrieval fails.
     """
     try:
+        if limit is not None:
+            return await get_conversations_page(limit, cursor)
+
         return await get_all_conversations()
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -88,23 +179,55 @@ async def get_all_conversations_endpoint():
     status_code=status.HTTP_204_NO_CONTENT,
     response_model=None,
 )
-async def delete_conversation_endpoint(
-    conversation_id: str,
-    background_tasks: BackgroundTasks,
-):
+async def delete_conversation_endpoint(conversation_id: str):
     """
-    Delete a conversation by ID.
+    Delete a conversation by ID. The conversation is hidden immediately and
+    its data is deleted in the background.
 
     Args:
         conversation_id (str): Conversation identifier.
 
     Raises:
-        HTTPException: 400 Bad Request if deletion fails.
+        HTTPException: 401 or 404 if the conversation is not the user's or
+        does not exist, 400 Bad Request if deletion fails.
     """
     try:
-        background_tasks.add_task(delete_conversation, conversation_id)
+        await delete_conversation(conversation_id)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to delete conversation: {str(e)}",
         )
+
+
+@conversation_router.post(
+    "/bulk-delete",
+    status_code=status.HTTP_200_OK,
+    response_model=BulkDeleteConversationsResult,
+)
+async def bulk_delete_conversations_endpoint(request: BulkDeleteConversations):
+    """
+    Delete many conversations by ID. The conversations are hidden immediately
+    and their data is deleted in the background.
+
+    Args:
+        request (BulkDeleteConversations): IDs of the conversations to delete.
+
+    Returns:
+        BulkDeleteConversationsResult: IDs of the deleted conversations.
+
+    Raises:
+        HTTPException: 400 Bad Request if deletion fails.
+    """
+    try:
+        deleted_ids = await delete_conversations(request.conversationIds)
+        return {"deletedConversationIds": deleted_ids}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to delete conversations: {str(e)}",
+        )
@@ -1,7 +1,10 @@
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
 from starlette import status
-from src.db.mongo import is_mongo_connected
+from src.services.health_service import check_dependencies
+from src.db.mongo import POOL_OPTIONS
+from src.db.mongo_metrics import get_mongo_metrics
+from src.db.indexes import report_indexes
 from src.core.config import are_env_vars_loaded
 
 health_router = APIRouter()
@@ -24,23 +27,48 @@ async def deep_health_check_endpoint():
     Deep health check endpoint to verify critical dependencies.
 
     Checks:
-        - MongoDB connection status.
+        - MongoDB, Pinecone, S3 and OpenAI round trips, cached for a few seconds.
         - Environment variables loaded status.
 
     Returns:
-        dict: Status 'healthy' with checks if all pass.
+        dict: Status 'healthy' with checks and dependency latencies if all pass.
         JSONResponse: Status 'unhealthy' with failing checks and HTTP 503 if any fail.
     """
+    dependencies = await check_dependencies()
+
     checks = {
-        "mongo_connected": is_mongo_connected(),
+        **{f"{name}_connected": result["healthy"] for name, result in dependencies.items()},
         "env_vars_loaded": are_env_vars_loaded(),
     }
 
-    status = all(checks.values())
+    content = {"checks": checks, "dependencies": dependencies}
 
-    if status:
-        return {"status": "healthy", "checks": checks}
+    if all(checks.values()):
+        return {"status": "healthy", **content}
     else:
         return JSONResponse(
-            status_code=503, content={"status": "unhealthy", "checks": checks}
+            status_code=503, content={"status": "unhealthy", **content}
         )
+
+
+@health_router.get("/mongo", status_code=status.HTTP_200_OK)
+async def mongo_metrics_endpoint():
+    """
+    MongoDB connection pool and command metrics since startup.
+
+    Returns:
+        dict: Pool options, open and in-use connections, checkout wait and
+        command latencies by collection and operation.
+    """
+    return get_mongo_metrics(POOL_OPTIONS)
+
+
+@health_router.get("/mongo/indexes", status_code=status.HTTP_200_OK)
+async def mongo_indexes_endpoint():
+    """
+    Compare the registered MongoDB indexes with the live ones.
+
+    Returns:
+        dict: Missing, unregistered and unused (since server start) index names by collection.
+    """
+    return await report_indexes()
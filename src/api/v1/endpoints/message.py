@@ -5,19 +5,24 @@ from fastapi import (
     UploadFile,
     File,
     Form,
+    Header,
     status as http_status,
 )
 from typing import List, Optional
 from src.models.message import Message, CreateMessage, Author
-from src.services.message_service import create_message
+from src.services.message_service import create_message_pair
 from src.services.chat_service import get_chat_response
 from src.models.status import Status
 from src.services.file_service import read_files_into_memory
-from src.core.server.socket_server import sio
-from src.core.events import SOCKET_EVENTS
-from src.utils.converters.socketio_utils import (
-    async_safe_socket_emit,
+from src.services.user_service import get_current_user
+from src.services.idempotency_service import (
+    build_idempotency_id,
+    build_request_fingerprint,
+    claim_idempotency_key,
+    save_idempotent_response,
+    release_idempotency_key,
 )
+from src.core.logger import logger
 
 messages_router = APIRouter()
 
@@ -33,9 +38,12 @@ async def create_message_endpoint(
     content: str = Form(...),
     author: Author = Form(...),
     files: Optional[List[UploadFile]] = File(default=None),
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key"),
 ):
     """
-    Create a user message and trigger async AI response generation.
+    Create a user message and trigger async AI response generation. A retry
+    sent with the same Idempotency-Key returns the original user message
+    without creating messages or generating a response again.
 
     Args:
         conversation_id (str): Conversation ID.
@@ -43,53 +51,66 @@ async def create_message_endpoint(
         content (str): Message text content.
         author (Author): Message author.
         files (Optional[List[UploadFile]]): Optional uploaded files.
+        idempotency_key (Optional[str]): Optional key identifying retries of the same request.
 
     Returns:
         Message: Created user message.
 
     Raises:
-        HTTPException: 400 Bad Request on failure.
+        HTTPException: 400 Bad Request on failure, 409 Conflict while the
+            original request is still processed, 422 if the key was used for another request.
     """
-    try:
-        # Create the user message
-        message = CreateMessage(content=content, author=author, status=Status.SUCCESS)
-        user_message = await create_message(conversation_id, message, Author.USER)
-
-        # Emit user message creation event with safe serialization
-        await async_safe_socket_emit(
-            sio,
-            SOCKET_EVENTS["CHAT_USER_CREATE"],
-            user_message,
-            room=conversation_id,
-        )
+    idempotency_id = None
 
-        # Create AI message placeholder
-        ai_message = CreateMessage(author=Author.AI, content="", status=Status.LOADING)
-        saved_ai_message = await create_message(conversation_id, ai_message, Author.AI)
+    if idempotency_key:
+        user = await get_current_user()
+        idempotency_id = build_idempotency_id(
+            f"{user['id']}:messages:{conversation_id}", idempotency_key
+        )
 
-        # Emit AI response (loading state)
-        await async_safe_socket_emit(
-            sio,
-            SOCKET_EVENTS["CHAT_AI_MESSAGE"],
-            saved_ai_message,
-            room=conversation_id,
+        stored_response = await claim_idempotency_key(
+            idempotency_id, build_request_fingerprint(content, author.value)
         )
 
-        # Process uploaded files
+        if stored_response is not None:
+            return stored_response
+
+    try:
+        # Process uploaded files before anything is persisted
         file_data_list = await read_files_into_memory(files)
 
-        background_tasks.add_task(
-            get_chat_response,
-            conversation_id,
-            saved_ai_message["id"],
-            message,
-            file_data_list,
+        # Create the user message and AI message placeholder, emitting both
+        message = CreateMessage(content=content, author=author, status=Status.SUCCESS)
+        user_message, saved_ai_message = await create_message_pair(
+            conversation_id, message
         )
 
-        return user_message
-
     except Exception as e:
+        # Nothing was created, so a retry with the same key may run again
+        if idempotency_id:
+            await release_idempotency_key(idempotency_id)
+
         raise HTTPException(
             status_code=http_status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to create message: {str(e)}",
         )
+
+    background_tasks.add_task(
+        get_chat_response,
+        conversation_id,
+        saved_ai_message["id"],
+        message,
+        file_data_list,
+    )
+
+    if idempotency_id:
+        try:
+            await save_idempotent_response(idempotency_id, user_message)
+        except Exception as e:
+            # The messages exist, so the key stays claimed until its processing
+            # timeout rather than letting a retry create them a second time
+            logger.error(
+                f"Failed to store response of idempotent request {idempotency_id}: {e}"
+            )
+
+    return user_message
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, HTTPException, Query
+from starlette import status
+from src.models.search import MessageSearchResults
+from src.services.search_service import search_messages
+
+search_router = APIRouter()
+
+MAX_PAGE_SIZE = 50
+
+
+@search_router.get(
+    "/messages", status_code=status.HTTP_200_OK, response_model=MessageSearchResults
+)
+async def search_messages_endpoint(
+    q: str = Query(..., min_length=1, max_length=256, description="Search text"),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    offset: int = Query(0, ge=0, le=1000, description="Number of results to skip"),
+):
+    """
+    Search the current user's messages across all conversations.
+
+    Args:
+        q (str): Search text.
+        limit (int): Number of results per page.
+        offset (int): Number of results to skip.
+
+    Returns:
+        MessageSearchResults: Matching messages with snippets, most relevant first.
+
+    Raises:
+        HTTPException: 400 Bad Request if the search fails.
+    """
+    try:
+        return await search_messages(q, limit, offset)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to search messages: {str(e)}",
+        )
@@ -84,7 +84,7 @@ async def update_user_endpoint(user_id: str, data: UpdateUser):
 )
 async def delete_user_endpoint(user_id: str):
     """
-    Delete a user by ID.
+    Delete a user by ID, along with their conversations.
 
     Args:
         user_id (str): User identifier.
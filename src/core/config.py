@@ -18,6 +18,96 @@ ENV_VARS = {
     "AWS_S3_BUCKET_NAME": os.getenv("AWS_S3_BUCKET_NAME"),
 }
 
+# Optional tuning settings. Unlike ENV_VARS these fall back to defaults
+# and are not checked by validate_env_vars.
+SETTINGS = {
+    # MongoDB connection pool, 0 or empty keeps the driver default
+    "MONGO_MAX_POOL_SIZE": int(os.getenv("MONGO_MAX_POOL_SIZE", "100")),
+    "MONGO_MIN_POOL_SIZE": int(os.getenv("MONGO_MIN_POOL_SIZE", "0")),
+    "MONGO_MAX_IDLE_TIME_MS": int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000")),
+    "MONGO_WAIT_QUEUE_TIMEOUT_MS": int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "10000")),
+    "MONGO_CONNECT_TIMEOUT_MS": int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "10000")),
+    "MONGO_SERVER_SELECTION_TIMEOUT_MS": int(
+        os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "10000")
+    ),
+    "MONGO_COMPRESSORS": os.getenv("MONGO_COMPRESSORS", "zstd,zlib"),
+    # Index report, delayed until usage counters cover some traffic. Dropping
+    # indexes that are no longer registered is opt-in.
+    "MONGO_INDEX_REPORT_DELAY_SECONDS": float(
+        os.getenv("MONGO_INDEX_REPORT_DELAY_SECONDS", "86400")
+    ),
+    "MONGO_DROP_UNREGISTERED_INDEXES": os.getenv(
+        "MONGO_DROP_UNREGISTERED_INDEXES", "false"
+    ).lower()
+    == "true",
+    # Vector store ingestion
+    "INGEST_MAX_BATCH_TOKENS": int(os.getenv("INGEST_MAX_BATCH_TOKENS", "8000")),
+    "INGEST_MAX_BATCH_SIZE": int(os.getenv("INGEST_MAX_BATCH_SIZE", "100")),
+    "INGEST_EMBED_CONCURRENCY": int(os.getenv("INGEST_EMBED_CONCURRENCY", "4")),
+    "INGEST_UPSERT_CONCURRENCY": int(os.getenv("INGEST_UPSERT_CONCURRENCY", "4")),
+    "INGEST_MAX_RETRIES": int(os.getenv("INGEST_MAX_RETRIES", "5")),
+    "INGEST_RETRY_BASE_DELAY": float(os.getenv("INGEST_RETRY_BASE_DELAY", "1.0")),
+    "INGEST_TOKENS_PER_MINUTE": int(os.getenv("INGEST_TOKENS_PER_MINUTE", "1000000")),
+    "INGEST_WORKER_CONCURRENCY": int(os.getenv("INGEST_WORKER_CONCURRENCY", "2")),
+    # Seconds a chat turn waits for its files to be indexed before answering
+    "INGEST_FRESHNESS_TIMEOUT": float(os.getenv("INGEST_FRESHNESS_TIMEOUT", "30")),
+    # Image OCR runs in its own low-priority lane, chat turns do not wait for it
+    "OCR_WORKER_CONCURRENCY": int(os.getenv("OCR_WORKER_CONCURRENCY", "1")),
+    # Caches
+    "USER_CACHE_TTL_SECONDS": float(os.getenv("USER_CACHE_TTL_SECONDS", "60")),
+    # Safety net for changes of other workers missed by the watcher
+    "CONVERSATION_CACHE_TTL_SECONDS": float(
+        os.getenv("CONVERSATION_CACHE_TTL_SECONDS", "300")
+    ),
+    "CONVERSATION_CACHE_MAX_SIZE": int(os.getenv("CONVERSATION_CACHE_MAX_SIZE", "10000")),
+    # Staleness of other workers' writes on servers without change streams
+    "CONVERSATION_CHANGE_POLL_SECONDS": float(
+        os.getenv("CONVERSATION_CHANGE_POLL_SECONDS", "2")
+    ),
+    # Idempotency-Key retention, and how long an unfinished request holds its key
+    "IDEMPOTENCY_KEY_TTL_SECONDS": int(
+        os.getenv("IDEMPOTENCY_KEY_TTL_SECONDS", "86400")
+    ),
+    "IDEMPOTENCY_PROCESSING_TIMEOUT": int(
+        os.getenv("IDEMPOTENCY_PROCESSING_TIMEOUT", "60")
+    ),
+    # Archival of inactive conversations
+    "ARCHIVE_AFTER_DAYS": int(os.getenv("ARCHIVE_AFTER_DAYS", "90")),
+    "ARCHIVE_INTERVAL_SECONDS": float(os.getenv("ARCHIVE_INTERVAL_SECONDS", "3600")),
+    # Cascading deletion of conversations
+    "DELETION_WORKER_CONCURRENCY": int(os.getenv("DELETION_WORKER_CONCURRENCY", "1")),
+    "DELETION_MAX_ATTEMPTS": int(os.getenv("DELETION_MAX_ATTEMPTS", "10")),
+    "DELETION_MAX_RETRIES": int(os.getenv("DELETION_MAX_RETRIES", "3")),
+    # Tombstones older than the grace period without a pending job are queued again
+    "DELETION_SWEEP_INTERVAL_SECONDS": float(
+        os.getenv("DELETION_SWEEP_INTERVAL_SECONDS", "600")
+    ),
+    "DELETION_SWEEP_GRACE_SECONDS": float(
+        os.getenv("DELETION_SWEEP_GRACE_SECONDS", "600")
+    ),
+    # Scanning the whole bucket for legacy unprefixed files on every deletion
+    # is opt-in, orphan_gc_service --include-legacy collects them instead
+    "DELETION_INCLUDE_LEGACY_FILES": os.getenv(
+        "DELETION_INCLUDE_LEGACY_FILES", "false"
+    ).lower()
+    == "true",
+    # Removal of vectors and files whose conversation no longer exists
+    "ORPHAN_GC_INTERVAL_SECONDS": float(
+        os.getenv("ORPHAN_GC_INTERVAL_SECONDS", "86400")
+    ),
+    "ORPHAN_GC_DELETES_PER_MINUTE": int(
+        os.getenv("ORPHAN_GC_DELETES_PER_MINUTE", "6000")
+    ),
+    "ORPHAN_GC_DRY_RUN": os.getenv("ORPHAN_GC_DRY_RUN", "false").lower() == "true",
+    # Deep health checks: probe cache lifetime and per probe timeout
+    "HEALTH_CHECK_TTL_SECONDS": float(os.getenv("HEALTH_CHECK_TTL_SECONDS", "10")),
+    "HEALTH_PROBE_TIMEOUT": float(os.getenv("HEALTH_PROBE_TIMEOUT", "3")),
+    # Background jobs
+    "JOB_LEASE_SECONDS": int(os.getenv("JOB_LEASE_SECONDS", "60")),
+    "JOB_MAX_ATTEMPTS": int(os.getenv("JOB_MAX_ATTEMPTS", "3")),
+    "JOB_POLL_INTERVAL": float(os.getenv("JOB_POLL_INTERVAL", "2")),
+}
+
 
 def are_env_vars_loaded() -> bool:
     """
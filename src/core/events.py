@@ -4,4 +4,5 @@ SOCKET_EVENTS = {
     "CHAT_TITLE_CREATE": "chat:title:create",
     "CHAT_AI_STREAM": "chat:ai:stream",
     "CHAT_DELETE_CONVERSATION": "chat:delete:conversation",
+    "CHAT_FILE_PROGRESS": "chat:file:progress",
 }
@@ -4,3 +4,8 @@ users_collection = db["users"]
 conversations_collection = db["conversations"]
 messages_collection = db["messages"]
 prompts_collection = db["prompts"]
+file_registry_collection = db["file_registry"]
+embedding_cache_collection = db["embedding_cache"]
+jobs_collection = db["jobs"]
+idempotency_keys_collection = db["idempotency_keys"]
+message_archives_collection = db["message_archives"]
@@ -0,0 +1,200 @@
+import asyncio
+from typing import Dict, List
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+from src.db.mongo import db
+from src.core.config import SETTINGS
+from src.core.logger import logger
+
+# Indexes required by the queries of the services, keyed by collection name.
+# Names are explicit so the report can match them against the live indexes.
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        # get_user_by_email
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ],
+    "conversations": [
+        # claim_inactive_conversation
+        IndexModel([("lastActivityAt", ASCENDING)], name="lastActivityAt"),
+        # requeue_stranded_deletions and poll_conversation_changes, only tombstoned conversations are indexed
+        IndexModel([("deletedAt", ASCENDING)], name="deletedAt", sparse=True),
+        # poll_conversation_changes
+        IndexModel([("updatedAt", ASCENDING)], name="updatedAt"),
+        # get_all_conversations, most recently active first
+        IndexModel(
+            [
+                ("userId", ASCENDING),
+                ("lastActivityAt", DESCENDING),
+                ("_id", DESCENDING),
+            ],
+            name="userId_lastActivityAt",
+        ),
+    ],
+    "messages": [
+        # get_messages, oldest first
+        IndexModel(
+            [("conversationId", ASCENDING), ("timestamp", ASCENDING), ("_id", ASCENDING)],
+            name="conversationId_timestamp",
+        ),
+        # search_messages, text search within one user's messages
+        IndexModel(
+            [("userId", ASCENDING), ("content", TEXT)], name="userId_content_text"
+        ),
+    ],
+    "prompts": [
+        # get_user_prompt, one prompt document per user
+        IndexModel([("userId", ASCENDING)], name="userId_unique", unique=True),
+    ],
+    "file_registry": [
+        # get_registered_file
+        IndexModel(
+            [("userId", ASCENDING), ("contentHash", ASCENDING), ("embeddingModel", ASCENDING)],
+            name="userId_contentHash_embeddingModel_unique",
+            unique=True,
+        ),
+        # delete_registered_files
+        IndexModel([("conversationId", ASCENDING)], name="conversationId"),
+    ],
+    "jobs": [
+        # JobQueue.claim
+        IndexModel(
+            [
+                ("type", ASCENDING),
+                ("lane", ASCENDING),
+                ("status", ASCENDING),
+                ("priority", DESCENDING),
+                ("createdAt", ASCENDING),
+            ],
+            name="type_lane_status_priority_createdAt",
+        ),
+        # requeue_stranded_deletions, pending jobs of a conversation
+        IndexModel(
+            [("payload.conversationIds", ASCENDING)], name="payload_conversationIds"
+        ),
+    ],
+    "message_archives": [
+        # rehydrate_conversation
+        IndexModel(
+            [("archiveId", ASCENDING), ("part", ASCENDING)], name="archiveId_part"
+        ),
+        # archive_conversation cleanup of earlier attempts, delete_archived_messages
+        IndexModel([("conversationId", ASCENDING)], name="conversationId"),
+    ],
+    "idempotency_keys": [
+        # Each record expires at its own expiresAt
+        IndexModel(
+            [("expiresAt", ASCENDING)], name="expiresAt_ttl", expireAfterSeconds=0
+        ),
+    ],
+}
+
+
+async def ensure_indexes() -> None:
+    """
+    Create the registered indexes that do not exist yet. Creating an existing
+    index is a no-op, so this is safe to run on every startup. A failing index
+    (e.g. a unique index over duplicate data) is logged and does not stop the
+    others from being created.
+    """
+    for collection_name, indexes in INDEXES.items():
+        collection = db[collection_name]
+
+        for index in indexes:
+            name = index.document["name"]
+
+            try:
+                await collection.create_indexes([index])
+            except OperationFailure as e:
+                logger.error(f"Failed to create index {collection_name}.{name}: {e}")
+
+    logger.info("MongoDB indexes ensured.")
+
+
+async def report_indexes(
+    drop_unregistered: bool = False,
+) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Compare the registered indexes with the live ones and log the registered
+    indexes that are missing, the live indexes that are not registered (e.g.
+    replaced by a newer index) and the indexes that have not been used since
+    the server started. Usage counters reset when the server restarts or an
+    index is rebuilt, so the unused list is only meaningful after some uptime.
+
+    Args:
+        drop_unregistered (bool, optional): Drop the unregistered indexes. Defaults to False.
+
+    Returns:
+        Dict[str, Dict[str, List[str]]]: Missing, unregistered and unused index names per collection.
+    """
+    report = {}
+
+    for collection_name, indexes in INDEXES.items():
+        collection = db[collection_name]
+        registered = {index.document["name"] for index in indexes}
+
+        live_indexes = await collection.index_information()
+        missing = [
+            index.document["name"]
+            for index in indexes
+            if index.document["name"] not in live_indexes
+        ]
+        unregistered = [
+            name for name in live_indexes if name != "_id_" and name not in registered
+        ]
+
+        try:
+            stats = await collection.aggregate([{"$indexStats": {}}]).to_list(
+                length=None
+            )
+            unused = [
+                stat["name"]
+                for stat in stats
+                if stat["name"] != "_id_" and stat["accesses"]["ops"] == 0
+            ]
+        except OperationFailure as e:
+            logger.warning(f"Failed to read index usage of {collection_name}: {e}")
+            unused = []
+
+        if missing:
+            logger.warning(f"Missing indexes on {collection_name}: {missing}")
+
+        if unregistered:
+            logger.warning(f"Unregistered indexes on {collection_name}: {unregistered}")
+
+        if unused:
+            logger.info(f"Unused indexes on {collection_name}: {unused}")
+
+        if drop_unregistered:
+            for name in unregistered:
+                try:
+                    await collection.drop_index(name)
+                    logger.info(f"Dropped unregistered index {collection_name}.{name}")
+                except OperationFailure as e:
+                    logger.error(f"Failed to drop index {collection_name}.{name}: {e}")
+
+        report[collection_name] = {
+            "missing": missing,
+            "unregistered": unregistered,
+            "unused": unused,
+        }
+
+    return report
+
+
+async def run_index_report(delay_seconds: float) -> None:
+    """
+    Report the indexes once the server has served traffic for a while, so
+    the usage counters reflect the queries actually run, then drop the
+    unregistered indexes if MONGO_DROP_UNREGISTERED_INDEXES is set.
+
+    Args:
+        delay_seconds (float): Seconds to wait after startup.
+    """
+    await asyncio.sleep(delay_seconds)
+
+    try:
+        await report_indexes(
+            drop_unregistered=SETTINGS["MONGO_DROP_UNREGISTERED_INDEXES"]
+        )
+    except Exception as e:
+        logger.error(f"Index report failed: {e}")
@@ -1,9 +1,25 @@
 from motor.motor_asyncio import AsyncIOMotorClient
-from src.core.config import ENV_VARS
+from src.db.mongo_metrics import pool_metrics, command_metrics
+from src.core.config import ENV_VARS, SETTINGS
 from src.core.logger import logger
 
+# Connection pool sizing, timeouts and wire compression
+POOL_OPTIONS = {
+    "maxPoolSize": SETTINGS["MONGO_MAX_POOL_SIZE"],
+    "minPoolSize": SETTINGS["MONGO_MIN_POOL_SIZE"],
+    "maxIdleTimeMS": SETTINGS["MONGO_MAX_IDLE_TIME_MS"],
+    "waitQueueTimeoutMS": SETTINGS["MONGO_WAIT_QUEUE_TIMEOUT_MS"],
+    "connectTimeoutMS": SETTINGS["MONGO_CONNECT_TIMEOUT_MS"],
+    "serverSelectionTimeoutMS": SETTINGS["MONGO_SERVER_SELECTION_TIMEOUT_MS"],
+    "compressors": SETTINGS["MONGO_COMPRESSORS"],
+}
+
 # Initialize async MongoDB client using URI from environment variables
-client = AsyncIOMotorClient(ENV_VARS["MONGO_URI"])
+client = AsyncIOMotorClient(
+    ENV_VARS["MONGO_URI"],
+    event_listeners=[pool_metrics, command_metrics],
+    **{option: value for option, value in POOL_OPTIONS.items() if value},
+)
 
 # Select the database by name from environment variables
 db = client[ENV_VARS["MONGO_DB"]]
@@ -19,7 +35,7 @@ def get_db():
     return db
 
 
-def is_mongo_connected():
+async def is_mongo_connected():
     """
     Check the MongoDB connection by sending a ping command.
 
@@ -27,9 +43,9 @@ def is_mongo_connected():
         bool: True if connection is successful, False otherwise.
     """
     try:
-        client.admin.command("ping")
+        await client.admin.command("ping")
         logger.info("Application successfully connected to MongoDB!")
         return True
     except Exception as e:
-        logger.error("Application failed to connect to MongoDB", e)
+        logger.error(f"Application failed to connect to MongoDB: {e}")
         return False
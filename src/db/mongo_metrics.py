@@ -0,0 +1,164 @@
+import threading
+from typing import Dict, Optional, Tuple
+from pymongo import monitoring
+from src.utils.metrics.latency_stats import LatencyStats
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """
+    Track connection pool usage from the CMAP events of the driver: how long
+    operations wait to check out a connection and how many are in use.
+    Events are delivered on driver threads, so counters are lock protected.
+    """
+
+    def __init__(self):
+        self.checkout_wait = LatencyStats()
+        self.in_use = 0
+        self.max_in_use = 0
+        self.open = 0
+        self.checkout_failures: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def connection_checked_out(self, event):
+        self.checkout_wait.record(event.duration * 1000)
+
+        with self._lock:
+            self.in_use += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.in_use -= 1
+
+    def connection_check_out_failed(self, event):
+        # Time spent waiting before e.g. a wait queue timeout
+        self.checkout_wait.record(event.duration * 1000, failed=True)
+
+        with self._lock:
+            reason = str(event.reason)
+            self.checkout_failures[reason] = self.checkout_failures.get(reason, 0) + 1
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open -= 1
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def snapshot(self) -> dict:
+        """
+        Summarise the pool usage.
+
+        Returns:
+            dict: Open and in-use connections, checkout failures and checkout wait latencies.
+        """
+        with self._lock:
+            usage = {
+                "openConnections": self.open,
+                "inUseConnections": self.in_use,
+                "maxInUseConnections": self.max_in_use,
+                "checkoutFailures": dict(self.checkout_failures),
+            }
+
+        return {**usage, "checkoutWait": self.checkout_wait.snapshot()}
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """
+    Track the latency of the commands sent to the server, by collection and operation.
+    """
+
+    def __init__(self):
+        self.stats: Dict[str, LatencyStats] = {}
+        # Series name of the commands in flight, by connection and request ID
+        self.pending: Dict[Tuple, str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _series_name(event) -> str:
+        # The command document names its collection, e.g. {"find": "messages"},
+        # except getMore which names it in a separate field
+        collection = event.command.get(event.command_name)
+
+        if not isinstance(collection, str):
+            collection = event.command.get("collection")
+
+        if isinstance(collection, str):
+            return f"{collection}.{event.command_name}"
+
+        return f"{event.database_name}.{event.command_name}"
+
+    def _finish(self, event, failed: bool) -> None:
+        with self._lock:
+            name = self.pending.pop((event.connection_id, event.request_id), None)
+
+            if name is None:
+                return
+
+            stats = self.stats.setdefault(name, LatencyStats())
+
+        stats.record(event.duration_micros / 1000, failed=failed)
+
+    def started(self, event):
+        name = self._series_name(event)
+
+        with self._lock:
+            self.pending[(event.connection_id, event.request_id)] = name
+
+    def succeeded(self, event):
+        self._finish(event, failed=False)
+
+    def failed(self, event):
+        self._finish(event, failed=True)
+
+    def snapshot(self) -> dict:
+        """
+        Summarise the command latencies.
+
+        Returns:
+            dict: Latency summary by "collection.operation".
+        """
+        with self._lock:
+            stats = dict(self.stats)
+
+        return {name: series.snapshot() for name, series in sorted(stats.items())}
+
+
+pool_metrics = PoolMetricsListener()
+command_metrics = CommandMetricsListener()
+
+
+def get_mongo_metrics(pool_options: Optional[dict] = None) -> dict:
+    """
+    Collect the connection pool and command metrics.
+
+    Args:
+        pool_options (Optional[dict]): Configured pool options to include.
+
+    Returns:
+        dict: Pool options, pool usage and command latencies.
+    """
+    return {
+        "poolOptions": pool_options or {},
+        "pool": pool_metrics.snapshot(),
+        "commands": command_metrics.snapshot(),
+    }
@@ -7,10 +7,13 @@ from src.llm.models.openai_model import get_openai_model
 from pinecone import Pinecone
 from src.core.config import ENV_VARS
 
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIMENSIONS = 512
+
 # Initialize OpenAI embeddings model for vectorizing text
 embeddings = OpenAIEmbeddings(
-    model="text-embedding-3-small",
-    dimensions=512,
+    model=EMBEDDING_MODEL,
+    dimensions=EMBEDDING_DIMENSIONS,
 )
 
 # Initialize Pinecone client with API key from env vars
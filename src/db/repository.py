@@ -0,0 +1,80 @@
+from typing import Optional
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ReturnDocument
+from src.db.collections import (
+    users_collection,
+    conversations_collection,
+    messages_collection,
+    prompts_collection,
+)
+from src.schema.conversation_schema import CONVERSATION_SCHEMA_FIELDS
+from src.schema.message_schema import MESSAGE_SCHEMA_FIELDS
+
+
+class MongoRepository:
+    """
+    Thin layer over a Motor collection whose mutations return the written
+    document in the same round trip, projected to the fields the schema
+    functions read.
+    """
+
+    def __init__(
+        self, collection: AsyncIOMotorCollection, projection: Optional[dict] = None
+    ):
+        self.collection = collection
+        self.projection = projection
+
+    async def find_one(self, filter: dict) -> Optional[dict]:
+        """
+        Retrieve one document.
+
+        Args:
+            filter (dict): Query filter.
+
+        Returns:
+            Optional[dict]: The projected document, or None if nothing matches.
+        """
+        return await self.collection.find_one(filter, self.projection)
+
+    async def update_one(
+        self, filter: dict, update: dict, upsert: bool = False
+    ) -> Optional[dict]:
+        """
+        Update one document and return it as it is after the update.
+
+        Args:
+            filter (dict): Query filter.
+            update (dict): Update operators.
+            upsert (bool, optional): Insert the document if nothing matches. Defaults to False.
+
+        Returns:
+            Optional[dict]: The updated projected document, or None if nothing matched.
+        """
+        return await self.collection.find_one_and_update(
+            filter,
+            update,
+            projection=self.projection,
+            upsert=upsert,
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def delete_one(self, filter: dict) -> bool:
+        """
+        Delete one document.
+
+        Args:
+            filter (dict): Query filter.
+
+        Returns:
+            bool: True if a document was deleted.
+        """
+        response = await self.collection.delete_one(filter)
+        return response.deleted_count > 0
+
+
+users_repository = MongoRepository(users_collection)
+conversations_repository = MongoRepository(
+    conversations_collection, CONVERSATION_SCHEMA_FIELDS
+)
+messages_repository = MongoRepository(messages_collection, MESSAGE_SCHEMA_FIELDS)
+prompts_repository = MongoRepository(prompts_collection)
@@ -0,0 +1,48 @@
+import io
+from PIL import Image, ImageFilter, ImageStat
+from src.core.logger import logger
+
+# Images are downscaled to this size before the text pre-check
+PRECHECK_SIZE = (512, 512)
+
+# Grayscale standard deviation below which an image is treated as blank
+MIN_CONTRAST = 8.0
+
+# Share of edge pixels an image needs before it may contain text
+MIN_EDGE_RATIO = 0.01
+
+EDGE_THRESHOLD = 64
+
+
+def has_detectable_text(content: bytes) -> bool:
+    """
+    Cheaply check whether an image may contain text worth running OCR on.
+    Blank and near uniform images (e.g. solid backgrounds, empty scans) have
+    too little contrast or too few edges to hold readable text. The check
+    errs on the side of running OCR: anything it is unsure about passes.
+
+    Args:
+        content (bytes): Raw image content.
+
+    Returns:
+        bool: False if the image clearly holds no text, True otherwise.
+    """
+    try:
+        with Image.open(io.BytesIO(content)) as image:
+            image.draft("L", PRECHECK_SIZE)
+            grayscale = image.convert("L")
+            grayscale.thumbnail(PRECHECK_SIZE)
+
+    except Exception as e:
+        logger.warning(f"Failed to open image for text pre-check: {e}")
+        return True
+
+    if ImageStat.Stat(grayscale).stddev[0] < MIN_CONTRAST:
+        return False
+
+    edges = grayscale.filter(ImageFilter.FIND_EDGES)
+    histogram = edges.histogram()
+    edge_pixels = sum(histogram[EDGE_THRESHOLD:])
+    total_pixels = grayscale.width * grayscale.height
+
+    return edge_pixels / total_pixels >= MIN_EDGE_RATIO
@@ -0,0 +1,102 @@
+import re
+from functools import partial
+from typing import Callable, Dict, List, Optional
+from langchain_core.documents import Document
+from src.utils.constants.file_type import FileType
+from src.llm.loaders.text_loaders import (
+    load_text,
+    load_html,
+    load_json,
+    load_csv,
+    load_markdown,
+    load_code,
+)
+
+FileLoader = Callable[[bytes, dict], List[Document]]
+
+# First line of a top-level definition for each supported language
+CODE_DEFINITIONS = {
+    FileType.PY: ("python", r"(?:async\s+def|def|class)\s"),
+    FileType.JS: (
+        "javascript",
+        r"(?:export\s+)?(?:default\s+)?(?:async\s+)?(?:function\*?|class|const|let|var)\s",
+    ),
+    FileType.TS: (
+        "typescript",
+        r"(?:export\s+)?(?:default\s+)?(?:declare\s+)?(?:abstract\s+)?(?:async\s+)?"
+        r"(?:function\*?|class|interface|type|enum|const|let|var|namespace)\s",
+    ),
+    FileType.JAVA: (
+        "java",
+        r"\s{0,4}(?:(?:public|private|protected|static|final|abstract|synchronized)\s+)*"
+        r"(?:class\s|interface\s|enum\s|record\s|[\w<>\[\],]+\s+\w+\s*\()",
+    ),
+    FileType.KOTLIN: (
+        "kotlin",
+        r"\s{0,4}(?:(?:public|private|protected|internal|override|open|abstract|data|sealed|suspend|inline)\s+)*"
+        r"(?:fun|class|object|interface)\s",
+    ),
+    FileType.SWIFT: (
+        "swift",
+        r"\s{0,4}(?:(?:public|private|fileprivate|internal|open|static|final|override|mutating)\s+)*"
+        r"(?:func|class|struct|enum|protocol|extension)\s",
+    ),
+    FileType.GO: ("go", r"(?:func|type)\s"),
+    FileType.RB: ("ruby", r"\s{0,2}(?:def|class|module)\s"),
+    FileType.PHP: (
+        "php",
+        r"\s{0,4}(?:(?:public|private|protected|static|abstract|final)\s+)*"
+        r"(?:function|class|interface|trait)\s",
+    ),
+    FileType.C: ("c", r"(?:struct\s|[A-Za-z_][\w\*]*(?:\s+[\w\*]+)+\s*\([^;]*$)"),
+    FileType.CPP: (
+        "cpp",
+        r"(?:class\s|struct\s|namespace\s|template\s*<"
+        r"|[A-Za-z_][\w\*&:<>,]*(?:\s+[\w\*&:<>,~]+)+\s*\([^;]*$)",
+    ),
+    FileType.SH: ("shell", r"(?:function\s+)?[A-Za-z_][\w-]*\s*\(\)"),
+    FileType.SQL: (
+        "sql",
+        r"(?i:create|alter|drop|insert|update|delete|select|with|grant)\b",
+    ),
+}
+
+FILE_LOADERS: Dict[FileType, FileLoader] = {
+    FileType.TXT: load_text,
+    FileType.YAML: load_text,
+    FileType.XML: load_text,
+    FileType.HTML: load_html,
+    FileType.JSON: load_json,
+    FileType.CSV: load_csv,
+    FileType.MARKDOWN: load_markdown,
+    **{
+        file_type: partial(
+            load_code, definition=re.compile(pattern), language=language
+        )
+        for file_type, (language, pattern) in CODE_DEFINITIONS.items()
+    },
+}
+
+
+def get_file_loader(content_type: str, filename: str) -> Optional[FileLoader]:
+    """
+    Find the lightweight in-process loader for a file. PDF, Office and image
+    files have no entry and go through the unstructured-based S3 loader.
+
+    Args:
+        content_type (str): MIME type of the file.
+        filename (str): Original file name.
+
+    Returns:
+        Optional[FileLoader]: The loader, or None if the file needs the heavy path.
+    """
+    try:
+        file_type = FileType(content_type)
+    except ValueError:
+        return None
+
+    # Python files share the generic binary MIME type, so check the extension too
+    if file_type == FileType.PY and not filename.lower().endswith(".py"):
+        return None
+
+    return FILE_LOADERS.get(file_type)
@@ -0,0 +1,83 @@
+import io
+from typing import Iterator, List, Optional, Tuple
+from pypdf import PdfReader
+from langchain_core.documents import Document
+from src.core.logger import logger
+
+# Pages per window grow from the first page up to this size, so the start
+# of a document is indexed quickly without making every window tiny
+MAX_PAGE_WINDOW = 16
+
+
+def open_pdf(content: bytes) -> Optional[PdfReader]:
+    """
+    Open a PDF for page by page text extraction.
+
+    Args:
+        content (bytes): Raw PDF content.
+
+    Returns:
+        Optional[PdfReader]: The reader, or None if the PDF cannot be read (e.g. encrypted or corrupt).
+    """
+    try:
+        reader = PdfReader(io.BytesIO(content))
+
+        if reader.is_encrypted:
+            return None
+
+        return reader
+
+    except Exception as e:
+        logger.warning(f"Failed to open PDF for page extraction: {e}")
+        return None
+
+
+def iter_page_windows(page_count: int) -> Iterator[Tuple[int, int]]:
+    """
+    Split a page range into windows of 1, 2, 4, ... pages up to MAX_PAGE_WINDOW.
+
+    Args:
+        page_count (int): Number of pages in the document.
+
+    Yields:
+        Tuple[int, int]: Start (inclusive) and end (exclusive) page indexes.
+    """
+    start = 0
+    size = 1
+
+    while start < page_count:
+        end = min(start + size, page_count)
+        yield start, end
+        start = end
+        size = min(size * 2, MAX_PAGE_WINDOW)
+
+
+def load_pdf_pages(
+    reader: PdfReader, metadata: dict, start: int, end: int
+) -> List[Document]:
+    """
+    Extract the text of a range of PDF pages, one document per page.
+
+    Args:
+        reader (PdfReader): Opened PDF.
+        metadata (dict): Metadata to attach to each document.
+        start (int): First page index (inclusive).
+        end (int): Last page index (exclusive).
+
+    Returns:
+        List[Document]: Documents for pages that contain text.
+    """
+    documents = []
+
+    for page_index in range(start, end):
+        text = reader.pages[page_index].extract_text() or ""
+
+        if text.strip():
+            documents.append(
+                Document(
+                    page_content=text,
+                    metadata={**metadata, "page": page_index + 1},
+                )
+            )
+
+    return documents
@@ -0,0 +1,300 @@
+import csv
+import io
+import json
+import re
+from typing import Iterator, List, Optional
+from bs4 import BeautifulSoup
+from langchain_core.documents import Document
+
+# Number of CSV rows grouped into one document
+CSV_ROWS_PER_DOCUMENT = 50
+
+# Adjacent code blocks shorter than this are merged to avoid tiny chunks
+MIN_CODE_BLOCK_CHARS = 200
+
+JSON_SEPARATORS = re.compile(r"[\s,]*")
+MARKDOWN_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+MARKDOWN_FENCE = re.compile(r"^\s*(```|~~~)")
+
+# Lines directly above a definition that belong to it (decorators, comments, annotations)
+CODE_PREAMBLE = re.compile(r"^\s*(@|#(?!include)|//|/\*|\*|--)")
+
+
+def decode_text(content: bytes) -> str:
+    """
+    Decode raw file content as UTF-8, dropping a byte order mark if present.
+
+    Args:
+        content (bytes): Raw file content.
+
+    Returns:
+        str: Decoded text with undecodable bytes replaced.
+    """
+    return content.decode("utf-8-sig", errors="replace")
+
+
+def load_text(content: bytes, metadata: dict) -> List[Document]:
+    """
+    Load a plain text file (TXT, YAML, XML, ...) as a single document.
+
+    Args:
+        content (bytes): Raw file content.
+        metadata (dict): Metadata to attach to the document.
+
+    Returns:
+        List[Document]: The loaded document, or an empty list for blank files.
+    """
+    text = decode_text(content)
+
+    if not text.strip():
+        return []
+
+    return [Document(page_content=text, metadata=dict(metadata))]
+
+
+def load_html(content: bytes, metadata: dict) -> List[Document]:
+    """
+    Load an HTML file as a single document containing its visible text.
+
+    Args:
+        content (bytes): Raw file content.
+        metadata (dict): Metadata to attach to the document.
+
+    Returns:
+        List[Document]: The loaded document, or an empty list for blank files.
+    """
+    soup = BeautifulSoup(decode_text(content), "html.parser")
+
+    for element in soup(["script", "style", "noscript"]):
+        element.decompose()
+
+    text = soup.get_text("\n", strip=True)
+
+    if not text:
+        return []
+
+    return [Document(page_content=text, metadata=dict(metadata))]
+
+
+def iter_json_records(text: str) -> Iterator[str]:
+    """
+    Incrementally decode a JSON document into compact one-line records,
+    without building the whole parsed structure first. Top-level arrays
+    yield one record per item, a top-level object yields one record per key,
+    and concatenated or newline-delimited JSON yields one record per value.
+
+    Args:
+        text (str): JSON text.
+
+    Yields:
+        str: Compact JSON text of each record.
+
+    Raises:
+        json.JSONDecodeError: If the text is not valid JSON.
+    """
+    decoder = json.JSONDecoder()
+    position = JSON_SEPARATORS.match(text, 0).end()
+    is_array = text.startswith("[", position)
+
+    if is_array:
+        position = JSON_SEPARATORS.match(text, position + 1).end()
+
+    while position < len(text):
+        if is_array and text.startswith("]", position):
+            break
+
+        value, position = decoder.raw_decode(text, position)
+        position = JSON_SEPARATORS.match(text, position).end()
+
+        if not is_array and isinstance(value, dict):
+            for key, item in value.items():
+                yield json.dumps({key: item}, ensure_ascii=False)
+        else:
+            yield json.dumps(value, ensure_ascii=False)
+
+
+def load_json(content: bytes, metadata: dict) -> List[Document]:
+    """
+    Load a JSON or NDJSON file as one document of newline-separated records,
+    falling back to plain text if the file is not valid JSON.
+
+    Args:
+        content (bytes): Raw file content.
+        metadata (dict): Metadata to attach to the document.
+
+    Returns:
+        List[Document]: The loaded document, or an empty list for blank files.
+    """
+    text = decode_text(content)
+
+    try:
+        records = "\n".join(iter_json_records(text))
+    except json.JSONDecodeError:
+        return load_text(content, metadata)
+
+    if not records:
+        return []
+
+    return [Document(page_content=records, metadata=dict(metadata))]
+
+
+def load_csv(content: bytes, metadata: dict) -> List[Document]:
+    """
+    Stream a CSV file row by row, rendering each row as "column: value" pairs
+    so every chunk keeps its column names.
+
+    Args:
+        content (bytes): Raw file content.
+        metadata (dict): Metadata to attach to each document.
+
+    Returns:
+        List[Document]: Documents of up to CSV_ROWS_PER_DOCUMENT rows each.
+    """
+    reader = csv.reader(io.StringIO(decode_text(content), newline=""))
+    header = next(reader, None)
+
+    if not header:
+        return []
+
+    documents = []
+    rows: List[str] = []
+    first_row = 1
+
+    def flush():
+        if rows:
+            documents.append(
+                Document(
+                    page_content="\n".join(rows),
+                    metadata={**metadata, "row_start": first_row},
+                )
+            )
+
+    for row_number, row in enumerate(reader, start=1):
+        if not any(row):
+            continue
+
+        if not rows:
+            first_row = row_number
+
+        rows.append(
+            ", ".join(f"{column}: {value}" for column, value in zip(header, row))
+        )
+
+        if len(rows) == CSV_ROWS_PER_DOCUMENT:
+            flush()
+            rows = []
+
+    flush()
+
+    return documents
+
+
+def load_markdown(content: bytes, metadata: dict) -> List[Document]:
+    """
+    Split a Markdown file into one document per section. Each section is
+    prefixed with its heading path so chunks keep their context.
+
+    Args:
+        content (bytes): Raw file content.
+        metadata (dict): Metadata to attach to each document.
+
+    Returns:
+        List[Document]: One document per non-empty section.
+    """
+    documents = []
+    headings: List[str] = []
+    lines: List[str] = []
+    in_fence = False
+
+    def flush():
+        body = "\n".join(lines).strip()
+
+        if body:
+            path = " > ".join(headings)
+            documents.append(
+                Document(
+                    page_content=f"{path}\n\n{body}" if path else body,
+                    metadata={**metadata, "headings": path},
+                )
+            )
+
+    for line in decode_text(content).splitlines():
+        if MARKDOWN_FENCE.match(line):
+            in_fence = not in_fence
+
+        heading = None if in_fence else MARKDOWN_HEADING.match(line)
+
+        if not heading:
+            lines.append(line)
+            continue
+
+        flush()
+        lines = []
+
+        level = len(heading.group(1))
+        del headings[level - 1 :]
+        headings.extend([""] * (level - 1 - len(headings)))
+        headings.append(heading.group(2))
+
+    flush()
+
+    return documents
+
+
+def load_code(
+    content: bytes, metadata: dict, definition: re.Pattern, language: str
+) -> List[Document]:
+    """
+    Split a source file into one document per top-level definition. Comments
+    and decorators directly above a definition stay with it, and very small
+    adjacent blocks are merged.
+
+    Args:
+        content (bytes): Raw file content.
+        metadata (dict): Metadata to attach to each document.
+        definition (re.Pattern): Pattern matching the first line of a definition.
+        language (str): Language name recorded in the metadata.
+
+    Returns:
+        List[Document]: One document per definition block.
+    """
+    blocks: List[List[str]] = [[]]
+    block_starts = [1]
+
+    for line_number, line in enumerate(decode_text(content).splitlines(), start=1):
+        current = blocks[-1]
+
+        if definition.match(line) and any(current):
+            # Carry the preamble of this definition over from the previous block
+            preamble_start = len(current)
+
+            while preamble_start > 0 and CODE_PREAMBLE.match(current[preamble_start - 1]):
+                preamble_start -= 1
+
+            if any(current[:preamble_start]):
+                blocks.append(current[preamble_start:])
+                block_starts.append(line_number - (len(current) - preamble_start))
+                del current[preamble_start:]
+
+        blocks[-1].append(line)
+
+    documents: List[Document] = []
+    merged: Optional[Document] = None
+
+    for start_line, block in zip(block_starts, blocks):
+        text = "\n".join(block).strip()
+
+        if not text:
+            continue
+
+        if merged and len(merged.page_content) + len(text) < MIN_CODE_BLOCK_CHARS:
+            merged.page_content += "\n\n" + text
+            continue
+
+        merged = Document(
+            page_content=text,
+            metadata={**metadata, "language": language, "start_line": start_line},
+        )
+        documents.append(merged)
+
+    return documents
@@ -1,5 +1,10 @@
+import tiktoken
+from functools import lru_cache
 from src.llm.models.openai_model import MODEL_TOKEN_LIMITS
 
+# Encoding used by the text-embedding-3 models
+DEFAULT_ENCODING = "cl100k_base"
+
 
 def get_max_prompt_tokens(model_name: str, output_tokens: int = 1024):
     """
@@ -14,3 +19,31 @@ def get_max_prompt_tokens(model_name: str, output_tokens: int = 1024):
         int: Maximum tokens allowed for the prompt.
     """
     return MODEL_TOKEN_LIMITS[model_name] - output_tokens
+
+
+@lru_cache(maxsize=None)
+def get_token_encoding(encoding_name: str = DEFAULT_ENCODING) -> tiktoken.Encoding:
+    """
+    Load a tiktoken encoding once and reuse it across calls.
+
+    Args:
+        encoding_name (str): Name of the tiktoken encoding.
+
+    Returns:
+        tiktoken.Encoding: The encoding instance.
+    """
+    return tiktoken.get_encoding(encoding_name)
+
+
+def count_tokens(text: str, encoding_name: str = DEFAULT_ENCODING) -> int:
+    """
+    Count the number of tokens in a piece of text.
+
+    Args:
+        text (str): Text to measure.
+        encoding_name (str): Name of the tiktoken encoding.
+
+    Returns:
+        int: Number of tokens in the text.
+    """
+    return len(get_token_encoding(encoding_name).encode_ordinary(text))
@@ -1,4 +1,5 @@
-from fastapi import FastAPI
+import asyncio
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from src.api.v1.endpoints.health import health_router
 from src.api.v1.endpoints.user import user_router
@@ -7,11 +8,21 @@ from src.api.v1.endpoints.message import messages_router
 from src.api.v1.endpoints.newsletter import newsletter_router
 from src.api.v1.endpoints.prompt import prompt_router
 from src.api.v1.endpoints.file import file_router
+from src.api.v1.endpoints.search import search_router
 from src.db.mongo import is_mongo_connected, client
-from src.core.config import validate_env_vars
+from src.db.indexes import ensure_indexes, run_index_report
+from src.core.config import validate_env_vars, SETTINGS
 from src.core.logger import logger
 from src.core.constant import APP_NAME
 from src.core.server.socket_server import socket_app
+from src.services.ingestion_service import ingestion_workers, ocr_workers
+from src.services.deletion_service import deletion_workers, run_deletion_sweep
+from src.services.conversation_service import backfill_conversation_summaries
+from src.services.message_service import backfill_message_user_ids
+from src.services.archive_service import run_archival
+from src.services.orphan_gc_service import run_orphan_gc
+from src.services.conversation_cache_service import watch_conversation_changes
+from src.utils.caches.identity_map import identity_map_scope
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
@@ -21,14 +32,43 @@ version = "v1"
 base_url = f"/api/{version}"
 
 
+def log_background_task_failure(task: asyncio.Task) -> None:
+    """
+    Log the error of a startup background task that failed.
+    """
+    if not task.cancelled() and task.exception():
+        logger.error(f"Background task {task.get_name()} failed: {task.exception()}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Startup and shutdown logic for the FastAPI app.
     """
+    backfills = []
+
     try:
         validate_env_vars()
-        is_mongo_connected()
+        await is_mongo_connected()
+        await ensure_indexes()
+        ingestion_workers.start()
+        ocr_workers.start()
+        deletion_workers.start()
+        backfills = [
+            asyncio.create_task(backfill_conversation_summaries()),
+            asyncio.create_task(backfill_message_user_ids()),
+            asyncio.create_task(run_archival(SETTINGS["ARCHIVE_INTERVAL_SECONDS"])),
+            asyncio.create_task(run_orphan_gc(SETTINGS["ORPHAN_GC_INTERVAL_SECONDS"])),
+            asyncio.create_task(watch_conversation_changes()),
+            asyncio.create_task(
+                run_deletion_sweep(SETTINGS["DELETION_SWEEP_INTERVAL_SECONDS"])
+            ),
+            asyncio.create_task(
+                run_index_report(SETTINGS["MONGO_INDEX_REPORT_DELAY_SECONDS"])
+            ),
+        ]
+        for backfill in backfills:
+            backfill.add_done_callback(log_background_task_failure)
         logger.info(f"Starting {APP_NAME} application...")
         yield
     except Exception as e:
@@ -36,6 +76,11 @@ async def lifespan(app: FastAPI):
         raise
     finally:
         logger.info("Shutting down application...")
+        for backfill in backfills:
+            backfill.cancel()
+        await ingestion_workers.stop()
+        await ocr_workers.stop()
+        await deletion_workers.stop()
         try:
             if client:
                 await client.close()
@@ -61,6 +106,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def identity_map_middleware(request: Request, call_next):
+    """
+    Memoize user and conversation lookups for the lifetime of a request,
+    including the background tasks it schedules.
+    """
+    with identity_map_scope():
+        return await call_next(request)
+
+
 # Include HTTP routers
 app.include_router(health_router, prefix=f"{base_url}/health", tags=["Health"])
 app.include_router(user_router, prefix=f"{base_url}/users", tags=["User"])
@@ -73,6 +129,7 @@ app.include_router(
 )
 app.include_router(prompt_router, prefix=f"{base_url}/prompts", tags=["Prompt"])
 app.include_router(file_router, prefix=f"{base_url}/files", tags=["File"])
+app.include_router(search_router, prefix=f"{base_url}/search", tags=["Search"])
 
 
 app.mount("/socket.io", socket_app)
@@ -31,6 +31,24 @@ class Conversation(BaseConversation):
         default_factory=lambda: datetime.now(timezone.utc),
         description="Conversation update date",
     )
+    lastMessagePreview: Optional[str] = Field(
+        None, description="Start of the latest message with content"
+    )
+    messageCount: int = Field(
+        default=0, description="Number of messages in the conversation"
+    )
+    lastActivityAt: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        description="Date of the latest message, or creation date without messages",
+    )
+    isArchived: bool = Field(
+        default=False,
+        description="Track if the messages were moved to cold storage",
+    )
+
+
+class ConversationMetadata(BaseConversation):
+    id: str = Field(..., description="Conversation ID")
 
 
 class ConversationTitle(BaseConversation):
@@ -42,10 +60,44 @@ class ConversationTitle(BaseConversation):
     )
 
 
+next_cursor_description = "Cursor of the next page, None on the last page"
+
+
 class ConversationWithMessages(Conversation):
     messages: List[Message] = Field(
         ..., description="List of all conversation messages ordered by timestamp"
     )
+    nextCursor: Optional[str] = Field(
+        None, description=f"{next_cursor_description}, set when messages are paginated"
+    )
+
+
+class ConversationPage(BaseModel):
+    conversations: List[Conversation] = Field(
+        ..., description="Conversations of the page, most recently active first"
+    )
+    nextCursor: Optional[str] = Field(None, description=next_cursor_description)
+
+
+# Conversations accepted by one bulk delete request
+MAX_BULK_DELETE_SIZE = 1000
+
+
+class BulkDeleteConversations(BaseModel):
+    conversationIds: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BULK_DELETE_SIZE,
+        description="IDs of the conversations to delete",
+    )
+
+
+class BulkDeleteConversationsResult(BaseModel):
+    deletedConversationIds: List[str] = Field(
+        ...,
+        description="IDs of the deleted conversations. Conversations that do not "
+        "exist or belong to another user are skipped",
+    )
 
 
 class UpdateConversation(BaseModel):
@@ -0,0 +1,19 @@
+from enum import Enum
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    def __str__(self):
+        return self.value
+
+
+class JobType(str, Enum):
+    INGEST_FILE = "ingest_file"
+    DELETE_CONVERSATIONS = "delete_conversations"
+
+    def __str__(self):
+        return self.value
@@ -6,6 +6,12 @@ from typing import Optional
 
 content_description = "Content of the message e.g text, image, etc."
 status_description = "Status of the message"
+has_partial_context_description = (
+    "Track if the response was generated before all uploaded files were indexed"
+)
+has_pending_image_text_description = (
+    "Track if the response was generated while uploaded images awaited OCR"
+)
 
 
 class Author(str, Enum):
@@ -28,6 +34,12 @@ class BaseMessage(BaseModel):
     )
     author: Author = Field(..., description="Author of the conversation")
     status: Optional[Status] = Field(None, description=status_description)
+    hasPartialContext: Optional[bool] = Field(
+        None, description=has_partial_context_description
+    )
+    hasPendingImageText: Optional[bool] = Field(
+        None, description=has_pending_image_text_description
+    )
 
 
 class Message(BaseMessage):
@@ -43,3 +55,9 @@ class CreateMessage(BaseModel):
 class UpdateMessage(BaseModel):
     content: Optional[str] = Field(None, description=content_description)
     status: Optional[Status] = Field(None, description=status_description)
+    hasPartialContext: Optional[bool] = Field(
+        None, description=has_partial_context_description
+    )
+    hasPendingImageText: Optional[bool] = Field(
+        None, description=has_pending_image_text_description
+    )
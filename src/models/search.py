@@ -0,0 +1,25 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+from src.models.message import Author
+
+
+class MessageSearchHit(BaseModel):
+    messageId: str = Field(..., description="ID of the matching message")
+    conversationId: str = Field(..., description="ID of the message's conversation")
+    conversationTitle: Optional[str] = Field(
+        None, description="Title of the message's conversation"
+    )
+    author: Author = Field(..., description="Author of the message")
+    timestamp: datetime = Field(..., description="Message creation date")
+    snippet: str = Field(..., description="Part of the message around the match")
+    score: float = Field(..., description="Relevance of the message to the query")
+
+
+class MessageSearchResults(BaseModel):
+    results: List[MessageSearchHit] = Field(
+        ..., description="Matching messages, most relevant first"
+    )
+    nextOffset: Optional[int] = Field(
+        None, description="Offset of the next page, None on the last page"
+    )
@@ -0,0 +1,62 @@
+"""
+Compare the token-aware chunker with the recursive character splitter on
+large generated documents.
+
+Run with: python -m src.playground.benchmarks.chunking_benchmark
+"""
+
+import random
+import statistics
+import time
+from langchain_core.documents import Document
+from src.services.chunking_service import chunking_service
+from src.llm.utils import count_tokens
+
+WORDS = (
+    "the quarterly report shows revenue growth across all regions while "
+    "operating costs remained stable compared with the previous period "
+    "customers adopted the new pricing model faster than expected"
+).split()
+
+SIZES_IN_MB = [1, 4, 16]
+
+
+def generate_text(size_in_mb: int, seed: int = 42) -> str:
+    # Paragraphs of sentences with varying lengths, roughly like extracted PDF text
+    rng = random.Random(seed)
+    target = size_in_mb * 1_000_000
+    paragraphs = []
+    length = 0
+
+    while length < target:
+        sentences = [
+            " ".join(rng.choices(WORDS, k=rng.randint(5, 40))).capitalize() + "."
+            for _ in range(rng.randint(1, 12))
+        ]
+        paragraph = " ".join(sentences)
+        paragraphs.append(paragraph)
+        length += len(paragraph) + 2
+
+    return "\n\n".join(paragraphs)
+
+
+def run(name: str, split, documents) -> None:
+    start = time.perf_counter()
+    chunks = split(documents=documents)
+    elapsed = time.perf_counter() - start
+
+    tokens = [count_tokens(chunk.page_content) for chunk in chunks]
+
+    print(
+        f"{name:<24} {elapsed:>8.2f}s {len(chunks):>8} chunks "
+        f"tokens min={min(tokens)} mean={statistics.mean(tokens):.0f} "
+        f"max={max(tokens)} stdev={statistics.pstdev(tokens):.0f}"
+    )
+
+
+for size in SIZES_IN_MB:
+    documents = [Document(page_content=generate_text(size))]
+    print(f"\n{size} MB input")
+
+    run("recursive_text_splitter", chunking_service.recursive_text_splitter, documents)
+    run("token_text_splitter", chunking_service.token_text_splitter, documents)
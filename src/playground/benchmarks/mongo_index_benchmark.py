@@ -0,0 +1,134 @@
+"""
+Measure message and conversation query latency at 1M messages, without and
+with the indexes declared in src/db/indexes.py.
+
+The benchmark writes to a separate database (MONGO_DB with a "_benchmark"
+suffix) and drops it afterwards.
+
+Run with: python -m src.playground.benchmarks.mongo_index_benchmark
+"""
+
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from bson import ObjectId
+from src.db.mongo import client
+from src.db.indexes import INDEXES
+from src.core.config import ENV_VARS
+
+MESSAGE_COUNT = 1_000_000
+CONVERSATION_COUNT = 20_000
+USER_COUNT = 500
+INSERT_BATCH_SIZE = 10_000
+QUERY_RUNS = 200
+
+db = client[f"{ENV_VARS['MONGO_DB']}_benchmark"]
+
+
+async def seed(rng: random.Random):
+    user_ids = [ObjectId() for _ in range(USER_COUNT)]
+    conversations = [
+        {
+            "_id": ObjectId(),
+            "userId": rng.choice(user_ids),
+            "title": "Benchmark chat",
+            "lastActivityAt": datetime.now(timezone.utc),
+        }
+        for _ in range(CONVERSATION_COUNT)
+    ]
+    await db.conversations.insert_many(conversations)
+
+    conversation_ids = [conversation["_id"] for conversation in conversations]
+    start = datetime.now(timezone.utc) - timedelta(days=365)
+
+    for offset in range(0, MESSAGE_COUNT, INSERT_BATCH_SIZE):
+        await db.messages.insert_many(
+            [
+                {
+                    "conversationId": rng.choice(conversation_ids),
+                    "timestamp": start + timedelta(seconds=offset + i),
+                    "author": rng.choice(["user", "ai"]),
+                    "status": "success",
+                    "content": "benchmark message " * rng.randint(1, 20),
+                }
+                for i in range(INSERT_BATCH_SIZE)
+            ]
+        )
+
+    return user_ids, conversation_ids
+
+
+async def measure(name: str, query, values, rng: random.Random) -> None:
+    latencies = []
+
+    for _ in range(QUERY_RUNS):
+        value = rng.choice(values)
+        started = time.perf_counter()
+        await query(value)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+
+    print(
+        f"{name:<28} p50={statistics.median(latencies):>8.2f}ms "
+        f"p95={p95:>8.2f}ms max={latencies[-1]:>8.2f}ms"
+    )
+
+
+async def run_queries(label: str, user_ids, conversation_ids) -> None:
+    rng = random.Random(7)
+    print(f"\n{label}")
+
+    async def get_messages(conversation_id):
+        await (
+            db.messages.find({"conversationId": conversation_id})
+            .sort("timestamp", 1)
+            .to_list(length=None)
+        )
+
+    async def get_all_conversations(user_id):
+        await (
+            db.conversations.find({"userId": user_id})
+            .sort("lastActivityAt", -1)
+            .to_list(length=None)
+        )
+
+    await measure("get_messages", get_messages, conversation_ids, rng)
+    await measure("get_all_conversations", get_all_conversations, user_ids, rng)
+
+    explain = await (
+        db.messages.find({"conversationId": conversation_ids[0]})
+        .sort("timestamp", 1)
+        .explain()
+    )
+    stats = explain["executionStats"]
+    print(
+        f"{'get_messages explain':<28} docsExamined={stats['totalDocsExamined']} "
+        f"returned={stats['nReturned']}"
+    )
+
+
+async def main():
+    rng = random.Random(42)
+
+    await client.drop_database(db.name)
+
+    try:
+        print(f"Seeding {MESSAGE_COUNT} messages in {CONVERSATION_COUNT} conversations...")
+        user_ids, conversation_ids = await seed(rng)
+
+        await run_queries("Without indexes", user_ids, conversation_ids)
+
+        for collection_name in ("messages", "conversations"):
+            await db[collection_name].create_indexes(INDEXES[collection_name])
+
+        await run_queries("With indexes", user_ids, conversation_ids)
+
+    finally:
+        await client.drop_database(db.name)
+
+
+asyncio.run(main())
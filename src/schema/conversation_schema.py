@@ -1,4 +1,26 @@
-from src.models.conversation import Conversation
+from src.models.conversation import Conversation, ConversationMetadata
+
+# Projection loading only the fields read by conversation_schema
+CONVERSATION_SCHEMA_FIELDS = {
+    "userId": 1,
+    "title": 1,
+    "hasGeneratedTitle": 1,
+    "hasFilesUploaded": 1,
+    "createdAt": 1,
+    "updatedAt": 1,
+    "lastMessagePreview": 1,
+    "messageCount": 1,
+    "lastActivityAt": 1,
+    "archive": 1,
+}
+
+# Fields that rarely change, cached across requests
+CONVERSATION_METADATA_FIELDS = {
+    "userId": 1,
+    "title": 1,
+    "hasGeneratedTitle": 1,
+    "hasFilesUploaded": 1,
+}
 
 
 def conversation_schema(conversation: Conversation):
@@ -10,4 +32,20 @@ def conversation_schema(conversation: Conversation):
         "hasFilesUploaded": conversation["hasFilesUploaded"],
         "createdAt": conversation["createdAt"],
         "updatedAt": conversation["updatedAt"],
+        "lastMessagePreview": conversation.get("lastMessagePreview"),
+        "messageCount": conversation.get("messageCount", 0),
+        "lastActivityAt": conversation.get(
+            "lastActivityAt", conversation["updatedAt"]
+        ),
+        "isArchived": bool(conversation.get("archive")),
+    }
+
+
+def conversation_metadata_schema(conversation: ConversationMetadata):
+    return {
+        "id": str(conversation["_id"]),
+        "userId": str(conversation["userId"]),
+        "title": conversation["title"],
+        "hasGeneratedTitle": conversation["hasGeneratedTitle"],
+        "hasFilesUploaded": conversation["hasFilesUploaded"],
     }
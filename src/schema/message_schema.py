@@ -1,5 +1,16 @@
 from src.models.message import Message
 
+# Projection loading only the fields read by message_schema
+MESSAGE_SCHEMA_FIELDS = {
+    "conversationId": 1,
+    "timestamp": 1,
+    "author": 1,
+    "status": 1,
+    "content": 1,
+    "hasPartialContext": 1,
+    "hasPendingImageText": 1,
+}
+
 
 def message_schema(message: Message):
     return {
@@ -9,4 +20,6 @@ def message_schema(message: Message):
         "author": message["author"],
         "status": message["status"],
         "content": message["content"],
+        "hasPartialContext": message.get("hasPartialContext"),
+        "hasPendingImageText": message.get("hasPendingImageText"),
     }
@@ -0,0 +1,347 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+import bson
+import zstandard
+from bson import Binary, ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
+from src.db.collections import (
+    conversations_collection,
+    messages_collection,
+    message_archives_collection,
+)
+from src.utils.caches.identity_map import forget
+from src.core.config import SETTINGS
+from src.core.logger import logger
+
+# Uncompressed size of the messages packed into one archive part, well
+# below the 16MB document limit even if a part does not compress at all
+MAX_PART_BYTES = 4 * 1024 * 1024
+
+ZSTD_LEVEL = 10
+
+# Time after which a conversation claimed by a crashed archiver can be claimed again
+ARCHIVE_CLAIM_SECONDS = 600
+
+
+def compress_messages(messages: List[dict]) -> bytes:
+    """
+    Pack messages into one zstd compressed BSON blob.
+
+    Args:
+        messages (List[dict]): Message documents.
+
+    Returns:
+        bytes: Compressed blob.
+    """
+    data = bson.encode({"messages": messages})
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+
+
+def decompress_messages(blob: bytes) -> List[dict]:
+    """
+    Unpack messages packed by compress_messages.
+
+    Args:
+        blob (bytes): Compressed blob.
+
+    Returns:
+        List[dict]: Message documents, with their original IDs and types.
+    """
+    data = zstandard.ZstdDecompressor().decompress(blob)
+    return bson.decode(data)["messages"]
+
+
+async def claim_inactive_conversation(cutoff: datetime) -> Optional[dict]:
+    """
+    Claim the next conversation without activity since the cutoff, so that
+    concurrent archivers never work on the same conversation. The stored
+    archivingAt is the claim token: a claim that expired and was taken over
+    by another archiver no longer matches it.
+
+    Args:
+        cutoff (datetime): Conversations active after this date are kept hot.
+
+    Returns:
+        Optional[dict]: The claimed conversation's _id and archivingAt, or None if there is nothing to archive.
+    """
+    now = datetime.now(timezone.utc)
+
+    return await conversations_collection.find_one_and_update(
+        {
+            "lastActivityAt": {"$lt": cutoff},
+            # Rehydrated conversations get a full inactivity period before archiving again
+            "rehydratedAt": {"$not": {"$gte": cutoff}},
+            "archive": {"$exists": False},
+            "deletedAt": {"$exists": False},
+            "$or": [
+                {"archivingAt": {"$exists": False}},
+                {
+                    "archivingAt": {
+                        "$lt": now - timedelta(seconds=ARCHIVE_CLAIM_SECONDS)
+                    }
+                },
+            ],
+        },
+        {"$set": {"archivingAt": now}},
+        # The stored date, truncated to milliseconds, is what later filters must match
+        projection={"_id": 1, "archivingAt": 1},
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+async def archive_conversation(
+    conversation_id: ObjectId, claim_token: datetime
+) -> Optional[int]:
+    """
+    Move the messages of a conversation into compressed archive parts.
+    Parts are written first, then the conversation is marked as archived,
+    then the hot messages are deleted, so a crash at any point loses nothing.
+    The conversation is only marked while this archiver still holds its
+    claim, so an archiver that took too long never commits over another.
+    The claim is released once the hot messages are deleted.
+
+    Args:
+        conversation_id (ObjectId): Conversation to archive.
+        claim_token (datetime): archivingAt returned by claim_inactive_conversation.
+
+    Returns:
+        Optional[int]: Number of archived messages, None if the claim was lost.
+    """
+    archive_id = ObjectId()
+    cursor = messages_collection.find({"conversationId": conversation_id}).sort(
+        [("timestamp", 1), ("_id", 1)]
+    )
+
+    part = []
+    part_bytes = 0
+    part_count = 0
+    message_ids = []
+
+    async def write_part():
+        nonlocal part, part_bytes, part_count
+
+        blob = await asyncio.to_thread(compress_messages, part)
+
+        await message_archives_collection.insert_one(
+            {
+                "archiveId": archive_id,
+                "conversationId": conversation_id,
+                "part": part_count,
+                "messageCount": len(part),
+                "data": Binary(blob),
+                "createdAt": datetime.now(timezone.utc),
+            }
+        )
+
+        part = []
+        part_bytes = 0
+        part_count += 1
+
+    async for message in cursor:
+        size = len(bson.encode(message))
+
+        if part and part_bytes + size > MAX_PART_BYTES:
+            await write_part()
+
+        part.append(message)
+        part_bytes += size
+        message_ids.append(message["_id"])
+
+    if part:
+        await write_part()
+
+    response = await conversations_collection.update_one(
+        {
+            "_id": conversation_id,
+            "archivingAt": claim_token,
+            "archive": {"$exists": False},
+            "deletedAt": {"$exists": False},
+        },
+        {
+            "$set": {
+                "archive": {
+                    "archiveId": archive_id,
+                    "parts": part_count,
+                    "messageCount": len(message_ids),
+                    "archivedAt": datetime.now(timezone.utc),
+                }
+            },
+        },
+    )
+
+    if response.matched_count != 1:
+        # Claim taken over, or the conversation was deleted: the parts are not referenced
+        await message_archives_collection.delete_many({"archiveId": archive_id})
+        return None
+
+    # Parts of earlier attempts that crashed or lost their claim before committing
+    await message_archives_collection.delete_many(
+        {"conversationId": conversation_id, "archiveId": {"$ne": archive_id}}
+    )
+
+    # Only the archived messages are deleted, messages created meanwhile stay hot
+    for start in range(0, len(message_ids), 1000):
+        await messages_collection.delete_many(
+            {"_id": {"$in": message_ids[start : start + 1000]}}
+        )
+
+    # The claim is held until the hot messages are gone, so a concurrent
+    # rehydration cannot drop the archive while they are being deleted
+    await conversations_collection.update_one(
+        {"_id": conversation_id, "archivingAt": claim_token},
+        {"$unset": {"archivingAt": ""}},
+    )
+
+    return len(message_ids)
+
+
+async def archive_inactive_conversations(inactive_days: int) -> int:
+    """
+    Archive every conversation without activity for the given number of days.
+
+    Args:
+        inactive_days (int): Days without activity after which a conversation is archived.
+
+    Returns:
+        int: Number of archived conversations.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=inactive_days)
+    archived = 0
+
+    while conversation := await claim_inactive_conversation(cutoff):
+        try:
+            message_count = await archive_conversation(
+                conversation["_id"], conversation["archivingAt"]
+            )
+
+            if message_count is None:
+                logger.warning(
+                    f"Lost the archival claim of conversation: {conversation['_id']}"
+                )
+                continue
+
+            archived += 1
+            logger.info(
+                f"Archived {message_count} messages of conversation: {conversation['_id']}"
+            )
+
+        except Exception as e:
+            # The claim expires, so the conversation is retried on a later run
+            logger.error(f"Failed to archive conversation {conversation['_id']}: {e}")
+
+    return archived
+
+
+async def rehydrate_conversation(conversation_id: ObjectId) -> None:
+    """
+    Move the archived messages of a conversation back into the messages
+    collection. The archive is only dropped once no archiver holds a claim
+    on the conversation, since the messages just restored may still be
+    deleted by the archival that wrote it.
+
+    Args:
+        conversation_id (ObjectId): Archived conversation.
+    """
+    conversation = await conversations_collection.find_one(
+        {"_id": conversation_id}, {"archive": 1}
+    )
+
+    if not conversation or not conversation.get("archive"):
+        return
+
+    archive_id = conversation["archive"]["archiveId"]
+    cursor = message_archives_collection.find({"archiveId": archive_id}).sort("part", 1)
+    restored = 0
+
+    async for part in cursor:
+        messages = await asyncio.to_thread(decompress_messages, part["data"])
+
+        try:
+            result = await messages_collection.insert_many(messages, ordered=False)
+            restored += len(result.inserted_ids)
+
+        except BulkWriteError as e:
+            # Messages still present after an interrupted archival keep their _id
+            errors = e.details.get("writeErrors", [])
+
+            if any(error.get("code") != 11000 for error in errors):
+                raise
+
+            restored += e.details.get("nInserted", 0)
+
+    now = datetime.now(timezone.utc)
+
+    # rehydratedAt keeps the conversation hot without moving it up the
+    # conversation list, which is sorted by lastActivityAt. The archive is
+    # kept while an archiver still deletes the hot messages, unless its
+    # claim expired because it crashed.
+    response = await conversations_collection.update_one(
+        {
+            "_id": conversation_id,
+            "archive.archiveId": archive_id,
+            "$or": [
+                {"archivingAt": {"$exists": False}},
+                {
+                    "archivingAt": {
+                        "$lt": now - timedelta(seconds=ARCHIVE_CLAIM_SECONDS)
+                    }
+                },
+            ],
+        },
+        {
+            "$unset": {"archive": "", "archivingAt": ""},
+            "$set": {"rehydratedAt": now},
+        },
+    )
+
+    if response.matched_count != 1:
+        # Still being archived, or rehydrated concurrently: the next read
+        # rehydrates the archive again if it is still referenced
+        logger.info(f"Kept the archive of conversation: {conversation_id}")
+        return
+
+    await message_archives_collection.delete_many({"archiveId": archive_id})
+    forget(("conversation", str(conversation_id)))
+
+    logger.info(f"Rehydrated {restored} messages of conversation: {conversation_id}")
+
+
+async def delete_archived_messages(conversation_ids: List[ObjectId]) -> None:
+    """
+    Delete the archive parts of the given conversations.
+
+    Args:
+        conversation_ids (List[ObjectId]): Conversations being deleted.
+    """
+    response = await message_archives_collection.delete_many(
+        {"conversationId": {"$in": conversation_ids}}
+    )
+
+    if response.deleted_count:
+        logger.info(
+            f"Deleted {response.deleted_count} archive parts of {len(conversation_ids)} conversations"
+        )
+
+
+async def run_archival(interval_seconds: float) -> None:
+    """
+    Archive inactive conversations periodically until cancelled.
+
+    Args:
+        interval_seconds (float): Seconds between runs.
+    """
+    while True:
+        try:
+            archived = await archive_inactive_conversations(
+                SETTINGS["ARCHIVE_AFTER_DAYS"]
+            )
+
+            if archived:
+                logger.info(f"Archived {archived} inactive conversations.")
+
+        except Exception as e:
+            logger.error(f"Conversation archival failed: {e}")
+
+        await asyncio.sleep(interval_seconds)
@@ -7,7 +7,10 @@ from src.models.message import Message, CreateMessage, UpdateMessage
 from src.models.status import Status
 from langchain_core.messages import HumanMessage
 from src.services.message_service import update_message
-from src.services.conversation_service import update_conversation, get_conversation
+from src.services.conversation_service import (
+    update_conversation,
+    get_conversation_metadata,
+)
 from src.models.conversation import UpdateConversation
 from src.models.file import FileData
 from src.core.logger import logging
@@ -17,6 +20,7 @@ from src.core.events import SOCKET_EVENTS
 from src.utils.converters.socketio_utils import (
     async_safe_socket_emit,
 )
+from src.utils.caches.identity_map import identity_map_scope
 from src.llm.chains.conversation_title_chain import chat_conversation_title_chain
 from src.models.conversation import ConversationTitle
 
@@ -42,75 +46,82 @@ async def get_chat_response(
     Raises:
         RuntimeError: If the chat response generation fails.
     """
-    try:
-        user_message = message.model_dump()
-        query = user_message["content"]
+    # Memoize user and conversation lookups for the whole chat turn
+    with identity_map_scope():
+        try:
+            user_message = message.model_dump()
+            query = user_message["content"]
+
+            # Retrieve relevant context using retrieval service
+            context = await retrieval_service.run(
+                query=query,
+                conversation_id=conversation_id,
+                message_id=message_id,
+                files=file_data_list,
+            )
 
-        # Retrieve relevant context using retrieval service
-        query_with_context = await retrieval_service.run(
-            query=query,
-            conversation_id=conversation_id,
-            message_id=message_id,
-            files=file_data_list,
-        )
+            input_messages = [HumanMessage(content=context.text)]
+            config = get_thread_config(conversation_id)
+
+            chunks = []
+
+            async for token, metadata in app.astream(
+                {"messages": input_messages, "language": "English"},
+                config,
+                stream_mode="messages",
+            ):
+                chunks.append(token.content)
+
+                await async_safe_socket_emit(
+                    sio,
+                    SOCKET_EVENTS["CHAT_AI_STREAM"],
+                    {
+                        "id": message_id,
+                        "conversation_id": conversation_id,
+                        "content": token.content,
+                    },
+                    room=conversation_id,
+                )
+
+            response_text = "".join(chunks).strip()
+
+            if not response_text:
+                await get_chat_response_failed(message_id, conversation_id)
+                raise ValueError("Empty response received from the model.")
 
-        input_messages = [HumanMessage(content=query_with_context)]
-        config = get_thread_config(conversation_id)
+            # Update AI message with generated response and success status
+            update_data = UpdateMessage(
+                content=response_text,
+                status=Status.SUCCESS,
+                hasPartialContext=context.is_partial,
+                hasPendingImageText=context.has_pending_image_text,
+            )
+            updated_ai_message = await update_message(message_id, update_data)
 
-        chunks = []
+            # Launch background task to generate conversation title asynchronously
+            title_task = asyncio.create_task(
+                get_chat_title(conversation_id, updated_ai_message),
+                name="generate_chat_title",
+            )
 
-        async for token, metadata in app.astream(
-            {"messages": input_messages, "language": "English"},
-            config,
-            stream_mode="messages",
-        ):
-            chunks.append(token.content)
+            title_task.add_done_callback(
+                lambda t: logging.info(
+                    f"Title generation completed for conversation_id={conversation_id}"
+                )
+            )
 
             await async_safe_socket_emit(
                 sio,
-                SOCKET_EVENTS["CHAT_AI_STREAM"],
-                {
-                    "id": message_id,
-                    "conversation_id": conversation_id,
-                    "content": token.content,
-                },
+                SOCKET_EVENTS["CHAT_AI_MESSAGE"],
+                updated_ai_message,
                 room=conversation_id,
             )
 
-        response_text = "".join(chunks).strip()
+            return updated_ai_message
 
-        if not response_text:
+        except Exception as e:
             await get_chat_response_failed(message_id, conversation_id)
-            raise ValueError("Empty response received from the model.")
-
-        # Update AI message with generated response and success status
-        update_data = UpdateMessage(content=response_text, status=Status.SUCCESS)
-        updated_ai_message = await update_message(message_id, update_data)
-
-        # Launch background task to generate conversation title asynchronously
-        title_task = asyncio.create_task(
-            get_chat_title(conversation_id, updated_ai_message),
-            name="generate_chat_title",
-        )
-
-        title_task.add_done_callback(
-            lambda t: logging.info(
-                f"Title generation completed for conversation_id={conversation_id}"
-            )
-        )
-
-        await async_safe_socket_emit(
-            sio,
-            SOCKET_EVENTS["CHAT_AI_MESSAGE"],
-            updated_ai_message,
-            room=conversation_id,
-        )
-
-        return updated_ai_message
-
-    except Exception as e:
-        await get_chat_response_failed(message_id, conversation_id)
-        raise RuntimeError(f"Failed to get chat response: {str(e)}")
+            raise RuntimeError(f"Failed to get chat response: {str(e)}")
 
 
 async def get_chat_response_failed(
@@ -147,7 +158,7 @@ async def get_chat_title(conversation_id: str, message: Message) -> None:
         RuntimeError: If title generation fails.
     """
     try:
-        conversation = await get_conversation(conversation_id)
+        conversation = await get_conversation_metadata(conversation_id)
 
         if not conversation:
             raise HTTPException(
@@ -1,8 +1,14 @@
-from typing import List
+import re
+from collections import deque
+from typing import Deque, List, Tuple
 from langchain_core.documents import Document
 from langchain_text_splitters import (
     RecursiveCharacterTextSplitter,
 )
+from src.llm.utils import get_token_encoding
+
+# Preferred cut points: paragraph breaks, line breaks and sentence ends
+SEGMENT_BOUNDARY = re.compile(r"\n\s*\n|\n|(?<=[.!?])\s+")
 
 
 class ChunkingService:
@@ -38,5 +44,100 @@ class ChunkingService:
 
         return split_docs
 
+    def token_text_splitter(
+        self,
+        documents: List[Document],
+        chunk_size: int = 250,
+        chunk_overlap: int = 25,
+    ) -> List[Document]:
+        """
+        Split documents into chunks sized in tokens, in a single linear pass.
+
+        Text is cut into segments at paragraph, line and sentence boundaries,
+        the segments are tokenized in one batch, and consecutive segments are
+        packed into chunks of at most chunk_size tokens. Segments longer than
+        a chunk are cut on token boundaries.
+
+        Args:
+            documents (List[Document]): List of input documents to split.
+            chunk_size (int): Maximum number of tokens in each chunk.
+            chunk_overlap (int): Maximum number of tokens repeated from the previous chunk.
+
+        Returns:
+            List[Document]: List of chunked documents preserving metadata.
+        """
+        split_docs = []
+
+        for document in documents:
+            for text in self._split_text_by_tokens(
+                document.page_content, chunk_size, chunk_overlap
+            ):
+                split_docs.append(
+                    Document(page_content=text, metadata=dict(document.metadata))
+                )
+
+        return split_docs
+
+    def _split_text_by_tokens(
+        self, text: str, chunk_size: int, chunk_overlap: int
+    ) -> List[str]:
+        """
+        Pack boundary-delimited segments of a text into token-bounded chunks.
+
+        Args:
+            text (str): Text to split.
+            chunk_size (int): Maximum number of tokens in each chunk.
+            chunk_overlap (int): Maximum number of tokens repeated from the previous chunk.
+
+        Returns:
+            List[str]: Chunk texts in document order.
+        """
+        encoding = get_token_encoding()
+
+        segments = []
+        start = 0
+
+        for match in SEGMENT_BOUNDARY.finditer(text):
+            segments.append(text[start : match.end()])
+            start = match.end()
+
+        if start < len(text):
+            segments.append(text[start:])
+
+        pieces: List[Tuple[str, int]] = []
+
+        for segment, tokens in zip(segments, encoding.encode_ordinary_batch(segments)):
+            if len(tokens) <= chunk_size:
+                pieces.append((segment, len(tokens)))
+                continue
+
+            for i in range(0, len(tokens), chunk_size):
+                window = tokens[i : i + chunk_size]
+                pieces.append((encoding.decode(window), len(window)))
+
+        chunks = []
+        window: Deque[Tuple[str, int]] = deque()
+        window_tokens = 0
+
+        for piece, tokens in pieces:
+            if window and window_tokens + tokens > chunk_size:
+                chunks.append("".join(part for part, _ in window))
+
+                # Keep the tail of the chunk as overlap, as long as the next piece still fits
+                while window and (
+                    window_tokens > chunk_overlap
+                    or window_tokens + tokens > chunk_size
+                ):
+                    _, dropped_tokens = window.popleft()
+                    window_tokens -= dropped_tokens
+
+            window.append((piece, tokens))
+            window_tokens += tokens
+
+        if window:
+            chunks.append("".join(part for part, _ in window))
+
+        return [chunk.strip() for chunk in chunks if chunk.strip()]
+
 
 chunking_service = ChunkingService()
@@ -0,0 +1,189 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional
+from pymongo.errors import OperationFailure
+from src.db.collections import conversations_collection
+from src.schema.conversation_schema import (
+    conversation_metadata_schema,
+    CONVERSATION_METADATA_FIELDS,
+)
+from src.models.conversation import ConversationMetadata
+from src.utils.caches.async_ttl_cache import AsyncTTLCache
+from src.utils.converters.convert_to_object_id import convert_to_object_id
+from src.core.config import SETTINGS
+from src.core.logger import logger
+
+# Error code of a change stream opened on a standalone server
+CHANGE_STREAM_NOT_SUPPORTED = 40573
+
+# Error code of a resume token that fell off the oplog
+CHANGE_STREAM_HISTORY_LOST = 286
+
+CHANGE_STREAM_RETRY_SECONDS = 5
+
+# Overlap between change polls, covering clock skew between workers
+CHANGE_POLL_LOOKBACK_SECONDS = 5
+
+# Conversations are read on every chat turn but their metadata rarely changes
+conversation_metadata_cache = AsyncTTLCache(
+    ttl_seconds=SETTINGS["CONVERSATION_CACHE_TTL_SECONDS"],
+    max_size=SETTINGS["CONVERSATION_CACHE_MAX_SIZE"],
+)
+
+subscribers: List[Callable[[str], None]] = []
+
+# Changes that make a cached conversation stale: deletions, and updates of
+# the cached fields or of the deletion tombstone. Activity updates are ignored.
+CHANGE_STREAM_PIPELINE = [
+    {
+        "$match": {
+            "$or": [
+                {"operationType": {"$in": ["delete", "replace"]}},
+                {
+                    "operationType": "update",
+                    "$or": [
+                        {f"updateDescription.updatedFields.{field}": {"$exists": True}}
+                        for field in [*CONVERSATION_METADATA_FIELDS, "deletedAt"]
+                    ],
+                },
+            ]
+        }
+    },
+    {"$project": {"documentKey": 1}},
+]
+
+
+def subscribe(callback: Callable[[str], None]) -> None:
+    """
+    Register a callback called with the ID of every changed conversation.
+
+    Args:
+        callback (Callable[[str], None]): Called with the conversation ID.
+    """
+    subscribers.append(callback)
+
+
+def publish_conversation_change(conversation_id: str) -> None:
+    """
+    Notify the subscribers that a conversation's metadata changed. Called
+    after this process's own writes, and for the writes of other workers
+    seen on the change stream or by polling.
+
+    Args:
+        conversation_id (str): ID of the changed conversation.
+    """
+    for callback in subscribers:
+        callback(conversation_id)
+
+
+async def load_conversation_metadata(
+    conversation_id: str,
+) -> Optional[ConversationMetadata]:
+    """
+    Return the metadata of a conversation, from the cache when possible.
+
+    Args:
+        conversation_id (str): ID of the conversation.
+
+    Returns:
+        Optional[ConversationMetadata]: The metadata, None if the conversation does not exist or is deleted.
+    """
+
+    async def load() -> Optional[ConversationMetadata]:
+        conversation = await conversations_collection.find_one(
+            {
+                "_id": convert_to_object_id(conversation_id),
+                "deletedAt": {"$exists": False},
+            },
+            CONVERSATION_METADATA_FIELDS,
+        )
+        if not conversation:
+            return None
+        return conversation_metadata_schema(conversation)
+
+    return await conversation_metadata_cache.get(conversation_id, load)
+
+
+async def poll_conversation_changes(interval_seconds: float) -> None:
+    """
+    Publish the conversation changes made by other workers until cancelled,
+    by polling for conversations updated or deleted since the previous poll.
+    Stands in for the change stream on servers without one. Metadata writes
+    always set updatedAt or deletedAt.
+
+    Args:
+        interval_seconds (float): Seconds between polls.
+    """
+    since = datetime.now(timezone.utc)
+
+    while True:
+        await asyncio.sleep(interval_seconds)
+        polled_at = datetime.now(timezone.utc)
+        window_start = since - timedelta(seconds=CHANGE_POLL_LOOKBACK_SECONDS)
+
+        try:
+            cursor = conversations_collection.find(
+                {
+                    "$or": [
+                        {"updatedAt": {"$gt": window_start}},
+                        {"deletedAt": {"$gt": window_start}},
+                    ]
+                },
+                {"_id": 1},
+            )
+
+            async for conversation in cursor:
+                publish_conversation_change(str(conversation["_id"]))
+
+            since = polled_at
+
+        except Exception as e:
+            logger.error(f"Polling conversation changes failed: {e}")
+            # Changes made since the last successful poll may be missed
+            conversation_metadata_cache.clear()
+            since = polled_at
+
+
+async def watch_conversation_changes() -> None:
+    """
+    Publish the conversation changes made by other workers, read from a
+    MongoDB change stream, until cancelled. Change streams need a replica
+    set; without one, changes are polled instead.
+    """
+    resume_token = None
+
+    while True:
+        try:
+            async with conversations_collection.watch(
+                CHANGE_STREAM_PIPELINE, resume_after=resume_token
+            ) as stream:
+                logger.info("Watching conversation changes.")
+
+                async for change in stream:
+                    resume_token = stream.resume_token
+                    publish_conversation_change(str(change["documentKey"]["_id"]))
+
+        except OperationFailure as e:
+            if e.code == CHANGE_STREAM_NOT_SUPPORTED:
+                logger.warning(
+                    f"Conversation changes cannot be watched, polling them every "
+                    f"{SETTINGS['CONVERSATION_CHANGE_POLL_SECONDS']}s instead: {e}"
+                )
+                return await poll_conversation_changes(
+                    SETTINGS["CONVERSATION_CHANGE_POLL_SECONDS"]
+                )
+
+            if e.code == CHANGE_STREAM_HISTORY_LOST:
+                resume_token = None
+
+            logger.error(f"Conversation change stream failed: {e}")
+
+        except Exception as e:
+            logger.error(f"Conversation change stream failed: {e}")
+
+        # Changes made while the stream was down were missed
+        conversation_metadata_cache.clear()
+        await asyncio.sleep(CHANGE_STREAM_RETRY_SECONDS)
+
+
+subscribe(conversation_metadata_cache.invalidate)
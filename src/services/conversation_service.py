@@ -1,26 +1,49 @@
+import json
+import zlib
+from bson import ObjectId
 from fastapi import HTTPException
+from pymongo import UpdateOne
+from fastapi.encoders import jsonable_encoder
 from starlette import status
 from src.models.conversation import (
     Conversation,
+    ConversationMetadata,
     ConversationWithMessages,
     UpdateConversation,
 )
-from src.schema.conversation_schema import conversation_schema
-from src.db.collections import conversations_collection
+from src.schema.conversation_schema import (
+    conversation_schema,
+    CONVERSATION_SCHEMA_FIELDS,
+)
+from src.db.collections import conversations_collection, messages_collection
+from src.db.repository import conversations_repository
 from datetime import datetime, timezone
 from src.utils.converters.convert_to_object_id import convert_to_object_id
+from src.utils.caches.identity_map import get_or_load, remember, forget
 from src.services.user_service import get_current_user
-from src.services.message_service import get_messages, delete_messages
-from typing import List
-from src.services.vector_store_service import delete_documents_from_vector_store
-from src.services.s3_services import delete_objects_by_metadata
-from src.core.config import ENV_VARS
+from src.services.message_service import (
+    get_messages,
+    get_messages_page,
+    iter_messages,
+)
+from typing import AsyncIterator, List, Optional
+from src.services.archive_service import rehydrate_conversation
+from src.services.deletion_service import enqueue_conversation_deletion
+from src.services.conversation_cache_service import (
+    load_conversation_metadata,
+    publish_conversation_change,
+)
+from src.core.logger import logger
 from src.core.server.socket_server import sio
 from src.core.events import SOCKET_EVENTS
+from src.utils.converters.cursor_utils import encode_cursor
+from src.utils.filters.keyset_filter import keyset_filter
 from src.utils.converters.socketio_utils import (
     async_safe_socket_emit,
 )
 
+LAST_MESSAGE_PREVIEW_LENGTH = 120
+
 
 async def create_conversation() -> Conversation:
     """
@@ -39,6 +62,10 @@ async def create_conversation() -> Conversation:
         "hasFilesUploaded": False,
         "createdAt": now,
         "updatedAt": now,
+        "lastMessagePreview": None,
+        "messageCount": 0,
+        "lastActivityAt": now,
+        "hasSummary": True,
     }
 
     response = await conversations_collection.insert_one(new_conversation)
@@ -60,12 +87,22 @@ async def get_conversation(conversation_id: str) -> Conversation:
     Raises:
         HTTPException: If conversation not found or access is unauthorized.
     """
-    conversation = await conversations_collection.find_one(
-        {"_id": convert_to_object_id(conversation_id)}
+    conversation_object_id = convert_to_object_id(conversation_id)
+
+    async def load_conversation() -> Optional[Conversation]:
+        conversation = await conversations_collection.find_one(
+            {"_id": conversation_object_id, "deletedAt": {"$exists": False}},
+            CONVERSATION_SCHEMA_FIELDS,
+        )
+        if not conversation:
+            return None
+        return conversation_schema(conversation)
+
+    conversation_obj = await get_or_load(
+        ("conversation", str(conversation_object_id)), load_conversation
     )
-    conversation_obj = conversation_schema(conversation)
 
-    if not conversation:
+    if not conversation_obj:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Conversation with conversationId: {conversation_id} not found",
@@ -83,36 +120,147 @@ async def get_conversation(conversation_id: str) -> Conversation:
     return conversation_obj
 
 
+async def get_conversation_metadata(conversation_id: str) -> ConversationMetadata:
+    """
+    Retrieve the ownership, title and flags of a conversation, ensuring it
+    belongs to current user. Served from a process-wide cache invalidated on
+    writes, so hot paths that do not need the message summary skip MongoDB.
+
+    Args:
+        conversation_id (str): The ID of the conversation.
+
+    Returns:
+        ConversationMetadata: Conversation metadata.
+
+    Raises:
+        HTTPException: If conversation not found or access is unauthorized.
+    """
+    conversation_metadata = await load_conversation_metadata(
+        str(convert_to_object_id(conversation_id))
+    )
+
+    if not conversation_metadata:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Conversation with conversationId: {conversation_id} not found",
+        )
+
+    user = await get_current_user()
+    user_id = user["id"]
+
+    if conversation_metadata["userId"] != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=f"User with userId: {user_id} does not have access to conversation with conversationId: {conversation_id}",
+        )
+
+    return conversation_metadata
+
+
 async def get_conversation_with_messages(
     conversation_id: str,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
 ) -> ConversationWithMessages:
     """
-    Get a conversation along with its associated messages.
+    Get a conversation along with its associated messages. Without a limit
+    all messages are returned; with a limit only the newest page, or the
+    page older than the cursor.
 
     Args:
         conversation_id (str): The ID of the conversation.
+        limit (Optional[int]): Maximum number of messages to return. Defaults to None.
+        cursor (Optional[str]): Cursor of the previously returned page. Defaults to None.
 
     Returns:
         ConversationWithMessages: Conversation including messages.
     """
     conversation = await get_conversation(conversation_id)
-    messages = await get_messages(conversation_id)
 
-    conversation["messages"] = messages
+    if conversation["isArchived"]:
+        await rehydrate_conversation(convert_to_object_id(conversation_id))
+        conversation["isArchived"] = False
+
+    if limit is None:
+        conversation["messages"] = await get_messages(conversation_id)
+        return conversation
+
+    page = await get_messages_page(conversation_id, limit, cursor)
+
+    conversation["messages"] = page["messages"]
+    conversation["nextCursor"] = page["nextCursor"]
 
     return conversation
 
 
+async def export_conversation(
+    conversation: Conversation, compress: bool = False, batch_size: int = 500
+) -> AsyncIterator[bytes]:
+    """
+    Stream a conversation as NDJSON: one line for the conversation followed
+    by one line per message. Messages are read and written in batches, so
+    memory use does not depend on the conversation length.
+
+    Args:
+        conversation (Conversation): Conversation to export, already access checked.
+        compress (bool, optional): Gzip the output. Defaults to False.
+        batch_size (int, optional): Messages per database round trip and per written chunk. Defaults to 500.
+
+    Yields:
+        bytes: The next chunk of the export.
+    """
+    if conversation["isArchived"]:
+        await rehydrate_conversation(convert_to_object_id(conversation["id"]))
+        conversation = {**conversation, "isArchived": False}
+
+    # wbits=31 writes a gzip header and trailer instead of a raw zlib stream
+    compressor = zlib.compressobj(wbits=31) if compress else None
+
+    def encode(lines: List[dict]) -> bytes:
+        data = "".join(
+            json.dumps(jsonable_encoder(line), ensure_ascii=False) + "\n"
+            for line in lines
+        ).encode("utf-8")
+
+        if compressor is None:
+            return data
+
+        # Sync flush so every chunk can be decompressed as soon as it arrives
+        return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    # The conversation line goes out before any message is read
+    yield encode([{"type": "conversation", **conversation}])
+
+    batch = []
+
+    async for message in iter_messages(conversation["id"], batch_size):
+        batch.append({"type": "message", **message})
+
+        if len(batch) >= batch_size:
+            yield encode(batch)
+            batch = []
+
+    if batch:
+        yield encode(batch)
+
+    if compressor is not None:
+        yield compressor.flush()
+
+
 async def get_all_conversations() -> List[Conversation]:
     """
-    Retrieve all conversations for the current authenticated user.
+    Retrieve all conversations for the current authenticated user, most
+    recently active first.
 
     Returns:
         List[Conversation]: List of conversations.
     """
     user = await get_current_user()
 
-    cursor = conversations_collection.find({"userId": convert_to_object_id(user["id"])})
+    cursor = conversations_collection.find(
+        {"userId": convert_to_object_id(user["id"]), "deletedAt": {"$exists": False}},
+        CONVERSATION_SCHEMA_FIELDS,
+    ).sort([("lastActivityAt", -1), ("_id", -1)])
 
     all_conversations = []
 
@@ -122,48 +270,159 @@ async def get_all_conversations() -> List[Conversation]:
     return all_conversations
 
 
-async def delete_conversation(conversation_id: str) -> None:
+async def get_conversations_page(limit: int, cursor: Optional[str] = None) -> dict:
     """
-    Delete a conversation and its messages by conversation ID.
+    Retrieve one page of the current user's conversations, most recently
+    active first.
 
     Args:
-        conversation_id (str): The ID of the conversation to delete.
+        limit (int): Maximum number of conversations in the page.
+        cursor (Optional[str]): Cursor returned with the previous page.
 
-    Raises:
-        HTTPException: If deletion fails.
+    Returns:
+        dict: The page conversations and the cursor of the next page, None on the last page.
     """
-    conversation = await get_conversation(conversation_id)
+    user = await get_current_user()
 
-    delete_documents_from_vector_store(
-        filter={"conversation_id": conversation_id}, key=conversation_id
+    conversations = (
+        await conversations_collection.find(
+            {
+                "userId": convert_to_object_id(user["id"]),
+                "deletedAt": {"$exists": False},
+                **keyset_filter("lastActivityAt", cursor, descending=True),
+            },
+            CONVERSATION_SCHEMA_FIELDS,
+        )
+        .sort([("lastActivityAt", -1), ("_id", -1)])
+        .limit(limit + 1)
+        .to_list(length=None)
     )
 
-    await delete_objects_by_metadata(
-        bucket_name=ENV_VARS["AWS_S3_BUCKET_NAME"],
-        metadata_key="conversation_id",
-        metadata_value=conversation_id,
+    next_cursor = None
+
+    if len(conversations) > limit:
+        conversations = conversations[:limit]
+        next_cursor = encode_cursor(
+            conversations[-1]["lastActivityAt"], conversations[-1]["_id"]
+        )
+
+    return {
+        "conversations": [
+            conversation_schema(conversation) for conversation in conversations
+        ],
+        "nextCursor": next_cursor,
+    }
+
+
+async def tombstone_conversations(filter: dict) -> List[str]:
+    """
+    Mark the conversations matching a filter as deleted, so they disappear
+    from reads immediately, and queue the deletion of their data.
+
+    Args:
+        filter (dict): Filter selecting the conversations to delete.
+
+    Returns:
+        List[str]: IDs of the conversations marked as deleted.
+    """
+    conversations = await conversations_collection.find(
+        {**filter, "deletedAt": {"$exists": False}}, {"_id": 1}
+    ).to_list(length=None)
+
+    conversation_object_ids = [conversation["_id"] for conversation in conversations]
+
+    if not conversation_object_ids:
+        return []
+
+    await conversations_collection.update_many(
+        {"_id": {"$in": conversation_object_ids}, "deletedAt": {"$exists": False}},
+        {"$set": {"deletedAt": datetime.now(timezone.utc)}},
     )
 
-    await delete_messages(conversation_id)
+    conversation_ids = [str(object_id) for object_id in conversation_object_ids]
+
+    for conversation_id in conversation_ids:
+        forget(("conversation", conversation_id))
+        publish_conversation_change(conversation_id)
+
+    await enqueue_conversation_deletion(conversation_ids)
+
+    for conversation_id in conversation_ids:
+        await async_safe_socket_emit(
+            sio,
+            SOCKET_EVENTS["CHAT_DELETE_CONVERSATION"],
+            conversation_id,
+            room=conversation_id,
+        )
+
+    return conversation_ids
+
+
+async def delete_conversation(conversation_id: str) -> None:
+    """
+    Delete a conversation. The conversation is marked as deleted so it
+    disappears from reads immediately, then its vectors, files and messages
+    are deleted by a durable background job.
 
-    response = await conversations_collection.delete_one(
+    Args:
+        conversation_id (str): The ID of the conversation to delete.
+
+    Raises:
+        HTTPException: If conversation not found or access is unauthorized.
+    """
+    conversation = await get_conversation_metadata(conversation_id)
+
+    deleted_ids = await tombstone_conversations(
         {"_id": convert_to_object_id(conversation["id"])}
     )
 
-    if response.deleted_count == 0:
+    if not deleted_ids:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Failed to delete conversation with id: {conversation_id}",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Conversation with conversationId: {conversation_id} not found",
         )
 
-    await async_safe_socket_emit(
-        sio,
-        SOCKET_EVENTS["CHAT_DELETE_CONVERSATION"],
-        conversation_id,
-        room=conversation_id,
+
+async def delete_conversations(conversation_ids: List[str]) -> List[str]:
+    """
+    Delete many conversations of the current user at once. Their data is
+    deleted by background jobs that batch the deletes across conversations.
+
+    Args:
+        conversation_ids (List[str]): IDs of the conversations to delete.
+
+    Returns:
+        List[str]: IDs of the deleted conversations. Conversations that do not
+        exist or belong to another user are skipped.
+    """
+    user = await get_current_user()
+
+    return await tombstone_conversations(
+        {
+            "_id": {
+                "$in": [
+                    convert_to_object_id(conversation_id)
+                    for conversation_id in conversation_ids
+                ]
+            },
+            "userId": convert_to_object_id(user["id"]),
+        }
     )
 
 
+async def delete_user_conversations(user_id: str) -> List[str]:
+    """
+    Delete every conversation of a user, e.g. when the user is deleted.
+
+    Args:
+        user_id (str): ID of the user.
+
+    Returns:
+        List[str]: IDs of the deleted conversations.
+    """
+    return await tombstone_conversations({"userId": convert_to_object_id(user_id)})
+
+
 async def update_conversation(
     conversation_id: str, update_conversation: UpdateConversation
 ) -> Conversation:
@@ -178,24 +437,160 @@ async def update_conversation(
         Conversation: Updated conversation object.
 
     Raises:
-        HTTPException: If conversation is not found.
+        HTTPException: If conversation is not found or access is unauthorized.
     """
-    conversation = await get_conversation(conversation_id)
+    user = await get_current_user()
+
+    update_conversation_obj = update_conversation.model_dump(exclude_unset=True)
+    update_conversation_obj["updatedAt"] = datetime.now(timezone.utc)
+
+    # Only the owner's conversation matches, so access is checked in the same round trip
+    updated_conversation = await conversations_repository.update_one(
+        {
+            "_id": convert_to_object_id(conversation_id),
+            "userId": convert_to_object_id(user["id"]),
+            "deletedAt": {"$exists": False},
+        },
+        {"$set": update_conversation_obj},
+    )
+
+    if not updated_conversation:
+        # Raises not found or unauthorized
+        await get_conversation(conversation_id)
 
-    if not conversation:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Conversation with conversation_id: {conversation_id} not found",
         )
 
-    update_conversation_obj = update_conversation.model_dump(exclude_unset=True)
-    update_conversation_obj["updatedAt"] = datetime.now(timezone.utc)
+    updated_conversation = conversation_schema(updated_conversation)
+    remember(("conversation", updated_conversation["id"]), updated_conversation)
+    publish_conversation_change(updated_conversation["id"])
 
-    await conversations_collection.update_one(
-        {"_id": convert_to_object_id(conversation_id)},
-        {"$set": update_conversation_obj},
+    return updated_conversation
+
+
+def build_last_message_preview(content: str) -> Optional[str]:
+    """
+    Build the preview of a message shown in the conversation list.
+
+    Args:
+        content (str): Message content.
+
+    Returns:
+        Optional[str]: Whitespace collapsed start of the content, None if it is empty.
+    """
+    preview = " ".join(content.split())[:LAST_MESSAGE_PREVIEW_LENGTH]
+    return preview or None
+
+
+async def record_conversation_activity(
+    conversation_id: ObjectId,
+    timestamp: datetime,
+    content: Optional[str] = None,
+    new_messages: int = 0,
+) -> None:
+    """
+    Update the summary of a conversation after messages were created or
+    finalised, with atomic operators so concurrent writes do not overwrite
+    each other's counts or move the activity date backwards.
+
+    Args:
+        conversation_id (ObjectId): Conversation the messages belong to.
+        timestamp (datetime): Time of the activity.
+        content (Optional[str]): Content of the latest message, None to keep the current preview.
+        new_messages (int, optional): Number of messages created. Defaults to 0.
+    """
+    update = {"$max": {"lastActivityAt": timestamp}}
+
+    if new_messages:
+        update["$inc"] = {"messageCount": new_messages}
+
+    preview = build_last_message_preview(content) if content else None
+
+    if preview:
+        update["$set"] = {"lastMessagePreview": preview}
+
+    updated_conversation = await conversations_repository.update_one(
+        {"_id": conversation_id}, update
     )
 
-    updated_conversation = await get_conversation(conversation_id)
+    if updated_conversation:
+        updated_conversation = conversation_schema(updated_conversation)
+        remember(("conversation", updated_conversation["id"]), updated_conversation)
 
-    return updated_conversation
+
+async def backfill_conversation_summaries(batch_size: int = 500) -> None:
+    """
+    Compute lastMessagePreview, messageCount and lastActivityAt for
+    conversations created before these fields were maintained.
+
+    Args:
+        batch_size (int, optional): Conversations processed per round trip. Defaults to 500.
+    """
+    backfilled = 0
+
+    while True:
+        conversations = (
+            await conversations_collection.find(
+                {"hasSummary": {"$exists": False}}, {"createdAt": 1}
+            )
+            .limit(batch_size)
+            .to_list(length=None)
+        )
+
+        if not conversations:
+            break
+
+        conversation_ids = [conversation["_id"] for conversation in conversations]
+
+        summaries = await messages_collection.aggregate(
+            [
+                {"$match": {"conversationId": {"$in": conversation_ids}}},
+                {"$sort": {"conversationId": 1, "timestamp": 1, "_id": 1}},
+                {
+                    "$group": {
+                        "_id": "$conversationId",
+                        "messageCount": {"$sum": 1},
+                        "lastActivityAt": {"$max": "$timestamp"},
+                        "lastContent": {"$last": "$content"},
+                    }
+                },
+            ]
+        ).to_list(length=None)
+
+        summaries = {summary["_id"]: summary for summary in summaries}
+        updates = []
+
+        for conversation in conversations:
+            summary = summaries.get(conversation["_id"])
+
+            if summary:
+                fields = {
+                    "messageCount": summary["messageCount"],
+                    "lastActivityAt": summary["lastActivityAt"],
+                    "lastMessagePreview": build_last_message_preview(
+                        summary["lastContent"] or ""
+                    ),
+                }
+            else:
+                fields = {
+                    "messageCount": 0,
+                    "lastActivityAt": conversation["createdAt"],
+                    "lastMessagePreview": None,
+                }
+
+            # The counts come from the messages themselves, so they replace
+            # any partial $inc made by messages created during the backfill
+            updates.append(
+                UpdateOne(
+                    {"_id": conversation["_id"], "hasSummary": {"$exists": False}},
+                    {"$set": {**fields, "hasSummary": True}},
+                )
+            )
+
+        await conversations_collection.bulk_write(updates, ordered=False)
+        backfilled += len(updates)
+
+    if backfilled:
+        logger.info(f"Backfilled summaries of {backfilled} conversations.")
@@ -0,0 +1,260 @@
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, List
+from src.models.job import JobStatus, JobType
+from src.db.collections import conversations_collection, jobs_collection
+from src.services.job_queue_service import JobQueue, JobWorkerPool
+from src.services.message_service import delete_messages
+from src.services.vector_store_service import delete_documents_from_vector_store
+from src.services.s3_services import delete_objects_by_conversation_ids
+from src.services.file_registry_service import delete_registered_files
+from src.services.archive_service import delete_archived_messages
+from src.utils.converters.convert_to_object_id import convert_to_object_id
+from src.core.config import ENV_VARS, SETTINGS
+from src.core.logger import logger
+
+deletion_queue = JobQueue(
+    JobType.DELETE_CONVERSATIONS, max_attempts=SETTINGS["DELETION_MAX_ATTEMPTS"]
+)
+
+# Conversations per deletion job, so one job stays well within its lease
+DELETION_JOB_SIZE = 500
+
+# Conversation IDs per vector store delete, keeping the metadata filter small
+VECTOR_DELETE_BATCH_SIZE = 100
+
+STEP_DONE = "done"
+
+
+async def enqueue_conversation_deletion(conversation_ids: List[str]) -> List[str]:
+    """
+    Queue the deletion of the data of conversations already marked as deleted,
+    grouping them so each job deletes many conversations in batched calls.
+
+    Args:
+        conversation_ids (List[str]): IDs of the tombstoned conversations.
+
+    Returns:
+        List[str]: IDs of the deletion jobs.
+    """
+    job_ids = [
+        await deletion_queue.enqueue(
+            {"conversationIds": conversation_ids[start : start + DELETION_JOB_SIZE]}
+        )
+        for start in range(0, len(conversation_ids), DELETION_JOB_SIZE)
+    ]
+
+    if job_ids:
+        deletion_workers.notify()
+
+    return job_ids
+
+
+async def retry_step(
+    name: str, step: Callable[[], Awaitable[None]], max_retries: int
+) -> None:
+    """
+    Run a deletion step, retrying transient failures with exponential backoff and jitter.
+
+    Args:
+        name (str): Step name, for logging.
+        step (Callable[[], Awaitable[None]]): The step to run.
+        max_retries (int): Retries before the failure is raised.
+
+    Raises:
+        Exception: The last failure of the step.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return await step()
+
+        except Exception as e:
+            if attempt == max_retries:
+                raise
+
+            delay = 2**attempt + random.uniform(0, 1)
+            logger.warning(
+                f"Deletion step {name} failed on try {attempt + 1}, retrying in {delay:.1f}s: {e}"
+            )
+            await asyncio.sleep(delay)
+
+
+async def process_deletion_job(job: dict) -> None:
+    """
+    Job handler that deletes the vectors, files and messages of tombstoned
+    conversations concurrently, then the conversations themselves. Finished
+    steps are recorded in the job progress and skipped when a retried or
+    interrupted job resumes.
+
+    Args:
+        job (dict): The claimed deletion job.
+
+    Raises:
+        RuntimeError: If a step still fails after its retries.
+    """
+    conversation_ids = job["payload"]["conversationIds"]
+    conversation_object_ids = [
+        convert_to_object_id(conversation_id) for conversation_id in conversation_ids
+    ]
+    progress = job.get("progress", {})
+
+    async def delete_vectors():
+        for start in range(0, len(conversation_ids), VECTOR_DELETE_BATCH_SIZE):
+            batch = conversation_ids[start : start + VECTOR_DELETE_BATCH_SIZE]
+
+            await asyncio.to_thread(
+                delete_documents_from_vector_store,
+                filter={"conversation_id": {"$in": batch}},
+                key=f"deletion job {job['_id']}",
+            )
+
+    async def delete_files():
+        await delete_objects_by_conversation_ids(
+            bucket_name=ENV_VARS["AWS_S3_BUCKET_NAME"],
+            conversation_ids=conversation_ids,
+            include_legacy=SETTINGS["DELETION_INCLUDE_LEGACY_FILES"],
+        )
+
+    async def delete_documents():
+        await delete_registered_files(conversation_ids)
+        await delete_archived_messages(conversation_object_ids)
+        await delete_messages(conversation_object_ids)
+
+    steps = {
+        "vectors": delete_vectors,
+        "files": delete_files,
+        "mongo": delete_documents,
+    }
+
+    async def run_step(name: str, step: Callable[[], Awaitable[None]]):
+        await retry_step(name, step, SETTINGS["DELETION_MAX_RETRIES"])
+        await deletion_queue.update_progress(job["_id"], {name: STEP_DONE})
+
+    pending = {
+        name: step for name, step in steps.items() if progress.get(name) != STEP_DONE
+    }
+
+    results = await asyncio.gather(
+        *(run_step(name, step) for name, step in pending.items()),
+        return_exceptions=True,
+    )
+
+    failures = {
+        name: result
+        for name, result in zip(pending, results)
+        if isinstance(result, Exception)
+    }
+
+    if failures:
+        raise RuntimeError(
+            ", ".join(f"{name} step failed: {error}" for name, error in failures.items())
+        )
+
+    # Only tombstoned conversations are removed, never one that was not marked
+    response = await conversations_collection.delete_many(
+        {"_id": {"$in": conversation_object_ids}, "deletedAt": {"$exists": True}}
+    )
+
+    logger.info(
+        f"Deleted {response.deleted_count} conversations and their data (job {job['_id']})"
+    )
+
+
+async def handle_failed_deletion_job(job: dict) -> None:
+    """
+    Report a deletion job that failed on its last attempt. The conversations
+    stay tombstoned, so they remain hidden and requeue_stranded_deletions
+    queues them again.
+
+    Args:
+        job (dict): The failed deletion job.
+    """
+    logger.error(
+        f"Deletion job {job['_id']} gave up on conversations: {job['payload']['conversationIds']}"
+    )
+
+
+async def requeue_stranded_deletions(grace_seconds: float) -> int:
+    """
+    Queue the deletion of conversations tombstoned a while ago that no
+    queued or running deletion job references, e.g. because the process
+    crashed between the tombstone and the enqueue, or their job gave up.
+
+    Args:
+        grace_seconds (float): Age of a tombstone before it is considered stranded.
+
+    Returns:
+        int: Number of conversations queued again.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=grace_seconds)
+    cursor = conversations_collection.find(
+        {"deletedAt": {"$lt": cutoff}}, {"_id": 1}
+    ).batch_size(DELETION_JOB_SIZE)
+
+    requeued = 0
+    batch = []
+
+    async def requeue_batch():
+        nonlocal requeued
+
+        jobs = await jobs_collection.find(
+            {
+                "type": JobType.DELETE_CONVERSATIONS.value,
+                "status": {"$in": [JobStatus.QUEUED.value, JobStatus.RUNNING.value]},
+                "payload.conversationIds": {"$in": batch},
+            },
+            {"payload.conversationIds": 1},
+        ).to_list(length=None)
+
+        pending = {
+            conversation_id
+            for job in jobs
+            for conversation_id in job["payload"]["conversationIds"]
+        }
+        stranded = [
+            conversation_id for conversation_id in batch if conversation_id not in pending
+        ]
+
+        if stranded:
+            await enqueue_conversation_deletion(stranded)
+            requeued += len(stranded)
+
+    async for conversation in cursor:
+        batch.append(str(conversation["_id"]))
+
+        if len(batch) >= DELETION_JOB_SIZE:
+            await requeue_batch()
+            batch = []
+
+    if batch:
+        await requeue_batch()
+
+    if requeued:
+        logger.warning(f"Queued the deletion of {requeued} stranded conversations again")
+
+    return requeued
+
+
+async def run_deletion_sweep(interval_seconds: float) -> None:
+    """
+    Queue stranded conversation deletions again periodically until cancelled.
+
+    Args:
+        interval_seconds (float): Seconds between runs.
+    """
+    while True:
+        try:
+            await requeue_stranded_deletions(SETTINGS["DELETION_SWEEP_GRACE_SECONDS"])
+        except Exception as e:
+            logger.error(f"Deletion sweep failed: {e}")
+
+        await asyncio.sleep(interval_seconds)
+
+
+deletion_workers = JobWorkerPool(
+    queue=deletion_queue,
+    handler=process_deletion_job,
+    concurrency=SETTINGS["DELETION_WORKER_CONCURRENCY"],
+    failure_handler=handle_failed_deletion_job,
+)
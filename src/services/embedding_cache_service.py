@@ -0,0 +1,79 @@
+import hashlib
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, List
+from pymongo.errors import BulkWriteError
+from src.db.collections import embedding_cache_collection
+from src.db.pinecone import EMBEDDING_MODEL, EMBEDDING_DIMENSIONS
+from src.core.logger import logger
+
+
+def build_embedding_cache_keys(texts: List[str]) -> List[str]:
+    """
+    Build cache keys from the embedding model and a hash of each chunk's text.
+
+    Args:
+        texts (List[str]): Chunk texts.
+
+    Returns:
+        List[str]: One cache key per text.
+    """
+    prefix = f"{EMBEDDING_MODEL}:{EMBEDDING_DIMENSIONS}"
+
+    return [
+        f"{prefix}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+        for text in texts
+    ]
+
+
+async def get_cached_embeddings(keys: List[str]) -> Dict[str, List[float]]:
+    """
+    Fetch previously computed embeddings for the given cache keys.
+
+    Args:
+        keys (List[str]): Cache keys to look up.
+
+    Returns:
+        Dict[str, List[float]]: Embeddings found in the cache, by key.
+    """
+    cursor = embedding_cache_collection.find(
+        {"_id": {"$in": keys}}, {"_id": 1, "vector": 1}
+    )
+
+    cached = {}
+
+    async for entry in cursor:
+        # Vectors are stored as packed float32 to keep cache entries small
+        cached[entry["_id"]] = array("f", entry["vector"]).tolist()
+
+    return cached
+
+
+async def cache_embeddings(keys: List[str], vectors: List[List[float]]) -> None:
+    """
+    Store newly computed embeddings. Keys that are already cached, e.g. by a
+    concurrent ingestion of the same chunk, are left untouched.
+
+    Args:
+        keys (List[str]): Cache keys of the embedded texts.
+        vectors (List[List[float]]): Embeddings matching the keys by position.
+    """
+    if not keys:
+        return
+
+    now = datetime.now(timezone.utc)
+
+    entries = [
+        {"_id": key, "vector": array("f", vector).tobytes(), "createdAt": now}
+        for key, vector in zip(keys, vectors)
+    ]
+
+    try:
+        await embedding_cache_collection.insert_many(entries, ordered=False)
+    except BulkWriteError as e:
+        duplicates = [
+            error for error in e.details["writeErrors"] if error["code"] == 11000
+        ]
+
+        if len(duplicates) != len(e.details["writeErrors"]):
+            logger.warning(f"Failed to cache some embeddings: {e.details}")
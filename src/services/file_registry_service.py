@@ -0,0 +1,116 @@
+import hashlib
+from datetime import datetime, timezone
+from typing import List, Optional
+from src.db.collections import file_registry_collection
+from src.db.pinecone import EMBEDDING_MODEL
+from src.core.logger import logger
+
+
+def compute_content_hash(content: bytes) -> str:
+    """
+    Compute the SHA-256 hash identifying a file's content.
+
+    Args:
+        content (bytes): Raw file content.
+
+    Returns:
+        str: Hex encoded content hash.
+    """
+    return hashlib.sha256(content).hexdigest()
+
+
+def build_vector_ids(
+    conversation_id: str, content_hash: str, count: int, start: int = 0
+) -> List[str]:
+    """
+    Build deterministic vector IDs for a file's chunks within a conversation,
+    so the chunks of a registered file can be fetched back by ID.
+
+    Args:
+        conversation_id (str): Conversation the chunks belong to.
+        content_hash (str): Content hash of the source file.
+        count (int): Number of chunks.
+        start (int, optional): Order of the first chunk. Defaults to 0.
+
+    Returns:
+        List[str]: One vector ID per chunk, in chunk order.
+    """
+    return [
+        f"{conversation_id}#{content_hash}#{order}"
+        for order in range(start, start + count)
+    ]
+
+
+async def get_registered_file(user_id: str, content_hash: str) -> Optional[dict]:
+    """
+    Look up a previously ingested file by its content hash.
+
+    Args:
+        user_id (str): Owner of the file.
+        content_hash (str): Content hash of the file.
+
+    Returns:
+        Optional[dict]: Registry entry if the file was ingested before, else None.
+    """
+    return await file_registry_collection.find_one(
+        {
+            "userId": user_id,
+            "contentHash": content_hash,
+            "embeddingModel": EMBEDDING_MODEL,
+        }
+    )
+
+
+async def register_file(
+    user_id: str,
+    content_hash: str,
+    conversation_id: str,
+    file_key: str,
+    chunk_count: int,
+) -> None:
+    """
+    Record where the chunks of an ingested file live so later uploads of
+    the same content can reuse them.
+
+    Args:
+        user_id (str): Owner of the file.
+        content_hash (str): Content hash of the file.
+        conversation_id (str): Conversation holding the canonical chunks.
+        file_key (str): S3 key of the uploaded file.
+        chunk_count (int): Number of chunks stored for the file.
+    """
+    now = datetime.now(timezone.utc)
+
+    await file_registry_collection.update_one(
+        {
+            "userId": user_id,
+            "contentHash": content_hash,
+            "embeddingModel": EMBEDDING_MODEL,
+        },
+        {
+            "$set": {
+                "conversationId": conversation_id,
+                "fileKey": file_key,
+                "chunkCount": chunk_count,
+                "updatedAt": now,
+            },
+            "$setOnInsert": {"createdAt": now},
+        },
+        upsert=True,
+    )
+
+
+async def delete_registered_files(conversation_ids: List[str]) -> None:
+    """
+    Remove registry entries whose canonical chunks belong to the given conversations.
+
+    Args:
+        conversation_ids (List[str]): Conversations being deleted.
+    """
+    response = await file_registry_collection.delete_many(
+        {"conversationId": {"$in": conversation_ids}}
+    )
+
+    logger.info(
+        f"Removed {response.deleted_count} file registry entries for {len(conversation_ids)} conversations"
+    )
@@ -0,0 +1,116 @@
+import asyncio
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Deque, Dict
+import aioboto3
+from openai import AsyncOpenAI
+from src.db.mongo import client
+from src.db.pinecone import index
+from src.llm.models.openai_model import model as openai_model
+from src.utils.caches.async_ttl_cache import AsyncTTLCache
+from src.utils.metrics.latency_stats import latency_percentiles
+from src.core.config import ENV_VARS, SETTINGS
+from src.core.logger import logger
+
+# Latest probe latencies kept per dependency for the percentiles
+LATENCY_WINDOW = 100
+
+# Probes are cached briefly so frequent load balancer checks do not reach the backends
+probe_cache = AsyncTTLCache(ttl_seconds=SETTINGS["HEALTH_CHECK_TTL_SECONDS"])
+
+probe_latencies: Dict[str, Deque[float]] = {}
+
+openai_client = AsyncOpenAI(api_key=ENV_VARS["OPENAI_API_KEY"])
+
+
+async def ping_mongo() -> None:
+    await client.admin.command("ping")
+
+
+async def ping_pinecone() -> None:
+    await asyncio.to_thread(index.describe_index_stats)
+
+
+async def ping_s3() -> None:
+    session = aioboto3.Session()
+
+    async with session.client("s3") as s3_client:
+        await s3_client.head_bucket(Bucket=ENV_VARS["AWS_S3_BUCKET_NAME"])
+
+
+async def ping_openai() -> None:
+    await openai_client.models.retrieve(openai_model)
+
+
+PROBES: Dict[str, Callable[[], Awaitable[None]]] = {
+    "mongo": ping_mongo,
+    "pinecone": ping_pinecone,
+    "s3": ping_s3,
+    "openai": ping_openai,
+}
+
+
+async def run_probe(name: str) -> dict:
+    """
+    Probe a dependency once and record its round trip latency.
+
+    Args:
+        name (str): Name of the dependency in PROBES.
+
+    Returns:
+        dict: Probe outcome, latency in milliseconds, error and probe date.
+    """
+    started = time.perf_counter()
+    error = None
+
+    try:
+        await asyncio.wait_for(PROBES[name](), timeout=SETTINGS["HEALTH_PROBE_TIMEOUT"])
+    except asyncio.TimeoutError:
+        error = f"Timed out after {SETTINGS['HEALTH_PROBE_TIMEOUT']}s"
+    except Exception as e:
+        error = str(e) or type(e).__name__
+
+    latency = (time.perf_counter() - started) * 1000
+    probe_latencies.setdefault(name, deque(maxlen=LATENCY_WINDOW)).append(latency)
+
+    if error:
+        logger.warning(f"Health probe {name} failed: {error}")
+
+    return {
+        "healthy": error is None,
+        "latencyMs": round(latency, 2),
+        "error": error,
+        "checkedAt": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+async def check_dependency(name: str) -> dict:
+    """
+    Return the latest probe of a dependency, probing it again once the
+    cached result expired. Concurrent checks share a single probe.
+
+    Args:
+        name (str): Name of the dependency in PROBES.
+
+    Returns:
+        dict: Probe outcome with the latency percentiles of the recent probes.
+    """
+    result = await probe_cache.get(name, lambda: run_probe(name))
+    result["latencyPercentilesMs"] = latency_percentiles(
+        list(probe_latencies.get(name, []))
+    )
+
+    return result
+
+
+async def check_dependencies() -> Dict[str, dict]:
+    """
+    Check every dependency concurrently.
+
+    Returns:
+        Dict[str, dict]: Probe outcome by dependency name.
+    """
+    results = await asyncio.gather(*(check_dependency(name) for name in PROBES))
+
+    return dict(zip(PROBES, results))
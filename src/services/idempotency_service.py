@@ -0,0 +1,144 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from fastapi import HTTPException
+from starlette import status
+from pymongo.errors import DuplicateKeyError
+from src.db.collections import idempotency_keys_collection
+from src.utils.caches.async_ttl_cache import AsyncTTLCache
+from src.core.config import SETTINGS
+from src.core.logger import logger
+
+PROCESSING = "processing"
+COMPLETED = "completed"
+
+# Completed responses served to retries without a Mongo read
+completed_requests_cache = AsyncTTLCache(
+    ttl_seconds=SETTINGS["IDEMPOTENCY_KEY_TTL_SECONDS"]
+)
+
+
+def build_idempotency_id(scope: str, key: str) -> str:
+    """
+    Build the ID of an idempotency record.
+
+    Args:
+        scope (str): What the key applies to, e.g. the user and route.
+        key (str): Idempotency-Key sent by the client.
+
+    Returns:
+        str: Record ID.
+    """
+    return hashlib.sha256(f"{scope}:{key}".encode("utf-8")).hexdigest()
+
+
+def build_request_fingerprint(*parts: str) -> str:
+    """
+    Hash the parts of a request that must match when a key is reused.
+
+    Args:
+        *parts (str): Request values, e.g. the message content.
+
+    Returns:
+        str: Request fingerprint.
+    """
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+
+async def claim_idempotency_key(
+    idempotency_id: str, fingerprint: str
+) -> Optional[dict]:
+    """
+    Claim an idempotency key before processing a request.
+
+    Args:
+        idempotency_id (str): Record ID built by build_idempotency_id.
+        fingerprint (str): Fingerprint of the request.
+
+    Returns:
+        Optional[dict]: The stored response if the request was already processed, None if the caller now owns the key and must process it.
+
+    Raises:
+        HTTPException: 409 if the original request is still being processed,
+            422 if the key was used for a different request.
+    """
+
+    async def load_completed_request() -> Optional[dict]:
+        return await idempotency_keys_collection.find_one(
+            {"_id": idempotency_id, "status": COMPLETED}
+        )
+
+    completed = await completed_requests_cache.get(
+        idempotency_id, load_completed_request
+    )
+
+    if completed is None:
+        now = datetime.now(timezone.utc)
+
+        try:
+            # A crashed request releases its key once the processing timeout expires
+            await idempotency_keys_collection.insert_one(
+                {
+                    "_id": idempotency_id,
+                    "status": PROCESSING,
+                    "fingerprint": fingerprint,
+                    "createdAt": now,
+                    "expiresAt": now
+                    + timedelta(seconds=SETTINGS["IDEMPOTENCY_PROCESSING_TIMEOUT"]),
+                }
+            )
+            return None
+
+        except DuplicateKeyError:
+            completed = await load_completed_request()
+
+        if completed is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still being processed",
+            )
+
+    if completed["fingerprint"] != fingerprint:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used for a different request",
+        )
+
+    logger.info(f"Replaying response of idempotent request: {idempotency_id}")
+    return completed["response"]
+
+
+async def save_idempotent_response(idempotency_id: str, response: dict) -> None:
+    """
+    Store the response of a processed request for retries with the same key.
+
+    Args:
+        idempotency_id (str): Record ID of the claimed key.
+        response (dict): Response returned to the client.
+    """
+    now = datetime.now(timezone.utc)
+
+    await idempotency_keys_collection.update_one(
+        {"_id": idempotency_id},
+        {
+            "$set": {
+                "status": COMPLETED,
+                "response": response,
+                "completedAt": now,
+                "expiresAt": now
+                + timedelta(seconds=SETTINGS["IDEMPOTENCY_KEY_TTL_SECONDS"]),
+            }
+        },
+    )
+
+
+async def release_idempotency_key(idempotency_id: str) -> None:
+    """
+    Release a claimed key after the request failed, so it can be retried.
+
+    Args:
+        idempotency_id (str): Record ID of the claimed key.
+    """
+    await idempotency_keys_collection.delete_one(
+        {"_id": idempotency_id, "status": PROCESSING}
+    )
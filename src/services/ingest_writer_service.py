@@ -0,0 +1,257 @@
+import asyncio
+import random
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Optional, Tuple
+from uuid import uuid4
+from langchain_core.documents import Document
+from src.db.pinecone import embeddings, index
+from src.llm.utils import count_tokens
+from src.utils.limiters.token_rate_limiter import TokenRateLimiter
+from src.services.embedding_cache_service import (
+    build_embedding_cache_keys,
+    get_cached_embeddings,
+    cache_embeddings,
+)
+from src.core.config import SETTINGS
+from src.core.logger import logger
+
+# Metadata key the LangChain Pinecone store reads the page content from
+TEXT_KEY = "text"
+
+
+@dataclass
+class IngestProgress:
+    key: str
+    total_chunks: int
+    embedded_chunks: int = 0
+    cached_chunks: int = 0
+    stored_chunks: int = 0
+    failed_chunks: int = 0
+
+
+@dataclass
+class IngestBatch:
+    number: int
+    ids: List[str]
+    documents: List[Document]
+    token_counts: List[int]
+
+    @property
+    def tokens(self) -> int:
+        return sum(self.token_counts)
+
+
+ProgressCallback = Callable[[IngestProgress], Awaitable[None]]
+
+
+class IngestWriterService:
+    """
+    Write chunked documents to the vector store in token-bounded batches,
+    pipelining embedding requests against Pinecone upserts. Chunks already
+    embedded by an earlier ingestion are served from the embedding cache.
+    """
+
+    def __init__(
+        self,
+        max_batch_tokens: int = SETTINGS["INGEST_MAX_BATCH_TOKENS"],
+        max_batch_size: int = SETTINGS["INGEST_MAX_BATCH_SIZE"],
+        embed_concurrency: int = SETTINGS["INGEST_EMBED_CONCURRENCY"],
+        upsert_concurrency: int = SETTINGS["INGEST_UPSERT_CONCURRENCY"],
+        max_retries: int = SETTINGS["INGEST_MAX_RETRIES"],
+        retry_base_delay: float = SETTINGS["INGEST_RETRY_BASE_DELAY"],
+        tokens_per_minute: int = SETTINGS["INGEST_TOKENS_PER_MINUTE"],
+    ):
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.embed_semaphore = asyncio.Semaphore(embed_concurrency)
+        self.upsert_semaphore = asyncio.Semaphore(upsert_concurrency)
+        self.rate_limiter = TokenRateLimiter(tokens_per_minute)
+
+    async def write(
+        self,
+        documents: List[Document],
+        key: str = "",
+        ids: Optional[List[str]] = None,
+        namespace: Optional[str] = None,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> IngestProgress:
+        """
+        Embed and upsert documents batch by batch. A batch that keeps failing
+        after all retries is recorded as failed without aborting the others.
+
+        Args:
+            documents (List[Document]): The documents to be added.
+            key (str, optional): An optional identifier for logging. Defaults to "".
+            ids (Optional[List[str]]): Vector IDs matching the documents. Random IDs are used if omitted.
+            namespace (Optional[str]): Optional Pinecone namespace to write to.
+            on_progress (Optional[ProgressCallback]): Awaited after each batch completes.
+
+        Returns:
+            IngestProgress: Final counts of embedded, stored and failed chunks.
+        """
+        progress = IngestProgress(key=key, total_chunks=len(documents))
+
+        if not documents:
+            return progress
+
+        if ids is None:
+            ids = [str(uuid4()) for _ in documents]
+
+        batches = self._batch_documents(documents, ids)
+
+        logger.info(
+            f"Writing {len(documents)} chunks in {len(batches)} batches to the vector database: {key}"
+        )
+
+        async def write_batch(batch: IngestBatch):
+            try:
+                vectors, cached_count = await self._with_retries(
+                    self._embed_batch, batch
+                )
+                progress.embedded_chunks += len(batch.ids) - cached_count
+                progress.cached_chunks += cached_count
+
+                await self._with_retries(self._upsert_batch, vectors, namespace)
+                progress.stored_chunks += len(batch.ids)
+
+            except Exception as e:
+                progress.failed_chunks += len(batch.ids)
+                logger.error(
+                    f"Batch {batch.number} of {key} failed after {self.max_retries} retries: {e}"
+                )
+
+            if on_progress:
+                await on_progress(progress)
+
+        await asyncio.gather(*(write_batch(batch) for batch in batches))
+
+        logger.info(
+            f"Stored {progress.stored_chunks}/{progress.total_chunks} documents in the vector database: {key}"
+        )
+
+        return progress
+
+    def _batch_documents(
+        self, documents: List[Document], ids: List[str]
+    ) -> List[IngestBatch]:
+        """
+        Group documents into batches bounded by token count and batch size,
+        preserving document order.
+
+        Args:
+            documents (List[Document]): Documents to group.
+            ids (List[str]): Vector IDs matching the documents.
+
+        Returns:
+            List[IngestBatch]: Ordered batches ready to be embedded.
+        """
+        batches: List[IngestBatch] = []
+        current = IngestBatch(number=1, ids=[], documents=[], token_counts=[])
+
+        for vector_id, document in zip(ids, documents):
+            tokens = count_tokens(document.page_content)
+
+            is_full = (
+                current.tokens + tokens > self.max_batch_tokens
+                or len(current.documents) >= self.max_batch_size
+            )
+
+            if current.documents and is_full:
+                batches.append(current)
+                current = IngestBatch(
+                    number=current.number + 1, ids=[], documents=[], token_counts=[]
+                )
+
+            current.ids.append(vector_id)
+            current.documents.append(document)
+            current.token_counts.append(tokens)
+
+        if current.documents:
+            batches.append(current)
+
+        return batches
+
+    async def _embed_batch(self, batch: IngestBatch) -> Tuple[List[dict], int]:
+        """
+        Embed a batch of documents and build Pinecone vector records. Only
+        chunks missing from the embedding cache are sent to the embeddings API.
+
+        Args:
+            batch (IngestBatch): The batch to embed.
+
+        Returns:
+            Tuple[List[dict], int]: Vector records with ID, values and metadata,
+                and the number of chunks served from the cache.
+        """
+        texts = [document.page_content for document in batch.documents]
+        keys = build_embedding_cache_keys(texts)
+        cached = await get_cached_embeddings(keys)
+
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+
+        if missing:
+            async with self.embed_semaphore:
+                await self.rate_limiter.acquire(
+                    sum(batch.token_counts[i] for i in missing)
+                )
+                missing_values = await embeddings.aembed_documents(
+                    [texts[i] for i in missing]
+                )
+
+            missing_keys = [keys[i] for i in missing]
+            await cache_embeddings(missing_keys, missing_values)
+            cached.update(zip(missing_keys, missing_values))
+
+        vectors = [
+            {
+                "id": vector_id,
+                "values": cached[cache_key],
+                "metadata": {**document.metadata, TEXT_KEY: document.page_content},
+            }
+            for vector_id, cache_key, document in zip(batch.ids, keys, batch.documents)
+        ]
+
+        return vectors, len(batch.ids) - len(missing)
+
+    async def _upsert_batch(self, vectors: List[dict], namespace: Optional[str]):
+        """
+        Upsert vector records into the Pinecone index without blocking the event loop.
+
+        Args:
+            vectors (List[dict]): Vector records to upsert.
+            namespace (Optional[str]): Optional Pinecone namespace to write to.
+        """
+        async with self.upsert_semaphore:
+            await asyncio.to_thread(index.upsert, vectors=vectors, namespace=namespace)
+
+    async def _with_retries(self, func, *args):
+        """
+        Call an async function, retrying with exponential backoff and jitter.
+
+        Args:
+            func: The async function to call.
+            *args: Positional arguments passed to the function.
+
+        Returns:
+            The function's return value.
+
+        Raises:
+            Exception: The last error once all retries are exhausted.
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await func(*args)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+
+                delay = self.retry_base_delay * (2**attempt) + random.uniform(0, 1)
+                logger.warning(
+                    f"{func.__name__} failed (attempt {attempt + 1}), retrying in {delay:.1f}s: {e}"
+                )
+                await asyncio.sleep(delay)
+
+
+ingest_writer_service = IngestWriterService()
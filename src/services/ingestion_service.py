@@ -0,0 +1,207 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import List
+from src.models.file import FileData
+from src.models.job import JobStatus, JobType
+from src.models.conversation import UpdateConversation
+from src.services.job_queue_service import DEFAULT_LANE, JobQueue, JobWorkerPool
+from src.services.loader_service import loader_service
+from src.services.conversation_service import update_conversation
+from src.services.user_service import get_current_user
+from src.core.server.socket_server import sio
+from src.core.events import SOCKET_EVENTS
+from src.core.config import SETTINGS
+from src.core.logger import logger
+from src.utils.constants.file_type import IMAGE_FILE_TYPES
+from src.utils.converters.socketio_utils import (
+    async_safe_socket_emit,
+)
+
+ingestion_queue = JobQueue(JobType.INGEST_FILE)
+
+# Images need OCR and are ingested by their own, lower priority workers
+OCR_LANE = "ocr"
+
+
+@dataclass
+class QueuedIngestion:
+    job_ids: List[str] = field(default_factory=list)
+    ocr_job_ids: List[str] = field(default_factory=list)
+
+
+async def enqueue_file_ingestion(
+    files: List[FileData], conversation_id: str, message_id: str
+) -> QueuedIngestion:
+    """
+    Upload files to S3 and queue one durable ingestion job per file. Images
+    are queued in the OCR lane so they do not hold up other files.
+
+    Args:
+        files (List[FileData]): Files to ingest.
+        conversation_id (str): Conversation ID related to the files.
+        message_id (str): Message ID related to the files.
+
+    Returns:
+        QueuedIngestion: IDs of the queued jobs, by lane. Files that failed to upload are skipped.
+    """
+    user = await get_current_user()
+
+    file_keys = await asyncio.gather(
+        *(
+            loader_service.upload_file_to_s3(file, conversation_id, message_id)
+            for file in files
+        ),
+        return_exceptions=True,
+    )
+
+    queued = QueuedIngestion()
+
+    for file, file_key in zip(files, file_keys):
+        if isinstance(file_key, Exception):
+            logger.error(f"Error uploading file {file.filename}: {file_key}")
+            continue
+
+        payload = {
+            "conversationId": conversation_id,
+            "messageId": message_id,
+            "userId": user["id"],
+            "fileKey": file_key,
+            "filename": file.filename,
+            "contentType": file.content_type,
+        }
+
+        if file.content_type in IMAGE_FILE_TYPES:
+            job_id = await ingestion_queue.enqueue(payload, lane=OCR_LANE, priority=-1)
+            queued.ocr_job_ids.append(job_id)
+        else:
+            job_id = await ingestion_queue.enqueue(payload)
+            queued.job_ids.append(job_id)
+
+        await emit_ingestion_progress(job_id, payload, {"stage": "queued"})
+
+    if queued.job_ids or queued.ocr_job_ids:
+        await update_conversation(
+            conversation_id=conversation_id,
+            update_conversation=UpdateConversation(hasFilesUploaded=True),
+        )
+
+    if queued.job_ids:
+        ingestion_workers.notify()
+
+    if queued.ocr_job_ids:
+        ocr_workers.notify()
+
+    return queued
+
+
+async def wait_for_ingestion(job_ids: List[str], timeout: float) -> bool:
+    """
+    Wait until the given ingestion jobs have finished, or the timeout expires.
+
+    Args:
+        job_ids (List[str]): IDs of the jobs to wait for.
+        timeout (float): Maximum number of seconds to wait.
+
+    Returns:
+        bool: True if every job finished (succeeded or failed) in time, False otherwise.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    pending_statuses = {JobStatus.QUEUED.value, JobStatus.RUNNING.value}
+
+    while True:
+        jobs = await ingestion_queue.get_jobs(job_ids)
+
+        if not any(job["status"] in pending_statuses for job in jobs):
+            return True
+
+        remaining = deadline - loop.time()
+
+        if remaining <= 0:
+            return False
+
+        await asyncio.sleep(min(0.5, remaining))
+
+
+async def emit_ingestion_progress(job_id: str, payload: dict, progress: dict) -> None:
+    """
+    Emit a file ingestion progress event to the conversation room.
+
+    Args:
+        job_id (str): ID of the ingestion job.
+        payload (dict): Payload of the ingestion job.
+        progress (dict): Stage and counts to report.
+    """
+    await async_safe_socket_emit(
+        sio,
+        SOCKET_EVENTS["CHAT_FILE_PROGRESS"],
+        {
+            "jobId": job_id,
+            "conversationId": payload["conversationId"],
+            "messageId": payload["messageId"],
+            "filename": payload["filename"],
+            **progress,
+        },
+        room=payload["conversationId"],
+    )
+
+
+async def process_ingestion_job(job: dict) -> None:
+    """
+    Job handler that downloads an uploaded file from S3 and indexes it,
+    persisting and emitting progress as it goes.
+
+    Args:
+        job (dict): The claimed ingestion job.
+    """
+    payload = job["payload"]
+
+    async def report(progress: dict):
+        await ingestion_queue.update_progress(job["_id"], progress)
+        await emit_ingestion_progress(str(job["_id"]), payload, progress)
+
+    content = await loader_service.download_file_from_s3(payload["fileKey"])
+
+    file = FileData(
+        filename=payload["filename"],
+        content=content,
+        content_type=payload["contentType"],
+    )
+
+    await loader_service.ingest_file(
+        file=file,
+        file_key=payload["fileKey"],
+        conversation_id=payload["conversationId"],
+        message_id=payload["messageId"],
+        user_id=payload["userId"],
+        on_progress=report,
+    )
+
+    await report({"stage": "completed"})
+
+
+async def handle_failed_ingestion_job(job: dict) -> None:
+    """
+    Report an ingestion job that failed on its last attempt.
+
+    Args:
+        job (dict): The failed ingestion job.
+    """
+    await emit_ingestion_progress(str(job["_id"]), job["payload"], {"stage": "failed"})
+
+
+ingestion_workers = JobWorkerPool(
+    queue=ingestion_queue,
+    handler=process_ingestion_job,
+    concurrency=SETTINGS["INGEST_WORKER_CONCURRENCY"],
+    lane=DEFAULT_LANE,
+    failure_handler=handle_failed_ingestion_job,
+)
+
+ocr_workers = JobWorkerPool(
+    queue=ingestion_queue,
+    handler=process_ingestion_job,
+    concurrency=SETTINGS["OCR_WORKER_CONCURRENCY"],
+    lane=OCR_LANE,
+    failure_handler=handle_failed_ingestion_job,
+)
@@ -0,0 +1,392 @@
+import asyncio
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, List, Optional
+from pymongo import ReturnDocument
+from src.db.collections import jobs_collection
+from src.models.job import JobStatus, JobType
+from src.utils.converters.convert_to_object_id import convert_to_object_id
+from src.core.config import SETTINGS
+from src.core.logger import logger
+
+JobHandler = Callable[[dict], Awaitable[None]]
+
+DEFAULT_LANE = "default"
+
+
+class JobQueue:
+    """
+    Durable job queue persisted in the jobs collection. Workers claim jobs
+    with a lease; a job whose worker stops renewing the lease (e.g. after a
+    crash) becomes claimable again.
+    """
+
+    def __init__(
+        self,
+        job_type: JobType,
+        lease_seconds: int = SETTINGS["JOB_LEASE_SECONDS"],
+        max_attempts: int = SETTINGS["JOB_MAX_ATTEMPTS"],
+    ):
+        self.job_type = job_type
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+    async def enqueue(
+        self, payload: dict, lane: str = DEFAULT_LANE, priority: int = 0
+    ) -> str:
+        """
+        Persist a new job.
+
+        Args:
+            payload (dict): Job specific data passed to the handler.
+            lane (str, optional): Worker lane that processes the job. Defaults to "default".
+            priority (int, optional): Jobs with higher priority are claimed first. Defaults to 0.
+
+        Returns:
+            str: ID of the created job.
+        """
+        now = datetime.now(timezone.utc)
+
+        job = {
+            "type": self.job_type.value,
+            "lane": lane,
+            "priority": priority,
+            "status": JobStatus.QUEUED.value,
+            "payload": payload,
+            "progress": {},
+            "attempts": 0,
+            "runAfter": now,
+            "createdAt": now,
+            "updatedAt": now,
+        }
+
+        response = await jobs_collection.insert_one(job)
+        return str(response.inserted_id)
+
+    async def claim(self, worker_id: str, lane: str = DEFAULT_LANE) -> Optional[dict]:
+        """
+        Atomically claim the next runnable job, including jobs whose lease expired.
+
+        Args:
+            worker_id (str): Identifier of the claiming worker.
+            lane (str, optional): Lane to claim from. Defaults to "default".
+
+        Returns:
+            Optional[dict]: The claimed job, or None if nothing is runnable.
+        """
+        now = datetime.now(timezone.utc)
+
+        return await jobs_collection.find_one_and_update(
+            {
+                "type": self.job_type.value,
+                "lane": lane,
+                "$or": [
+                    {"status": JobStatus.QUEUED.value, "runAfter": {"$lte": now}},
+                    {
+                        "status": JobStatus.RUNNING.value,
+                        "leaseExpiresAt": {"$lt": now},
+                        # Jobs that keep crashing their worker are failed by reap_expired
+                        "attempts": {"$lt": self.max_attempts},
+                    },
+                ],
+            },
+            {
+                "$set": {
+                    "status": JobStatus.RUNNING.value,
+                    "workerId": worker_id,
+                    "leaseExpiresAt": now + timedelta(seconds=self.lease_seconds),
+                    "updatedAt": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("priority", -1), ("createdAt", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def renew_lease(self, job_id, worker_id: str) -> None:
+        """
+        Extend the lease of a running job held by this worker.
+
+        Args:
+            job_id: ID of the job.
+            worker_id (str): Identifier of the worker holding the lease.
+        """
+        now = datetime.now(timezone.utc)
+
+        await jobs_collection.update_one(
+            {"_id": job_id, "workerId": worker_id, "status": JobStatus.RUNNING.value},
+            {
+                "$set": {
+                    "leaseExpiresAt": now + timedelta(seconds=self.lease_seconds),
+                    "updatedAt": now,
+                }
+            },
+        )
+
+    async def update_progress(self, job_id, progress: dict) -> None:
+        """
+        Merge progress fields into a job.
+
+        Args:
+            job_id: ID of the job.
+            progress (dict): Progress fields to set.
+        """
+        await jobs_collection.update_one(
+            {"_id": job_id},
+            {
+                "$set": {
+                    **{f"progress.{key}": value for key, value in progress.items()},
+                    "updatedAt": datetime.now(timezone.utc),
+                }
+            },
+        )
+
+    async def reap_expired(self, lane: str = DEFAULT_LANE) -> Optional[dict]:
+        """
+        Fail the next job whose lease expired after its last attempt, e.g.
+        because it crashed or hung its worker every time.
+
+        Args:
+            lane (str, optional): Lane to reap. Defaults to "default".
+
+        Returns:
+            Optional[dict]: The failed job, or None if there is none.
+        """
+        now = datetime.now(timezone.utc)
+
+        return await jobs_collection.find_one_and_update(
+            {
+                "type": self.job_type.value,
+                "lane": lane,
+                "status": JobStatus.RUNNING.value,
+                "leaseExpiresAt": {"$lt": now},
+                "attempts": {"$gte": self.max_attempts},
+            },
+            {
+                "$set": {
+                    "status": JobStatus.FAILED.value,
+                    "error": "Lease expired on the last attempt",
+                    "updatedAt": now,
+                },
+                "$unset": {"leaseExpiresAt": "", "workerId": ""},
+            },
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def complete(self, job_id, worker_id: str) -> bool:
+        """
+        Mark a job as succeeded, if this worker still holds its lease.
+
+        Args:
+            job_id: ID of the job.
+            worker_id (str): Identifier of the worker that ran the job.
+
+        Returns:
+            bool: False if the lease expired and the job was claimed again meanwhile.
+        """
+        response = await jobs_collection.update_one(
+            {"_id": job_id, "workerId": worker_id, "status": JobStatus.RUNNING.value},
+            {
+                "$set": {
+                    "status": JobStatus.SUCCEEDED.value,
+                    "updatedAt": datetime.now(timezone.utc),
+                },
+                "$unset": {"leaseExpiresAt": "", "workerId": ""},
+            },
+        )
+
+        return response.matched_count == 1
+
+    async def fail(self, job: dict, error: str) -> Optional[bool]:
+        """
+        Record a failed attempt, if the worker that claimed the job still
+        holds its lease. The job is queued again with exponential backoff
+        until it runs out of attempts.
+
+        Args:
+            job (dict): The failed job, as returned by claim.
+            error (str): Error description.
+
+        Returns:
+            Optional[bool]: True if the job will be retried, False if it failed
+            permanently, None if the lease expired and the job was claimed again meanwhile.
+        """
+        now = datetime.now(timezone.utc)
+        will_retry = job["attempts"] < self.max_attempts
+
+        update = {
+            "status": (JobStatus.QUEUED if will_retry else JobStatus.FAILED).value,
+            "error": error,
+            "updatedAt": now,
+        }
+
+        if will_retry:
+            update["runAfter"] = now + timedelta(seconds=5 * 2 ** job["attempts"])
+
+        response = await jobs_collection.update_one(
+            {
+                "_id": job["_id"],
+                "workerId": job["workerId"],
+                "status": JobStatus.RUNNING.value,
+            },
+            {"$set": update, "$unset": {"leaseExpiresAt": "", "workerId": ""}},
+        )
+
+        if response.matched_count == 0:
+            return None
+
+        return will_retry
+
+    async def get_jobs(self, job_ids: List[str]) -> List[dict]:
+        """
+        Retrieve jobs by ID.
+
+        Args:
+            job_ids (List[str]): IDs of the jobs.
+
+        Returns:
+            List[dict]: Jobs found, without their payload.
+        """
+        cursor = jobs_collection.find(
+            {"_id": {"$in": [convert_to_object_id(job_id) for job_id in job_ids]}},
+            {"payload": 0},
+        )
+
+        return await cursor.to_list(length=None)
+
+
+class JobWorkerPool:
+    """
+    Pool of asyncio worker tasks that claim and run jobs from one lane of a queue.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handler: JobHandler,
+        concurrency: int,
+        lane: str = DEFAULT_LANE,
+        poll_interval: float = SETTINGS["JOB_POLL_INTERVAL"],
+        failure_handler: Optional[JobHandler] = None,
+    ):
+        self.queue = queue
+        self.handler = handler
+        self.failure_handler = failure_handler
+        self.concurrency = concurrency
+        self.lane = lane
+        self.poll_interval = poll_interval
+        self.tasks: List[asyncio.Task] = []
+        self.wake_up = asyncio.Event()
+
+    def start(self) -> None:
+        """
+        Start the worker tasks.
+        """
+        prefix = f"{socket.gethostname()}:{os.getpid()}:{self.queue.job_type}:{self.lane}"
+
+        self.tasks = [
+            asyncio.create_task(self._work(f"{prefix}:{n}"), name=f"{prefix}:{n}")
+            for n in range(self.concurrency)
+        ]
+        self.tasks.append(asyncio.create_task(self._reap(), name=f"{prefix}:reaper"))
+
+        logger.info(f"Started {self.concurrency} workers for {prefix}")
+
+    async def stop(self) -> None:
+        """
+        Cancel the worker and reaper tasks. Jobs they were running are picked up again
+        once their lease expires.
+        """
+        for task in self.tasks:
+            task.cancel()
+
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+    def notify(self) -> None:
+        """
+        Wake idle workers after a job was enqueued in this process.
+        """
+        self.wake_up.set()
+
+    async def _work(self, worker_id: str) -> None:
+        while True:
+            try:
+                job = await self.queue.claim(worker_id, self.lane)
+            except Exception as e:
+                logger.error(f"Worker {worker_id} failed to claim a job: {e}")
+                job = None
+
+            if job is None:
+                await self._wait_for_work()
+                continue
+
+            await self._run_job(job, worker_id)
+
+    async def _wait_for_work(self) -> None:
+        try:
+            await asyncio.wait_for(self.wake_up.wait(), timeout=self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+
+        self.wake_up.clear()
+
+    async def _run_job(self, job: dict, worker_id: str) -> None:
+        lease_task = asyncio.create_task(self._keep_lease(job["_id"], worker_id))
+
+        try:
+            await self.handler(job)
+
+            if not await self.queue.complete(job["_id"], worker_id):
+                logger.warning(
+                    f"Job {job['_id']} finished after its lease expired and it was claimed again"
+                )
+
+        except asyncio.CancelledError:
+            raise
+
+        except Exception as e:
+            will_retry = await self.queue.fail(job, str(e))
+
+            if will_retry is None:
+                logger.warning(
+                    f"Job {job['_id']} failed after its lease expired and it was claimed again: {e}"
+                )
+                return
+
+            logger.error(
+                f"Job {job['_id']} failed on attempt {job['attempts']} "
+                f"({'retrying' if will_retry else 'giving up'}): {e}"
+            )
+
+            if not will_retry and self.failure_handler:
+                await self.failure_handler(job)
+
+        finally:
+            lease_task.cancel()
+
+    async def _reap(self) -> None:
+        while True:
+            await asyncio.sleep(self.queue.lease_seconds)
+
+            try:
+                while job := await self.queue.reap_expired(self.lane):
+                    logger.error(
+                        f"Job {job['_id']} failed: lease expired on attempt {job['attempts']}"
+                    )
+
+                    if self.failure_handler:
+                        await self.failure_handler(job)
+
+            except Exception as e:
+                logger.error(f"Failed to reap expired jobs of {self.queue.job_type}: {e}")
+
+    async def _keep_lease(self, job_id, worker_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.queue.lease_seconds / 3)
+
+            try:
+                await self.queue.renew_lease(job_id, worker_id)
+            except Exception as e:
+                logger.warning(f"Failed to renew lease of job {job_id}: {e}")
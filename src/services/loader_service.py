@@ -6,114 +6,230 @@ from uuid import uuid4
 from langchain_core.documents import Document
 from langchain_community.document_loaders import S3FileLoader
 from fastapi import UploadFile, HTTPException, status
-from typing import List
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
 from botocore.exceptions import ClientError
 
-from src.utils.constants.file_type import FILE_TYPE
+from src.utils.constants.file_type import FILE_TYPE, IMAGE_FILE_TYPES, FileType
 from src.core.logger import logger
 from src.models.file import FileData
 from src.services.chunking_service import chunking_service
-from src.services.vector_store_service import add_documents_to_vector_store
-from src.services.user_service import get_current_user
-from src.models.conversation import UpdateConversation
-from src.services.conversation_service import update_conversation
+from src.llm.loaders.loader_registry import get_file_loader
+from src.llm.loaders.pdf_loader import open_pdf, iter_page_windows, load_pdf_pages
+from src.llm.loaders.image_loader import has_detectable_text
+from src.services.vector_store_service import (
+    add_documents_to_vector_store,
+    copy_vectors_in_vector_store,
+)
+from src.services.ingest_writer_service import IngestProgress
+from src.services.file_registry_service import (
+    compute_content_hash,
+    build_vector_ids,
+    get_registered_file,
+    register_file,
+)
+from src.services.s3_services import build_conversation_prefix
 from src.core.config import ENV_VARS
 
 BUCKET_NAME = ENV_VARS["AWS_S3_BUCKET_NAME"]
 session = aioboto3.Session()
 
+# Leading pages without text after which a PDF is treated as scanned
+SCANNED_PDF_CHECK_PAGES = 4
+
+ProgressReporter = Callable[[dict], Awaitable[None]]
+
 
 class LoaderService:
     upload_dir: str = "uploads"
-    conversation_id: str
-    message_id: str
 
-    async def run(
-        self, files: List[FileData], conversation_id: str, message_id: str
-    ) -> bool:
+    async def ingest_file(
+        self,
+        file: FileData,
+        file_key: str,
+        conversation_id: str,
+        message_id: str,
+        user_id: str,
+        on_progress: Optional[ProgressReporter] = None,
+    ) -> None:
         """
-        Process multiple files: upload to S3, split and index their content,
-        then update conversation status.
+        Index an uploaded file: reuse the chunks of an identical earlier upload,
+        or parse, chunk and embed it into the vector store.
 
         Args:
-            files (List[FileData]): List of files to process.
-            conversation_id (str): Conversation ID related to the files.
-            message_id (str): Message ID related to the files.
+            file (FileData): The file to index.
+            file_key (str): S3 key of the uploaded file.
+            conversation_id (str): Conversation ID related to the file.
+            message_id (str): Message ID related to the file.
+            user_id (str): Owner of the file.
+            on_progress (Optional[ProgressReporter]): Awaited with stage and counts as work completes.
 
-        Returns:
-            bool: True if all files processed successfully, False otherwise.
+        Raises:
+            RuntimeError: If some chunks could not be stored.
         """
-        if not files:
-            logger.info("No files provided and the loader run is terminated early.")
-            return False
 
-        self.conversation_id = conversation_id
-        self.message_id = message_id
+        async def report(progress: dict):
+            if on_progress:
+                await on_progress(progress)
+
+        content_hash = compute_content_hash(file.content)
+
+        if await self._reuse_registered_file(
+            user_id, content_hash, file_key, conversation_id, message_id
+        ):
+            await report({"stage": "reused"})
+            return
+
+        if file.content_type in IMAGE_FILE_TYPES and not await asyncio.to_thread(
+            has_detectable_text, file.content
+        ):
+            logger.info(f"No text detected in image, skipping OCR: {file_key}")
+            await report({"stage": "skipped"})
+            return
+
+        pages = 0
+        chunk_count = 0
+        stored_chunks = 0
+        failed_chunks = 0
+        pending_write: Optional[asyncio.Task] = None
+
+        async def write_window(chunks: List[Document], start: int):
+            nonlocal stored_chunks, failed_chunks
+
+            async def report_embedding(progress: IngestProgress):
+                await report(
+                    {
+                        "stage": "embedding",
+                        "embeddedChunks": stored_chunks + progress.stored_chunks,
+                        "totalChunks": chunk_count,
+                    }
+                )
+
+            progress = await add_documents_to_vector_store(
+                documents=chunks,
+                key=file_key,
+                ids=build_vector_ids(conversation_id, content_hash, len(chunks), start),
+                on_progress=report_embedding,
+            )
+
+            stored_chunks += progress.stored_chunks
+            failed_chunks += progress.failed_chunks
 
         try:
-            tasks = [self._process_file(file) for file in files]
-            had_errors = False
+            # Each window is written while the next one is parsed, in document order
+            async for documents in self._iter_document_windows(file, file_key):
+                pages += len(documents)
+                await report({"stage": "parsed", "pages": pages})
+
+                chunks = chunking_service.token_text_splitter(documents=documents)
+                self._enrich_documents_with_metadata(
+                    chunks,
+                    conversation_id=conversation_id,
+                    message_id=message_id,
+                    user_id=user_id,
+                    content_hash=content_hash,
+                    start=chunk_count,
+                )
 
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+                start = chunk_count
+                chunk_count += len(chunks)
+                await report({"stage": "chunked", "chunks": chunk_count})
 
-            for res in results:
-                if isinstance(res, Exception):
-                    logger.error(f"Error loading file: {res}")
-                    had_errors = True
+                if pending_write:
+                    await pending_write
 
-            if had_errors:
-                logger.warning(
-                    "Some files failed to load, but continuing with the pipeline."
-                )
+                if chunks:
+                    pending_write = asyncio.create_task(write_window(chunks, start))
 
-            updated_conversation = UpdateConversation(hasFilesUploaded=True)
-            await update_conversation(
-                conversation_id=conversation_id,
-                update_conversation=updated_conversation,
-            )
+            if pending_write:
+                await pending_write
 
-            logger.info("All files loaded successfully.")
-            return True
+        finally:
+            if pending_write and not pending_write.done():
+                pending_write.cancel()
 
-        except Exception as e:
-            logger.error(f"Error in background file processing: {e}")
-            return False
+        logger.info(
+            f"Loaded document and splitted into {chunk_count} chunks: {file_key}"
+        )
+
+        # Only register complete files, a partial chunk set must not be reused
+        if failed_chunks:
+            raise RuntimeError(
+                f"{failed_chunks} of {chunk_count} chunks failed to store: {file_key}"
+            )
+
+        await register_file(
+            user_id=user_id,
+            content_hash=content_hash,
+            conversation_id=conversation_id,
+            file_key=file_key,
+            chunk_count=chunk_count,
+        )
 
-    async def _process_file(self, file: UploadFile):
+    async def _reuse_registered_file(
+        self,
+        user_id: str,
+        content_hash: str,
+        file_key: str,
+        conversation_id: str,
+        message_id: str,
+    ) -> bool:
         """
-        Upload file to S3 and load its content based on type.
+        Copy the stored chunks of a previously ingested identical file into
+        the current conversation, skipping parsing and embedding.
 
         Args:
-            file (UploadFile): The file to process.
+            user_id (str): Owner of the file.
+            content_hash (str): Content hash of the file.
+            file_key (str): S3 key of the new upload, used for logging.
+            conversation_id (str): Conversation to copy the chunks into.
+            message_id (str): Message the new upload belongs to.
+
+        Returns:
+            bool: True if the existing chunks were reused, False if the file must be loaded.
         """
-        file_key = await self.upload_file_to_s3(file)
-        logger.info(f"Uploaded file with key: {file_key}")
+        registered_file = await get_registered_file(user_id, content_hash)
 
-        await self._load_file_to_vector_store(file_key=file_key)
+        if not registered_file:
+            return False
 
-    async def _load_file_to_vector_store(self, file_key: str):
-        """
-        Load and chunk document, enrich metadata, then add to vector store.
+        source_conversation_id = registered_file["conversationId"]
 
-        Args:
-            file_key (str): S3 key of the PDF file.
-        """
-        documents = self._load_file_from_s3(file_key)
-        chunks = chunking_service.recursive_text_splitter(documents=documents)
-        enriched_chunks = await self._enrich_documents_with_metadata(chunks)
+        if source_conversation_id == conversation_id:
+            logger.info(f"File already indexed in this conversation: {file_key}")
+            return True
 
-        logger.info(
-            f"Loaded document and splitted into {len(chunks)} chunks: {file_key}"
+        chunk_count = registered_file["chunkCount"]
+
+        copied = await copy_vectors_in_vector_store(
+            source_ids=build_vector_ids(source_conversation_id, content_hash, chunk_count),
+            target_ids=build_vector_ids(conversation_id, content_hash, chunk_count),
+            metadata={
+                "conversation_id": conversation_id,
+                "message_id": message_id,
+                "user_id": user_id,
+            },
+            key=file_key,
         )
 
-        add_documents_to_vector_store(documents=enriched_chunks, key=file_key)
+        if not copied:
+            logger.info(f"Registered chunks are stale, loading file again: {file_key}")
+            return False
 
-    async def upload_file_to_s3(self, file_data: FileData) -> str:
+        logger.info(
+            f"Reused {chunk_count} chunks from conversation {source_conversation_id}: {file_key}"
+        )
+        return True
+
+    async def upload_file_to_s3(
+        self, file_data: FileData, conversation_id: str = "", message_id: str = ""
+    ) -> str:
         """
         Upload a file to S3 asynchronously.
 
         Args:
             file_data (FileData): File data to upload.
+            conversation_id (str, optional): Conversation the file belongs to. Defaults to "".
+            message_id (str, optional): Message the file belongs to. Defaults to "".
 
         Returns:
             str: Generated S3 key for the uploaded file.
@@ -124,6 +240,9 @@ class LoaderService:
         ext = os.path.splitext(file_data.filename)[1]
         file_key = f"{uuid4()}{ext}"
 
+        if conversation_id:
+            file_key = f"{build_conversation_prefix(conversation_id)}{file_key}"
+
         async with session.client("s3") as s3_client:
             try:
                 await s3_client.put_object(
@@ -133,8 +252,8 @@ class LoaderService:
                     ContentType=file_data.content_type,
                     Metadata={
                         "original_filename": file_data.filename,
-                        "conversation_id": self.conversation_id,
-                        "message_id": self.message_id,
+                        "conversation_id": conversation_id,
+                        "message_id": message_id,
                     },
                 )
                 logger.info(f"Successfully uploaded file to S3: {file_key}")
@@ -148,6 +267,103 @@ class LoaderService:
 
         return file_key
 
+    async def download_file_from_s3(self, file_key: str) -> bytes:
+        """
+        Download the content of an uploaded file from S3.
+
+        Args:
+            file_key (str): The S3 key of the file.
+
+        Returns:
+            bytes: Raw file content.
+        """
+        async with session.client("s3") as s3_client:
+            response = await s3_client.get_object(Bucket=BUCKET_NAME, Key=file_key)
+
+            async with response["Body"] as body:
+                return await body.read()
+
+    async def _iter_document_windows(
+        self, file: FileData, file_key: str
+    ) -> AsyncIterator[List[Document]]:
+        """
+        Yield a file's documents in windows, first pages first. PDFs with a
+        text layer are read page by page so the start of a long document can
+        be indexed before the rest is parsed; other files are loaded in one go.
+
+        Args:
+            file (FileData): The uploaded file.
+            file_key (str): The S3 key of the file.
+
+        Yields:
+            List[Document]: The next window of loaded documents.
+        """
+        if file.content_type == FileType.PDF.value:
+            reader = await asyncio.to_thread(open_pdf, file.content)
+
+            if reader is not None:
+                metadata = self._build_source_metadata(file, file_key)
+                page_count = len(reader.pages)
+                has_text = False
+
+                for start, end in iter_page_windows(page_count):
+                    documents = await asyncio.to_thread(
+                        load_pdf_pages, reader, metadata, start, end
+                    )
+
+                    if documents:
+                        has_text = True
+                        yield documents
+
+                    # Scanned PDFs have no text layer and need the OCR capable loader
+                    elif not has_text and end >= min(page_count, SCANNED_PDF_CHECK_PAGES):
+                        break
+
+                if has_text:
+                    return
+
+                logger.info(f"No text layer found, using the S3 file loader: {file_key}")
+
+        yield await self._load_documents(file, file_key)
+
+    async def _load_documents(self, file: FileData, file_key: str) -> List[Document]:
+        """
+        Load file content with the lightweight loader registered for its type,
+        or with the S3FileLoader for PDF, Office and image files. Loading runs
+        in a worker thread so parsing does not block the event loop.
+
+        Args:
+            file (FileData): The uploaded file.
+            file_key (str): The S3 key of the file.
+
+        Returns:
+            List[Document]: List of loaded documents.
+        """
+        loader = get_file_loader(file.content_type, file.filename)
+
+        if loader is None:
+            return await asyncio.to_thread(self._load_file_from_s3, file_key)
+
+        metadata = self._build_source_metadata(file, file_key)
+
+        return await asyncio.to_thread(loader, file.content, metadata)
+
+    def _build_source_metadata(self, file: FileData, file_key: str) -> dict:
+        """
+        Build the source metadata attached to documents loaded in-process.
+
+        Args:
+            file (FileData): The uploaded file.
+            file_key (str): The S3 key of the file.
+
+        Returns:
+            dict: Source location and original file name.
+        """
+        return {
+            "source": f"s3://{BUCKET_NAME}/{file_key}",
+            "filename": file.filename,
+        }
+
     def _load_file_from_s3(self, file_key: str) -> List[Document]:
         """
         Load file content from S3 using the S3FileLoader.
@@ -161,27 +377,37 @@ class LoaderService:
         loader = S3FileLoader(BUCKET_NAME, file_key)
         return loader.load()
 
-    async def _enrich_documents_with_metadata(
-        self, documents: List[Document]
+    def _enrich_documents_with_metadata(
+        self,
+        documents: List[Document],
+        conversation_id: str,
+        message_id: str,
+        user_id: str,
+        content_hash: str,
+        start: int = 0,
     ) -> List[Document]:
         """
-        Add conversation, message, user IDs, and chunk order to document metadata.
+        Add conversation, message, user IDs, content hash, and chunk order to document metadata.
 
         Args:
             documents (List[Document]): List of documents to enrich.
+            conversation_id (str): Conversation the documents belong to.
+            message_id (str): Message the documents belong to.
+            user_id (str): Owner of the documents.
+            content_hash (str): Content hash of the source file.
+            start (int, optional): Order of the first document. Defaults to 0.
 
         Returns:
             List[Document]: Enriched documents.
         """
-        user = await get_current_user()
-
         for i, document in enumerate(documents):
             document.metadata.update(
                 {
-                    "conversation_id": self.conversation_id,
-                    "message_id": self.message_id,
-                    "user_id": user["id"],
-                    "order": i,
+                    "conversation_id": conversation_id,
+                    "message_id": message_id,
+                    "user_id": user_id,
+                    "content_hash": content_hash,
+                    "order": start + i,
                 }
             )
 
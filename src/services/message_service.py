@@ -1,13 +1,23 @@
 from fastapi import HTTPException
 from starlette import status
 from datetime import datetime, timezone
-from typing import List
+from typing import AsyncIterator, List, Optional, Tuple
 from src.models.message import Message, CreateMessage, UpdateMessage, Author
-from src.db.collections import messages_collection
+from bson import ObjectId
+from pymongo import UpdateMany
+from src.db.collections import messages_collection, conversations_collection
+from src.db.repository import messages_repository
 from src.utils.converters.convert_to_object_id import convert_to_object_id
-from src.schema.message_schema import message_schema
+from src.schema.message_schema import message_schema, MESSAGE_SCHEMA_FIELDS
+from src.utils.converters.cursor_utils import encode_cursor
+from src.utils.filters.keyset_filter import keyset_filter
 from src.models.status import Status
 from src.core.logger import logger
+from src.core.server.socket_server import sio
+from src.core.events import SOCKET_EVENTS
+from src.utils.converters.socketio_utils import (
+    async_safe_socket_emit,
+)
 
 
 async def create_message(
@@ -27,9 +37,12 @@ async def create_message(
     Raises:
         HTTPException: If conversation does not exist.
     """
-    from src.services.conversation_service import get_conversation
+    from src.services.conversation_service import (
+        get_conversation_metadata,
+        record_conversation_activity,
+    )
 
-    conversation = await get_conversation(conversation_id)
+    conversation = await get_conversation_metadata(conversation_id)
 
     if not conversation:
         raise HTTPException(
@@ -39,6 +52,8 @@ async def create_message(
 
     new_message = {
         "conversationId": convert_to_object_id(conversation_id),
+        # Owner of the conversation, scopes message search to the user
+        "userId": convert_to_object_id(conversation["userId"]),
         "timestamp": datetime.now(timezone.utc),
         **message.model_dump(),
     }
@@ -50,9 +65,100 @@ async def create_message(
     response = await messages_collection.insert_one(new_message)
     new_message["_id"] = response.inserted_id
 
+    await record_conversation_activity(
+        new_message["conversationId"],
+        new_message["timestamp"],
+        content=new_message["content"],
+        new_messages=1,
+    )
+
     return message_schema(new_message)
 
 
+async def create_message_pair(
+    conversation_id: str, message: CreateMessage
+) -> Tuple[Message, Message]:
+    """
+    Create a user message together with the loading AI message that will
+    hold the response, in a single write, and emit both to the conversation.
+
+    Args:
+        conversation_id (str): ID of the conversation.
+        message (CreateMessage): User message data to create.
+
+    Returns:
+        Tuple[Message, Message]: Created user message and AI placeholder message.
+
+    Raises:
+        HTTPException: If conversation does not exist.
+    """
+    from src.services.conversation_service import (
+        get_conversation_metadata,
+        record_conversation_activity,
+    )
+
+    conversation = await get_conversation_metadata(conversation_id)
+
+    if not conversation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Conversation with conversationId: {conversation_id} not found",
+        )
+
+    conversation_object_id = convert_to_object_id(conversation_id)
+    user_object_id = convert_to_object_id(conversation["userId"])
+    now = datetime.now(timezone.utc)
+
+    # Both messages share the timestamp, the ascending _ids keep them in order
+    new_user_message = {
+        "conversationId": conversation_object_id,
+        "userId": user_object_id,
+        "timestamp": now,
+        **message.model_dump(),
+        "status": Status.SUCCESS,
+    }
+
+    new_ai_message = {
+        "conversationId": conversation_object_id,
+        "userId": user_object_id,
+        "timestamp": now,
+        **CreateMessage(
+            author=Author.AI, content="", status=Status.LOADING
+        ).model_dump(),
+    }
+
+    response = await messages_collection.insert_many(
+        [new_user_message, new_ai_message]
+    )
+    new_user_message["_id"], new_ai_message["_id"] = response.inserted_ids
+
+    await record_conversation_activity(
+        conversation_object_id,
+        now,
+        content=new_user_message["content"],
+        new_messages=2,
+    )
+
+    user_message = message_schema(new_user_message)
+    ai_message = message_schema(new_ai_message)
+
+    await async_safe_socket_emit(
+        sio,
+        SOCKET_EVENTS["CHAT_USER_CREATE"],
+        user_message,
+        room=conversation_id,
+    )
+
+    await async_safe_socket_emit(
+        sio,
+        SOCKET_EVENTS["CHAT_AI_MESSAGE"],
+        ai_message,
+        room=conversation_id,
+    )
+
+    return user_message, ai_message
+
+
 async def get_messages(conversation_id: str) -> List[Message]:
     """
     Retrieve all messages for a conversation sorted by timestamp.
@@ -65,15 +171,83 @@ async def get_messages(conversation_id: str) -> List[Message]:
     """
     messages = (
         await messages_collection.find(
-            {"conversationId": convert_to_object_id(conversation_id)}
+            {"conversationId": convert_to_object_id(conversation_id)},
+            MESSAGE_SCHEMA_FIELDS,
         )
-        .sort("timestamp", 1)
+        .sort([("timestamp", 1), ("_id", 1)])
         .to_list(length=None)
     )
 
     return [message_schema(msg) for msg in messages]
 
 
+async def get_messages_page(
+    conversation_id: str, limit: int, cursor: Optional[str] = None
+) -> dict:
+    """
+    Retrieve one page of a conversation's messages, newest page first.
+    Messages within a page are sorted by timestamp like get_messages.
+
+    Args:
+        conversation_id (str): Conversation ID.
+        limit (int): Maximum number of messages in the page.
+        cursor (Optional[str]): Cursor returned with the previous (newer) page.
+
+    Returns:
+        dict: The page messages and the cursor of the next (older) page, None on the last page.
+    """
+    messages = (
+        await messages_collection.find(
+            {
+                "conversationId": convert_to_object_id(conversation_id),
+                **keyset_filter("timestamp", cursor, descending=True),
+            },
+            MESSAGE_SCHEMA_FIELDS,
+        )
+        .sort([("timestamp", -1), ("_id", -1)])
+        .limit(limit + 1)
+        .to_list(length=None)
+    )
+
+    next_cursor = None
+
+    if len(messages) > limit:
+        messages = messages[:limit]
+        next_cursor = encode_cursor(messages[-1]["timestamp"], messages[-1]["_id"])
+
+    return {
+        "messages": [message_schema(msg) for msg in reversed(messages)],
+        "nextCursor": next_cursor,
+    }
+
+
+async def iter_messages(
+    conversation_id: str, batch_size: int = 500
+) -> AsyncIterator[Message]:
+    """
+    Iterate over all messages of a conversation sorted by timestamp, fetching
+    them from the database in batches instead of loading them all at once.
+
+    Args:
+        conversation_id (str): Conversation ID.
+        batch_size (int, optional): Messages fetched per round trip. Defaults to 500.
+
+    Yields:
+        Message: The next message.
+    """
+    cursor = (
+        messages_collection.find(
+            {"conversationId": convert_to_object_id(conversation_id)},
+            MESSAGE_SCHEMA_FIELDS,
+        )
+        .sort([("timestamp", 1), ("_id", 1)])
+        .batch_size(batch_size)
+    )
+
+    async for message in cursor:
+        yield message_schema(message)
+
+
 async def get_message(message_id: str) -> Message:
     """
     Retrieve a single message by its ID.
@@ -88,7 +262,7 @@ async def get_message(message_id: str) -> Message:
         HTTPException: If message is not found.
     """
     message = await messages_collection.find_one(
-        {"_id": convert_to_object_id(message_id)}
+        {"_id": convert_to_object_id(message_id)}, MESSAGE_SCHEMA_FIELDS
     )
 
     if not message:
@@ -110,40 +284,113 @@ async def update_message(message_id: str, update_data: UpdateMessage) -> Message
 
     Returns:
         Message: Updated message object.
+
+    Raises:
+        HTTPException: If message is not found.
     """
-    await messages_collection.update_one(
+    from src.services.conversation_service import record_conversation_activity
+
+    update_message_obj = update_data.model_dump(exclude_unset=True)
+
+    message = await messages_repository.update_one(
         {"_id": convert_to_object_id(message_id)},
-        {"$set": update_data.model_dump(exclude_unset=True)},
+        {"$set": update_message_obj},
     )
 
-    message = await get_message(message_id)
-    return message
+    if not message:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Message with messageId: {message_id} not found",
+        )
 
+    # A finalised response becomes the conversation's latest activity
+    if update_message_obj.get("content"):
+        await record_conversation_activity(
+            message["conversationId"],
+            datetime.now(timezone.utc),
+            content=update_message_obj["content"],
+        )
 
-async def delete_messages(conversation_id: str) -> None:
-    """
-    Delete all messages belonging to a conversation.
+    return message_schema(message)
 
-    Args:
-        conversation_id (str): Conversation ID.
 
-    Raises:
-        HTTPException: If conversation does not exist.
+async def delete_messages(conversation_ids: List[ObjectId]) -> int:
     """
-    from src.services.conversation_service import get_conversation
+    Delete all messages belonging to the given conversations. Access must
+    have been checked by the caller, e.g. when the conversations were marked
+    as deleted.
 
-    conversation = await get_conversation(conversation_id)
-
-    if not conversation:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Conversation with conversationId: {conversation_id} not found",
-        )
+    Args:
+        conversation_ids (List[ObjectId]): Conversation IDs.
 
+    Returns:
+        int: Number of deleted messages.
+    """
     response = await messages_collection.delete_many(
-        {"conversationId": convert_to_object_id(conversation_id)}
+        {"conversationId": {"$in": conversation_ids}}
     )
 
     logger.info(
-        f"Successfully deleted {response.deleted_count} messages from conversation: {conversation_id}"
+        f"Successfully deleted {response.deleted_count} messages from {len(conversation_ids)} conversations"
     )
+
+    return response.deleted_count
+
+
+async def backfill_message_user_ids(batch_size: int = 1000) -> None:
+    """
+    Set the owner's userId on messages created before messages carried it,
+    so they can be found by message search.
+
+    Args:
+        batch_size (int, optional): Messages inspected per round trip. Defaults to 1000.
+    """
+    backfilled = 0
+
+    while True:
+        messages = (
+            await messages_collection.find(
+                {"userId": {"$exists": False}}, {"conversationId": 1}
+            )
+            .limit(batch_size)
+            .to_list(length=None)
+        )
+
+        if not messages:
+            break
+
+        conversation_ids = list({message["conversationId"] for message in messages})
+
+        conversations = await conversations_collection.find(
+            {"_id": {"$in": conversation_ids}}, {"userId": 1}
+        ).to_list(length=None)
+
+        owners = {
+            conversation["_id"]: conversation["userId"]
+            for conversation in conversations
+        }
+
+        # Messages of deleted conversations get no owner, so they are not found
+        # by search nor picked up again by the next batch
+        orphaned = [cid for cid in conversation_ids if cid not in owners]
+
+        updates = [
+            UpdateMany(
+                {"conversationId": conversation_id, "userId": {"$exists": False}},
+                {"$set": {"userId": user_id}},
+            )
+            for conversation_id, user_id in owners.items()
+        ]
+        updates += [
+            UpdateMany(
+                {"conversationId": conversation_id, "userId": {"$exists": False}},
+                {"$set": {"userId": None}},
+            )
+            for conversation_id in orphaned
+        ]
+
+        response = await messages_collection.bulk_write(updates, ordered=False)
+        backfilled += response.modified_count
+
+    if backfilled:
+        logger.info(f"Backfilled userId of {backfilled} messages.")
@@ -0,0 +1,351 @@
+"""
+Find and delete vectors and S3 objects whose conversation no longer exists,
+e.g. left behind by a partial ingestion or deletion failure.
+
+Run with: python -m src.services.orphan_gc_service [--dry-run] [--include-legacy]
+"""
+
+import argparse
+import asyncio
+import json
+from dataclasses import asdict, dataclass, field
+from typing import Iterable, List, Optional, Set
+import aioboto3
+from bson import ObjectId
+from src.db.collections import conversations_collection
+from src.db.pinecone import index
+from src.services.s3_services import (
+    CONVERSATIONS_PREFIX,
+    delete_objects,
+    read_conversation_ids,
+)
+from src.utils.limiters.token_rate_limiter import TokenRateLimiter
+from src.core.config import ENV_VARS, SETTINGS
+from src.core.logger import logger
+
+# Vector IDs listed per Pinecone request, the maximum the list API allows
+VECTOR_PAGE_SIZE = 100
+
+# Vector IDs deleted per Pinecone request
+VECTOR_DELETE_BATCH_SIZE = 1000
+
+# Orphaned conversation IDs kept in the report as examples
+ORPHAN_SAMPLE_SIZE = 100
+
+
+@dataclass
+class OrphanReport:
+    dry_run: bool
+    scanned_vectors: int = 0
+    orphan_vectors: int = 0
+    deleted_vectors: int = 0
+    # Vectors without a conversation ID, never deleted
+    unattributed_vectors: int = 0
+    scanned_prefixes: int = 0
+    # Legacy objects uploaded without a conversation prefix
+    scanned_objects: int = 0
+    orphan_objects: int = 0
+    deleted_objects: int = 0
+    # Legacy objects without conversation_id metadata, never deleted
+    unattributed_objects: int = 0
+    orphan_conversation_ids: List[str] = field(default_factory=list)
+
+    def add_orphan_conversations(self, conversation_ids: Iterable[str]) -> None:
+        for conversation_id in conversation_ids:
+            if len(self.orphan_conversation_ids) >= ORPHAN_SAMPLE_SIZE:
+                return
+
+            if conversation_id not in self.orphan_conversation_ids:
+                self.orphan_conversation_ids.append(conversation_id)
+
+
+async def find_missing_conversations(conversation_ids: Iterable[str]) -> Set[str]:
+    """
+    Find which of the given conversation IDs have no conversation document.
+    Conversations marked as deleted still count as existing, their data is
+    removed by their deletion job.
+
+    Args:
+        conversation_ids (Iterable[str]): Conversation IDs, at most one page of them.
+
+    Returns:
+        Set[str]: The IDs without a conversation.
+    """
+    candidates = {
+        conversation_id
+        for conversation_id in conversation_ids
+        if ObjectId.is_valid(conversation_id)
+    }
+
+    if not candidates:
+        return set()
+
+    existing = await conversations_collection.find(
+        {"_id": {"$in": [ObjectId(conversation_id) for conversation_id in candidates]}},
+        {"_id": 1},
+    ).to_list(length=None)
+
+    return candidates - {str(conversation["_id"]) for conversation in existing}
+
+
+def parse_vector_conversation_id(vector_id: str) -> Optional[str]:
+    """
+    Read the conversation ID from a vector ID built by build_vector_ids.
+
+    Args:
+        vector_id (str): Vector ID.
+
+    Returns:
+        Optional[str]: Conversation ID, None for vectors stored with random IDs.
+    """
+    conversation_id, separator, _ = vector_id.partition("#")
+
+    if separator and ObjectId.is_valid(conversation_id):
+        return conversation_id
+
+    return None
+
+
+async def read_vector_conversation_ids(vector_ids: List[str]) -> dict:
+    """
+    Read the conversation_id metadata of vectors stored with random IDs.
+
+    Args:
+        vector_ids (List[str]): Vector IDs.
+
+    Returns:
+        dict: Conversation ID by vector ID, for the vectors that have one.
+    """
+    if not vector_ids:
+        return {}
+
+    response = await asyncio.to_thread(index.fetch, ids=vector_ids)
+
+    return {
+        vector_id: vector.metadata["conversation_id"]
+        for vector_id, vector in response.vectors.items()
+        if vector.metadata and vector.metadata.get("conversation_id")
+    }
+
+
+async def collect_orphan_vectors(
+    report: OrphanReport, limiter: TokenRateLimiter
+) -> None:
+    """
+    Page through the vector IDs of the index and delete the vectors of
+    missing conversations, one page in memory at a time.
+
+    Args:
+        report (OrphanReport): Report updated with the counts.
+        limiter (TokenRateLimiter): Limits the number of deleted vectors per minute.
+    """
+    orphan_ids = []
+    pagination_token = None
+
+    async def flush():
+        nonlocal orphan_ids
+
+        for start in range(0, len(orphan_ids), VECTOR_DELETE_BATCH_SIZE):
+            batch = orphan_ids[start : start + VECTOR_DELETE_BATCH_SIZE]
+            await limiter.acquire(len(batch))
+            await asyncio.to_thread(index.delete, ids=batch)
+            report.deleted_vectors += len(batch)
+
+        orphan_ids = []
+
+    while True:
+        page = await asyncio.to_thread(
+            index.list_paginated,
+            limit=VECTOR_PAGE_SIZE,
+            pagination_token=pagination_token,
+        )
+        vector_ids = [vector.id for vector in page.vectors]
+        report.scanned_vectors += len(vector_ids)
+
+        owners = {
+            vector_id: parse_vector_conversation_id(vector_id)
+            for vector_id in vector_ids
+        }
+        owners.update(
+            await read_vector_conversation_ids(
+                [vector_id for vector_id, owner in owners.items() if owner is None]
+            )
+        )
+
+        report.unattributed_vectors += sum(owner is None for owner in owners.values())
+
+        missing = await find_missing_conversations(
+            owner for owner in owners.values() if owner
+        )
+        page_orphans = [
+            vector_id for vector_id, owner in owners.items() if owner in missing
+        ]
+
+        report.orphan_vectors += len(page_orphans)
+        report.add_orphan_conversations(missing)
+
+        if not report.dry_run:
+            orphan_ids += page_orphans
+
+            if len(orphan_ids) >= VECTOR_DELETE_BATCH_SIZE:
+                await flush()
+
+        pagination_token = page.pagination.next if page.pagination else None
+
+        if not pagination_token:
+            break
+
+    await flush()
+
+
+async def collect_orphan_objects(
+    report: OrphanReport, limiter: TokenRateLimiter, include_legacy: bool
+) -> None:
+    """
+    Page through the conversation prefixes of the bucket, and optionally the
+    legacy objects uploaded without a prefix, and delete the objects of
+    missing conversations, one page in memory at a time.
+
+    Args:
+        report (OrphanReport): Report updated with the counts.
+        limiter (TokenRateLimiter): Limits the number of deleted objects per minute.
+        include_legacy (bool): Also read the metadata of objects uploaded without a prefix.
+    """
+    bucket_name = ENV_VARS["AWS_S3_BUCKET_NAME"]
+    session = aioboto3.Session()
+
+    async with session.client("s3") as s3_client:
+        paginator = s3_client.get_paginator("list_objects_v2")
+
+        async def remove(keys: List[str]):
+            report.orphan_objects += len(keys)
+
+            if report.dry_run or not keys:
+                return
+
+            await limiter.acquire(len(keys))
+            report.deleted_objects += await delete_objects(s3_client, bucket_name, keys)
+
+        async for page in paginator.paginate(
+            Bucket=bucket_name, Prefix=CONVERSATIONS_PREFIX, Delimiter="/"
+        ):
+            # conversations/<conversation_id>/ by conversation ID
+            prefixes = {
+                prefix["Prefix"][len(CONVERSATIONS_PREFIX) :].rstrip("/"): prefix["Prefix"]
+                for prefix in page.get("CommonPrefixes", [])
+            }
+            report.scanned_prefixes += len(prefixes)
+
+            missing = await find_missing_conversations(prefixes)
+            report.add_orphan_conversations(missing)
+
+            for conversation_id in missing:
+                async for objects in paginator.paginate(
+                    Bucket=bucket_name, Prefix=prefixes[conversation_id]
+                ):
+                    await remove([obj["Key"] for obj in objects.get("Contents", [])])
+
+        if not include_legacy:
+            return
+
+        async for page in paginator.paginate(Bucket=bucket_name):
+            keys = [
+                obj["Key"]
+                for obj in page.get("Contents", [])
+                if not obj["Key"].startswith(CONVERSATIONS_PREFIX)
+            ]
+            report.scanned_objects += len(keys)
+
+            owners = await read_conversation_ids(s3_client, bucket_name, keys)
+            report.unattributed_objects += sum(owner is None for owner in owners)
+
+            missing = await find_missing_conversations(owner for owner in owners if owner)
+            report.add_orphan_conversations(missing)
+
+            await remove([key for key, owner in zip(keys, owners) if owner in missing])
+
+
+async def collect_orphans(
+    dry_run: bool = False,
+    include_vectors: bool = True,
+    include_files: bool = True,
+    include_legacy: bool = False,
+) -> OrphanReport:
+    """
+    Find the vectors and S3 objects of conversations that no longer exist
+    and delete them, unless running dry.
+
+    Args:
+        dry_run (bool, optional): Only report the orphans. Defaults to False.
+        include_vectors (bool, optional): Scan the vector index. Defaults to True.
+        include_files (bool, optional): Scan the S3 bucket. Defaults to True.
+        include_legacy (bool, optional): Also scan S3 objects uploaded without a conversation prefix. Defaults to False.
+
+    Returns:
+        OrphanReport: Scanned, orphaned and deleted counts.
+    """
+    report = OrphanReport(dry_run=dry_run)
+    limiter = TokenRateLimiter(SETTINGS["ORPHAN_GC_DELETES_PER_MINUTE"])
+
+    if include_vectors:
+        await collect_orphan_vectors(report, limiter)
+
+    if include_files:
+        await collect_orphan_objects(report, limiter, include_legacy)
+
+    logger.info(f"Orphan collection finished: {asdict(report)}")
+
+    return report
+
+
+async def run_orphan_gc(interval_seconds: float) -> None:
+    """
+    Collect orphans periodically until cancelled. The first run waits one
+    interval, so restarts do not trigger a full scan.
+
+    Args:
+        interval_seconds (float): Seconds between runs.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+
+        try:
+            await collect_orphans(dry_run=SETTINGS["ORPHAN_GC_DRY_RUN"])
+        except Exception as e:
+            logger.error(f"Orphan collection failed: {e}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Delete vectors and S3 objects of conversations that no longer exist."
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Only report the orphans"
+    )
+    parser.add_argument(
+        "--include-legacy",
+        action="store_true",
+        help="Also scan S3 objects uploaded without a conversation prefix",
+    )
+    parser.add_argument(
+        "--skip-vectors", action="store_true", help="Do not scan the vector index"
+    )
+    parser.add_argument(
+        "--skip-files", action="store_true", help="Do not scan the S3 bucket"
+    )
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        collect_orphans(
+            dry_run=args.dry_run,
+            include_vectors=not args.skip_vectors,
+            include_files=not args.skip_files,
+            include_legacy=args.include_legacy,
+        )
+    )
+
+    print(json.dumps(asdict(report), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ from typing import List
 from src.schema.prompt_schema import prompt_schema, prompt_messages_schema
 from src.models.prompt import Prompt, PromptMessages
 from src.db.collections import prompts_collection
+from src.db.repository import prompts_repository
 from src.services.user_service import get_current_user, user_profile_context
 from src.llm.chains.user_prompt_chain import user_prompt_chain
 from src.services.conversation_service import get_all_conversations
@@ -58,35 +59,16 @@ async def get_user_prompt() -> Prompt:
 
 async def save_user_prompt(prompts: List[str]) -> Prompt:
     user = await get_current_user()
-    user_prompt = await get_user_prompt()
-
-    if user_prompt:
-        # update an existing user prompt, if available
-
-        update_user_prompt_obj = {
-            "prompts": prompts,
-            "updatedAt": datetime.now(timezone.utc),
-        }
-
-        await prompts_collection.update_one(
-            {"userId": user["id"]},
-            {"$set": update_user_prompt_obj},
-        )
-
-        updated_user_prompt = await get_user_prompt()
+    now = datetime.now(timezone.utc)
 
-        return prompt_schema(updated_user_prompt)
-
-    # create a new user prompt, if not available
-
-    new_user_prompt_obj = {
-        "userId": user["id"],
-        "prompts": prompts,
-        "updatedAt": datetime.now(timezone.utc),
-        "createdAt": datetime.now(timezone.utc),
-    }
-
-    created_user_prompt = await prompts_collection.insert_one(new_user_prompt_obj)
-    new_user_prompt_obj["_id"] = created_user_prompt.inserted_id
+    # update the existing user prompt, or create it if not available
+    user_prompt = await prompts_repository.update_one(
+        {"userId": user["id"]},
+        {
+            "$set": {"prompts": prompts, "updatedAt": now},
+            "$setOnInsert": {"createdAt": now},
+        },
+        upsert=True,
+    )
 
-    return prompt_schema(new_user_prompt_obj)
+    return prompt_schema(user_prompt)
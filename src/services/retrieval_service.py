@@ -1,24 +1,37 @@
+from dataclasses import dataclass
 from typing import Optional, List
-from src.services.loader_service import loader_service
+from src.services.ingestion_service import enqueue_file_ingestion, wait_for_ingestion
 from src.core.logger import logger
+from src.core.config import SETTINGS
 from src.models.file import FileData
-from src.services.conversation_service import get_conversation
+from src.services.conversation_service import get_conversation_metadata
 from src.utils.filters.filter_empty_files import filter_empty_files
 from src.services.vector_store_service import search_documents_from_vector_store
 from src.llm.prompts.prompts import super_chat_document_context
 
+PENDING_IMAGE_TEXT_NOTE = (
+    "Note: text from the uploaded images is still being extracted "
+    "and is not included in this context yet."
+)
+
+
+@dataclass
+class RetrievedContext:
+    text: str
+    # True when the answer was built before every uploaded file was indexed
+    is_partial: bool = False
+    # True when uploaded images are still waiting for OCR
+    has_pending_image_text: bool = False
 
-class RetrievalService:
-    conversation_id: str
-    message_id: str
 
+class RetrievalService:
     async def run(
         self,
         query: str,
         conversation_id: str,
         message_id: str,
         files: Optional[List[FileData]] = None,
-    ) -> str:
+    ) -> RetrievedContext:
         """
         Handle retrieval of context based on query and optionally new uploaded files.
 
@@ -29,44 +42,48 @@ class RetrievalService:
             files (Optional[List[FileData]]): New files to process.
 
         Returns:
-            str: Context text to use for response generation.
+            RetrievedContext: Context text to use for response generation.
         """
         valid_files = filter_empty_files(files)
 
-        self.conversation_id = conversation_id
-        self.message_id = message_id
-
-        conversation = await get_conversation(conversation_id=self.conversation_id)
+        conversation = await get_conversation_metadata(conversation_id=conversation_id)
         has_uploaded_files = conversation.get("hasFilesUploaded", False)
 
         # No new valid files & no prior uploads — just return the query as-is
         if not valid_files:
             if not has_uploaded_files:
                 logger.info("No valid files and no uploads in conversation history.")
-                return query
+                return RetrievedContext(text=query)
 
             # No new files, but previous files exist — use existing vector store context
             logger.info("No new valid files. Use existing vector store context.")
-            return self._retrieve_context_from_vector_store(query)
+            return RetrievedContext(
+                text=self._retrieve_context_from_vector_store(query, conversation_id)
+            )
 
-        # New valid files detected — send to loader service for processing
-        logger.info("Valid files detected. Sending to loader service.")
+        # New valid files detected — queue them for ingestion
+        logger.info("Valid files detected. Queueing them for ingestion.")
         return await self._load_documents_and_retrieve_context_from_vector_store(
             query=query,
             files=valid_files,
+            conversation_id=conversation_id,
+            message_id=message_id,
         )
 
-    def _retrieve_context_from_vector_store(self, query: str) -> str:
+    def _retrieve_context_from_vector_store(
+        self, query: str, conversation_id: str
+    ) -> str:
         """
         Retrieve relevant context documents from vector store filtered by conversation ID.
 
         Args:
             query (str): Query to search vector store with.
+            conversation_id (str): Conversation whose documents are searched.
 
         Returns:
             str: Concatenated page contents from retrieved documents.
         """
-        search_filter = {"conversation_id": {"$eq": self.conversation_id}}
+        search_filter = {"conversation_id": {"$eq": conversation_id}}
 
         documents = search_documents_from_vector_store(
             query=query, k=4, filter=search_filter, min_score=0.5
@@ -91,28 +108,57 @@ class RetrievalService:
         self,
         query: str,
         files: List[FileData],
-    ) -> str:
+        conversation_id: str,
+        message_id: str,
+    ) -> RetrievedContext:
         """
-        Process new uploaded documents via loader service, then retrieve updated context.
+        Queue new uploaded documents for ingestion, wait for them as long as the
+        freshness policy allows, then retrieve context from whatever is indexed
+        by then. Files are indexed first pages first, so questions about the
+        start of a long document can be answered before the rest is indexed.
+        Images are never waited for, their text is marked as pending instead.
 
         Args:
             query (str): Original query text.
             files (List[FileData]): New uploaded files.
+            conversation_id (str): Current conversation ID.
+            message_id (str): Current message ID.
 
         Returns:
-            str: Context text after loading files or original query if loading failed.
+            RetrievedContext: Context after loading files, or the original query if no file could be queued.
         """
-        loading_status = await loader_service.run(
+        queued = await enqueue_file_ingestion(
             files=files,
-            conversation_id=self.conversation_id,
-            message_id=self.message_id,
+            conversation_id=conversation_id,
+            message_id=message_id,
         )
 
-        if loading_status is True:
-            return self._retrieve_context_from_vector_store(query=query)
+        if not queued.job_ids and not queued.ocr_job_ids:
+            logger.warning("No uploaded file could be queued for ingestion.")
+            return RetrievedContext(text=query)
+
+        is_fully_indexed = True
+
+        if queued.job_ids:
+            is_fully_indexed = await wait_for_ingestion(
+                queued.job_ids, timeout=SETTINGS["INGEST_FRESHNESS_TIMEOUT"]
+            )
 
-        logger.warning(f"Document loading failed or incomplete: {loading_status}")
-        return query
+        if not is_fully_indexed:
+            logger.info("Answering from the part of the uploaded files indexed so far.")
+
+        context = self._retrieve_context_from_vector_store(query, conversation_id)
+        has_pending_image_text = bool(queued.ocr_job_ids)
+
+        if has_pending_image_text:
+            logger.info("Answering without the text of images still queued for OCR.")
+            context = f"{context}\n\n{PENDING_IMAGE_TEXT_NOTE}"
+
+        return RetrievedContext(
+            text=context,
+            is_partial=not is_fully_indexed,
+            has_pending_image_text=has_pending_image_text,
+        )
 
 
 retrieval_service = RetrievalService()
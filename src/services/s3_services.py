@@ -1,55 +1,142 @@
+import asyncio
 import aioboto3
+from typing import List, Optional
 from botocore.exceptions import ClientError
 from src.core.logger import logger
 
+# Uploads are stored under a per-conversation prefix so they can be listed
+# and deleted without reading object metadata
+CONVERSATIONS_PREFIX = "conversations/"
 
-async def delete_objects_by_metadata(
-    bucket_name: str, metadata_key: str, metadata_value: str
-):
-    keys_to_delete = []
+# Concurrent metadata reads while scanning objects uploaded without a prefix
+HEAD_OBJECT_CONCURRENCY = 16
+
+DELETE_BATCH_SIZE = 1000
+
+
+def build_conversation_prefix(conversation_id: str) -> str:
+    """
+    Build the key prefix of the objects uploaded to a conversation.
+
+    Args:
+        conversation_id (str): Conversation ID.
+
+    Returns:
+        str: Key prefix, ending with a slash.
+    """
+    return f"{CONVERSATIONS_PREFIX}{conversation_id}/"
+
+
+async def delete_objects_by_conversation_ids(
+    bucket_name: str, conversation_ids: List[str], include_legacy: bool = False
+) -> int:
+    """
+    Delete the objects uploaded to the given conversations: the objects under
+    each conversation prefix, and optionally, in a single pass over the
+    bucket, legacy objects stored without a prefix whose conversation_id
+    metadata matches. The legacy pass reads the metadata of every unprefixed
+    object, so it is off by default and left to the orphan collection.
+
+    Args:
+        bucket_name (str): Bucket to delete from.
+        conversation_ids (List[str]): Conversations whose objects are deleted.
+        include_legacy (bool, optional): Also scan objects uploaded without a prefix. Defaults to False.
+
+    Returns:
+        int: Number of deleted objects.
+
+    Raises:
+        RuntimeError: If some objects could not be deleted.
+    """
     session = aioboto3.Session()
+    targets = set(conversation_ids)
+    keys_to_delete = []
 
     async with session.client("s3") as s3_client:
         paginator = s3_client.get_paginator("list_objects_v2")
 
-        async for page in paginator.paginate(Bucket=bucket_name):
-            for obj in page.get("Contents", []):
-                key = obj["Key"]
-
-                try:
-                    head = await s3_client.head_object(Bucket=bucket_name, Key=key)
-                    meta = head.get("Metadata", {})
+        for conversation_id in conversation_ids:
+            async for page in paginator.paginate(
+                Bucket=bucket_name, Prefix=build_conversation_prefix(conversation_id)
+            ):
+                keys_to_delete += [obj["Key"] for obj in page.get("Contents", [])]
 
-                    if meta.get(metadata_key) == metadata_value:
-                        keys_to_delete.append(key)
+        if include_legacy:
+            async for page in paginator.paginate(Bucket=bucket_name):
+                keys = [
+                    obj["Key"]
+                    for obj in page.get("Contents", [])
+                    if not obj["Key"].startswith(CONVERSATIONS_PREFIX)
+                ]
+                owners = await read_conversation_ids(s3_client, bucket_name, keys)
+                keys_to_delete += [
+                    key for key, owner in zip(keys, owners) if owner in targets
+                ]
 
-                except ClientError as e:
-                    logger.info(f"Failed to get metadata for {key}: {e}")
+        return await delete_objects(s3_client, bucket_name, keys_to_delete)
 
-        if not keys_to_delete:
-            logger.info("No objects found matching metadata criteria.")
-            return
 
-        logger.info(
-            f"Deleting {len(keys_to_delete)} objects matching metadata {metadata_key}={metadata_value}..."
-        )
+async def read_conversation_ids(
+    s3_client, bucket_name: str, keys: List[str]
+) -> List[Optional[str]]:
+    """
+    Read the conversation_id metadata of objects uploaded without a
+    conversation prefix, with a bounded number of concurrent requests.
 
-        batch_size = 1000
+    Args:
+        s3_client: Open aioboto3 S3 client.
+        bucket_name (str): Bucket of the objects.
+        keys (List[str]): Keys of the objects.
 
-        for i in range(0, len(keys_to_delete), batch_size):
-            batch = keys_to_delete[i : i + batch_size]
-            objects = [{"Key": k} for k in batch]
+    Returns:
+        List[Optional[str]]: Conversation ID of each object, None if it has none or could not be read.
+    """
+    semaphore = asyncio.Semaphore(HEAD_OBJECT_CONCURRENCY)
 
+    async def read(key: str) -> Optional[str]:
+        async with semaphore:
             try:
-                response = await s3_client.delete_objects(
-                    Bucket=bucket_name,
-                    Delete={"Objects": objects, "Quiet": True},
-                )
+                head = await s3_client.head_object(Bucket=bucket_name, Key=key)
+            except ClientError as e:
+                logger.info(f"Failed to get metadata for {key}: {e}")
+                return None
 
-                deleted_count = len(response.get("Deleted", []))
-                logger.info(
-                    f"Deleted batch {i // batch_size + 1}, deleted count: {deleted_count}"
-                )
+        return head.get("Metadata", {}).get("conversation_id")
 
-            except ClientError as e:
-                logger.error(f"Failed to delete batch {i // batch_size + 1}: {e}")
+    return await asyncio.gather(*(read(key) for key in keys))
+
+
+async def delete_objects(s3_client, bucket_name: str, keys: List[str]) -> int:
+    """
+    Delete objects by key in batches of up to 1000 keys per request.
+
+    Args:
+        s3_client: Open aioboto3 S3 client.
+        bucket_name (str): Bucket to delete from.
+        keys (List[str]): Keys of the objects to delete.
+
+    Returns:
+        int: Number of deleted objects.
+
+    Raises:
+        RuntimeError: If some objects could not be deleted.
+    """
+    failed = []
+
+    for i in range(0, len(keys), DELETE_BATCH_SIZE):
+        batch = keys[i : i + DELETE_BATCH_SIZE]
+
+        response = await s3_client.delete_objects(
+            Bucket=bucket_name,
+            Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+        )
+
+        # Quiet mode only reports the keys that failed
+        failed += [error["Key"] for error in response.get("Errors", [])]
+
+    if failed:
+        raise RuntimeError(f"Failed to delete {len(failed)} objects, e.g. {failed[0]}")
+
+    logger.info(f"Deleted {len(keys)} objects from bucket {bucket_name}")
+
+    return len(keys)
@@ -0,0 +1,131 @@
+import re
+from typing import List
+from src.db.collections import messages_collection, conversations_collection
+from src.models.search import MessageSearchResults
+from src.services.user_service import get_current_user
+from src.utils.converters.convert_to_object_id import convert_to_object_id
+
+SNIPPET_LENGTH = 160
+
+# Characters of a query term that must match for a stemmed word to count as a hit
+MIN_STEM_LENGTH = 4
+
+QUERY_TERM = re.compile(r"\w+")
+
+
+def build_snippet(content: str, terms: List[str]) -> str:
+    """
+    Cut the part of a message around the first occurrence of a query term.
+    The text index matches stemmed words, so a term also matches words that
+    share its first characters (e.g. "running" for "runs").
+
+    Args:
+        content (str): Message content.
+        terms (List[str]): Lower cased query terms.
+
+    Returns:
+        str: Snippet of at most SNIPPET_LENGTH characters, with ellipses where content was cut.
+    """
+    text = " ".join(content.split())
+    lowered = text.lower()
+
+    positions = [
+        position
+        for term in terms
+        for position in (
+            lowered.find(term),
+            lowered.find(term[:MIN_STEM_LENGTH])
+            if len(term) > MIN_STEM_LENGTH
+            else -1,
+        )
+        if position >= 0
+    ]
+
+    match = min(positions) if positions else 0
+    start = max(0, match - SNIPPET_LENGTH // 3)
+    end = min(len(text), start + SNIPPET_LENGTH)
+    start = max(0, end - SNIPPET_LENGTH)
+
+    snippet = text[start:end]
+
+    if start > 0:
+        snippet = f"...{snippet}"
+
+    if end < len(text):
+        snippet = f"{snippet}..."
+
+    return snippet
+
+
+async def search_messages(
+    query: str, limit: int, offset: int = 0
+) -> MessageSearchResults:
+    """
+    Search the current user's messages using the messages text index.
+
+    Args:
+        query (str): Search text. Supports quoted phrases and -excluded terms.
+        limit (int): Maximum number of results in the page.
+        offset (int, optional): Number of results to skip. Defaults to 0.
+
+    Returns:
+        MessageSearchResults: Matching messages with snippets, most relevant first.
+    """
+    user = await get_current_user()
+
+    messages = (
+        await messages_collection.find(
+            {
+                "userId": convert_to_object_id(user["id"]),
+                "$text": {"$search": query},
+            },
+            {
+                "conversationId": 1,
+                "author": 1,
+                "timestamp": 1,
+                "content": 1,
+                "score": {"$meta": "textScore"},
+            },
+        )
+        .sort([("score", {"$meta": "textScore"}), ("timestamp", -1)])
+        .skip(offset)
+        .limit(limit + 1)
+        .to_list(length=None)
+    )
+
+    next_offset = None
+
+    if len(messages) > limit:
+        messages = messages[:limit]
+        next_offset = offset + limit
+
+    conversations = await conversations_collection.find(
+        {
+            "_id": {"$in": list({message["conversationId"] for message in messages})},
+            "deletedAt": {"$exists": False},
+        },
+        {"title": 1},
+    ).to_list(length=None)
+
+    titles = {
+        conversation["_id"]: conversation["title"] for conversation in conversations
+    }
+    terms = [term.lower() for term in QUERY_TERM.findall(query)]
+
+    return {
+        "results": [
+            {
+                "messageId": str(message["_id"]),
+                "conversationId": str(message["conversationId"]),
+                "conversationTitle": titles.get(message["conversationId"]),
+                "author": message["author"],
+                "timestamp": message["timestamp"],
+                "snippet": build_snippet(message["content"], terms),
+                "score": message["score"],
+            }
+            for message in messages
+            # Messages of a conversation being deleted are removed asynchronously
+            if message["conversationId"] in titles
+        ],
+        "nextOffset": next_offset,
+    }
@@ -4,11 +4,18 @@ from datetime import datetime, timezone
 from typing import Optional, Dict, Any
 from src.models.user import User, BaseUser, UpdateUser
 from src.db.collections import users_collection
+from src.db.repository import users_repository, prompts_repository
 from src.schema.user_schema import user_schema
 from src.utils.converters.convert_to_object_id import convert_to_object_id
-from src.core.config import ENV_VARS
+from src.utils.caches.identity_map import get_or_load, remember, forget
+from src.utils.caches.async_ttl_cache import AsyncTTLCache
+from src.core.config import ENV_VARS, SETTINGS
+from src.core.logger import logger
 from src.llm.prompts.template.user_profile_template import user_profile_template
 
+# Users are read on every hot path but rarely change
+user_cache = AsyncTTLCache(ttl_seconds=SETTINGS["USER_CACHE_TTL_SECONDS"])
+
 
 async def create_user(data: BaseUser) -> User:
     """
@@ -68,10 +75,16 @@ async def get_user_by_id(id: str) -> Optional[User]:
         Optional[User]: User object if found, else None.
     """
     user_id = convert_to_object_id(id)
-    user = await users_collection.find_one({"_id": user_id})
-    if not user:
-        return None
-    return user_schema(user)
+
+    async def load_user() -> Optional[User]:
+        user = await users_collection.find_one({"_id": user_id})
+        if not user:
+            return None
+        return user_schema(user)
+
+    key = ("user", str(user_id))
+
+    return await get_or_load(key, lambda: user_cache.get(key, load_user))
 
 
 async def get_current_user() -> Optional[User]:
@@ -106,48 +119,59 @@ async def update_user(user_id: str, update_data: UpdateUser) -> User:
     Raises:
         HTTPException: If user does not exist.
     """
-    user = await get_user_by_id(user_id)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"User with id: {user_id} not found",
-        )
-
     update_user_obj = update_data.model_dump(exclude_unset=True)
     update_user_obj["updatedAt"] = datetime.now(timezone.utc)
 
-    await users_collection.update_one(
+    updated_user = await users_repository.update_one(
         {"_id": convert_to_object_id(user_id)},
         {"$set": update_user_obj},
     )
 
-    updated_user = await get_user_by_id(user_id)
+    if not updated_user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with id: {user_id} not found",
+        )
+
+    updated_user = user_schema(updated_user)
+    user_cache.invalidate(("user", updated_user["id"]))
+    remember(("user", updated_user["id"]), updated_user)
+
     return updated_user
 
 
 async def delete_user(user_id: str) -> None:
     """
-    Delete a user by ID.
+    Delete a user by ID, along with their conversations and prompt. The
+    conversations are deleted first, so a failure never leaves data whose
+    user is gone.
 
     Args:
         user_id (str): ID of the user to delete.
 
     Raises:
-        HTTPException: If user does not exist or deletion fails.
+        HTTPException: If user does not exist.
     """
-    user = await get_user_by_id(user_id)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"User with id: {user_id} not found",
+    from src.services.conversation_service import delete_user_conversations
+
+    user_object_id = convert_to_object_id(user_id)
+
+    conversation_ids = await delete_user_conversations(user_id)
+    await prompts_repository.delete_one({"userId": str(user_object_id)})
+
+    if conversation_ids:
+        logger.info(
+            f"Deleting {len(conversation_ids)} conversations of user: {user_id}"
         )
 
-    response = await users_collection.delete_one({"_id": convert_to_object_id(user_id)})
+    deleted = await users_repository.delete_one({"_id": user_object_id})
+    user_cache.invalidate(("user", str(user_object_id)))
+    forget(("user", str(user_object_id)))
 
-    if response.deleted_count == 0:
+    if not deleted:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Failed to delete user with id: {user_id}",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with id: {user_id} not found",
         )
 
 
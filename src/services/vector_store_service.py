@@ -1,19 +1,99 @@
-from typing import List
+import asyncio
+from typing import List, Optional
 from langchain_core.documents import Document
-from src.db.pinecone import vector_store, compressor, reordering
+from src.db.pinecone import vector_store, index, compressor, reordering
+from src.services.ingest_writer_service import (
+    ingest_writer_service,
+    IngestProgress,
+    ProgressCallback,
+)
 from src.core.logger import logger
 
 
-def add_documents_to_vector_store(documents: List[Document], key: str = ""):
+async def add_documents_to_vector_store(
+    documents: List[Document],
+    key: str = "",
+    ids: Optional[List[str]] = None,
+    on_progress: Optional[ProgressCallback] = None,
+) -> IngestProgress:
     """
-    Add a list of Document objects to the vector store.
+    Add a list of Document objects to the vector store in token-bounded,
+    retried batches.
 
     Args:
         documents (List[Document]): The documents to be added.
         key (str, optional): An optional identifier for logging. Defaults to "".
+        ids (Optional[List[str]]): Optional vector IDs matching the documents.
+        on_progress (Optional[ProgressCallback]): Awaited after each batch completes.
+
+    Returns:
+        IngestProgress: Final counts of embedded, stored and failed chunks.
+
+    Raises:
+        RuntimeError: If none of the documents could be stored.
+    """
+    progress = await ingest_writer_service.write(
+        documents=documents, key=key, ids=ids, on_progress=on_progress
+    )
+
+    if documents and progress.stored_chunks == 0:
+        raise RuntimeError(f"Failed to store any documents in the vector database: {key}")
+
+    if progress.failed_chunks:
+        logger.warning(
+            f"{progress.failed_chunks} of {progress.total_chunks} documents failed to store: {key}"
+        )
+
+    return progress
+
+
+async def copy_vectors_in_vector_store(
+    source_ids: List[str],
+    target_ids: List[str],
+    metadata: dict,
+    key: str = "",
+    batch_size: int = 50,
+) -> bool:
+    """
+    Copy stored vectors under new IDs with updated metadata, reusing their
+    embeddings instead of embedding the text again.
+
+    Args:
+        source_ids (List[str]): IDs of the vectors to copy.
+        target_ids (List[str]): New IDs, matching source_ids by position.
+        metadata (dict): Metadata fields to overwrite on the copies.
+        key (str, optional): An optional identifier for logging. Defaults to "".
+        batch_size (int, optional): Number of vectors fetched per request. Defaults to 50.
+
+    Returns:
+        bool: True if every source vector was found and copied, False otherwise.
     """
-    vector_store.add_documents(documents=documents)
-    logger.info(f"Stored {len(documents)} documents in the vector database: {key}")
+    for start in range(0, len(source_ids), batch_size):
+        batch_source_ids = source_ids[start : start + batch_size]
+        batch_target_ids = target_ids[start : start + batch_size]
+
+        response = await asyncio.to_thread(index.fetch, ids=batch_source_ids)
+        fetched = response.vectors
+
+        if len(fetched) != len(batch_source_ids):
+            logger.warning(
+                f"Only {len(fetched)}/{len(batch_source_ids)} source vectors found, cannot copy: {key}"
+            )
+            return False
+
+        vectors = [
+            {
+                "id": target_id,
+                "values": fetched[source_id].values,
+                "metadata": {**(fetched[source_id].metadata or {}), **metadata},
+            }
+            for source_id, target_id in zip(batch_source_ids, batch_target_ids)
+        ]
+
+        await asyncio.to_thread(index.upsert, vectors=vectors)
+
+    logger.info(f"Copied {len(source_ids)} vectors in the vector database: {key}")
+    return True
 
 
 def search_documents_from_vector_store(
@@ -0,0 +1,99 @@
+import asyncio
+import copy
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class AsyncTTLCache:
+    """
+    Process-wide cache for async lookups. Entries expire after a TTL and
+    concurrent misses on the same key share a single load (singleflight).
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.entries: Dict[Hashable, Tuple[float, Any]] = {}
+        # In-flight loads; invalidation removes a key's load so its possibly
+        # stale value is returned to its waiters but never stored
+        self.loads: Dict[Hashable, asyncio.Future] = {}
+
+    async def get(
+        self, key: Hashable, loader: Callable[[], Awaitable[Optional[Any]]]
+    ) -> Optional[Any]:
+        """
+        Return the cached value of a key, loading it when missing or expired.
+
+        Args:
+            key (Hashable): Cache key.
+            loader (Callable[[], Awaitable[Optional[Any]]]): Loads the value, None if it does not exist.
+
+        Returns:
+            Optional[Any]: A copy of the value, so callers may modify it freely.
+        """
+        entry = self.entries.get(key)
+
+        if entry and entry[0] > time.monotonic():
+            return copy.deepcopy(entry[1])
+
+        load = self.loads.get(key)
+
+        if load is None:
+            load = asyncio.ensure_future(self._load(key, loader))
+            self.loads[key] = load
+            load.add_done_callback(lambda done: self._forget_load(key, done))
+
+        # Shield the shared load from callers that are cancelled while waiting
+        value = await asyncio.shield(load)
+
+        return copy.deepcopy(value)
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Drop a key, e.g. after the underlying record was written.
+
+        Args:
+            key (Hashable): Cache key.
+        """
+        self.entries.pop(key, None)
+        # Later callers must not join a load that may return the old value
+        self.loads.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Drop every key.
+        """
+        for key in {*self.entries, *self.loads}:
+            self.invalidate(key)
+
+    async def _load(
+        self, key: Hashable, loader: Callable[[], Awaitable[Optional[Any]]]
+    ) -> Optional[Any]:
+        load = asyncio.current_task()
+        value = await loader()
+
+        # Missing values are not cached, the record may be created later on.
+        # A load replaced or dropped by an invalidation may hold an old value.
+        if value is not None and self.loads.get(key) is load:
+            if len(self.entries) >= self.max_size:
+                self._evict()
+
+            self.entries[key] = (time.monotonic() + self.ttl_seconds, value)
+
+        return value
+
+    def _forget_load(self, key: Hashable, load: asyncio.Future) -> None:
+        if self.loads.get(key) is load:
+            del self.loads[key]
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+
+        for key, (expires_at, _) in list(self.entries.items()):
+            if expires_at <= now:
+                del self.entries[key]
+
+        # Still full: drop the entry closest to expiring
+        if len(self.entries) >= self.max_size:
+            oldest = min(self.entries, key=lambda key: self.entries[key][0])
+            del self.entries[oldest]
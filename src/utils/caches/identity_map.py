@@ -0,0 +1,85 @@
+import copy
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Hashable, Iterator, Optional
+
+# Documents loaded during the current request or background task. Tasks
+# created inside a scope copy the context and share the same map.
+_identity_map: ContextVar[Optional[dict]] = ContextVar("identity_map", default=None)
+
+
+@contextmanager
+def identity_map_scope() -> Iterator[None]:
+    """
+    Memoize document lookups until the scope exits. A scope opened while
+    another one is active (e.g. a background task started by a request)
+    shares the outer map.
+    """
+    if _identity_map.get() is not None:
+        yield
+        return
+
+    token = _identity_map.set({})
+
+    try:
+        yield
+    finally:
+        _identity_map.reset(token)
+
+
+async def get_or_load(
+    key: Hashable, loader: Callable[[], Awaitable[Optional[Any]]]
+) -> Optional[Any]:
+    """
+    Return the document stored under a key in the current scope, loading it
+    on first access. Outside of a scope the loader is always called.
+
+    Args:
+        key (Hashable): Identity of the document, e.g. ("user", user_id).
+        loader (Callable[[], Awaitable[Optional[Any]]]): Loads the document, None if it does not exist.
+
+    Returns:
+        Optional[Any]: A copy of the document, so callers may modify it freely.
+    """
+    documents = _identity_map.get()
+
+    if documents is None:
+        return await loader()
+
+    if key not in documents:
+        document = await loader()
+
+        # Missing documents are not remembered, they may be created later on
+        if document is None:
+            return None
+
+        documents[key] = document
+
+    return copy.deepcopy(documents[key])
+
+
+def remember(key: Hashable, document: Any) -> None:
+    """
+    Store the latest version of a document after a write.
+
+    Args:
+        key (Hashable): Identity of the document.
+        document (Any): The document as written.
+    """
+    documents = _identity_map.get()
+
+    if documents is not None:
+        documents[key] = copy.deepcopy(document)
+
+
+def forget(key: Hashable) -> None:
+    """
+    Drop a document from the current scope, e.g. after it was deleted.
+
+    Args:
+        key (Hashable): Identity of the document.
+    """
+    documents = _identity_map.get()
+
+    if documents is not None:
+        documents.pop(key, None)
@@ -8,7 +8,7 @@ class FileType(Enum):
     JPEG = "image/jpeg"
     PNG = "image/png"
     JSON = "application/json"
-    CSV = ("text/csv",)
+    CSV = "text/csv"
     DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
     TXT = "text/plain"
     MARKDOWN = "text/markdown"
@@ -31,4 +31,5 @@ class FileType(Enum):
 
 
 ALLOWED_FILE_TYPES = [filetype.value for filetype in FileType]
+IMAGE_FILE_TYPES = [FileType.JPEG.value, FileType.PNG.value]
 FILE_TYPE = {filetype.name: filetype.value for filetype in FileType}
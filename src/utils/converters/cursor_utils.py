@@ -0,0 +1,45 @@
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+from bson import ObjectId
+from fastapi import HTTPException
+from starlette import status
+
+
+def encode_cursor(sort_value: datetime, document_id: ObjectId) -> str:
+    """
+    Encode the sort key of the last document of a page into an opaque cursor.
+
+    Args:
+        sort_value (datetime): Value of the sort field of the document.
+        document_id (ObjectId): ID of the document, used as tie breaker.
+
+    Returns:
+        str: URL safe base64 cursor.
+    """
+    payload = json.dumps({"v": sort_value.isoformat(), "id": str(document_id)})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """
+    Decode a cursor created by encode_cursor.
+
+    Args:
+        cursor (str): The cursor.
+
+    Returns:
+        Tuple[datetime, ObjectId]: Sort value and ID of the last document of the previous page.
+
+    Raises:
+        HTTPException: Raises 400 BAD REQUEST if the cursor is malformed.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(payload["v"]), ObjectId(payload["id"])
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid cursor format: {str(e)}",
+        )
@@ -0,0 +1,29 @@
+from typing import Optional
+from src.utils.converters.cursor_utils import decode_cursor
+
+
+def keyset_filter(field: str, cursor: Optional[str], descending: bool) -> dict:
+    """
+    Build the filter selecting the documents that come after a cursor when
+    sorting on a field with _id as tie breaker.
+
+    Args:
+        field (str): Sort field, e.g. "timestamp".
+        cursor (Optional[str]): Cursor of the last document of the previous page.
+        descending (bool): Whether the page is sorted in descending order.
+
+    Returns:
+        dict: Filter to merge into the query, empty for the first page.
+    """
+    if not cursor:
+        return {}
+
+    value, document_id = decode_cursor(cursor)
+    operator = "$lt" if descending else "$gt"
+
+    return {
+        "$or": [
+            {field: {operator: value}},
+            {field: value, "_id": {operator: document_id}},
+        ]
+    }
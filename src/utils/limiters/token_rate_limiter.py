@@ -0,0 +1,42 @@
+import asyncio
+import time
+
+
+class TokenRateLimiter:
+    """
+    Token bucket limiter that caps how many tokens can be spent per minute.
+    Used to keep embedding requests under the provider's TPM limit.
+    """
+
+    def __init__(self, tokens_per_minute: int):
+        self.capacity = float(tokens_per_minute)
+        self.refill_rate = tokens_per_minute / 60
+        self.available = float(tokens_per_minute)
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self.updated_at
+        self.available = min(self.capacity, self.available + elapsed * self.refill_rate)
+        self.updated_at = now
+
+    async def acquire(self, tokens: int) -> None:
+        """
+        Wait until the requested number of tokens can be spent.
+
+        Args:
+            tokens (int): Number of tokens about to be used.
+        """
+        # A single request larger than the bucket would otherwise wait forever
+        tokens = min(float(tokens), self.capacity)
+
+        async with self._lock:
+            while True:
+                self._refill()
+
+                if self.available >= tokens:
+                    self.available -= tokens
+                    return
+
+                await asyncio.sleep((tokens - self.available) / self.refill_rate)
@@ -0,0 +1,89 @@
+import math
+import threading
+from collections import deque
+from typing import Dict, List
+
+# Latest samples kept for the percentiles, bounding memory per series
+LATENCY_WINDOW = 1000
+
+LATENCY_PERCENTILES = (50, 95, 99)
+
+
+def latency_percentiles(latencies: List[float]) -> Dict[str, float]:
+    """
+    Compute nearest-rank latency percentiles.
+
+    Args:
+        latencies (List[float]): Latencies in milliseconds.
+
+    Returns:
+        Dict[str, float]: Latency by percentile name (e.g. "p95"), empty without latencies.
+    """
+    if not latencies:
+        return {}
+
+    ordered = sorted(latencies)
+
+    return {
+        f"p{percentile}": round(
+            ordered[max(0, math.ceil(percentile * len(ordered) / 100) - 1)], 2
+        )
+        for percentile in LATENCY_PERCENTILES
+    }
+
+
+class LatencyStats:
+    """
+    Thread-safe latency series: totals since startup, and percentiles over
+    the latest samples.
+    """
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency_ms: float, failed: bool = False) -> None:
+        """
+        Record one measured latency.
+
+        Args:
+            latency_ms (float): Latency in milliseconds.
+            failed (bool, optional): Whether the measured operation failed. Defaults to False.
+        """
+        with self._lock:
+            self.count += 1
+            self.errors += failed
+            self.total_ms += latency_ms
+            self.max_ms = max(self.max_ms, latency_ms)
+            self.samples.append(latency_ms)
+
+    def snapshot(self) -> dict:
+        """
+        Summarise the series.
+
+        Returns:
+            dict: Count, errors, mean, max and percentiles in milliseconds.
+        """
+        with self._lock:
+            samples = list(self.samples)
+            count, errors, total_ms, max_ms = (
+                self.count,
+                self.errors,
+                self.total_ms,
+                self.max_ms,
+            )
+
+        return {
+            "count": count,
+            "errors": errors,
+            "meanMs": round(total_ms / count, 2) if count else 0.0,
+            "maxMs": round(max_ms, 2),
+            **{
+                f"{name}Ms": latency
+                for name, latency in latency_percentiles(samples).items()
+            },
+        }